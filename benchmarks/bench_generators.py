@@ -0,0 +1,154 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Benchmarks of each generator, rendering its section from a filtered view
+ of the tree, and of whole runs of main()
+'''
+
+import argparse
+import io
+import os
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from vspec.model.vsstree import VSSNode
+
+from vss2graphql_schema.graphql_generators.common_generator import (
+    CommonGenerator
+)
+from vss2graphql_schema.graphql_generators.layer import Layer
+from vss2graphql_schema.graphql_generators.layer_generators import (
+    input_layer_generator, mutation_layer_generator, type_layer_generator
+)
+from vss2graphql_schema.graphql_generators.tree_cache import load_tree_cached
+from vss2graphql_schema.graphql_generators.util import index_qualified_names
+from vss2graphql_schema.graphql_generators.vss_generators import (
+    custom_scalars_generator, directive_generator, enum_generator,
+    input_generator, mutation_generator, query_generator,
+    subscriptions_generator, type_generator, vss_generator
+)
+from vss2graphql_schema.vss2graphql_schema import (
+    configure_templates, create_filters, filter_vss_tree, get_arg_parse, main
+)
+
+from .synthetic_vss import SIZES, write_sizes
+
+Files = Dict[str, Tuple[str, str]]
+GeneratorFactory = Callable[
+    [Iterable[VSSNode], argparse.Namespace, Layer], CommonGenerator
+]
+
+# Generators by name, the tree of those ending in _layer is filtered by the
+#  layer
+GENERATORS: Dict[str, GeneratorFactory] = {
+    'directive': lambda roots, args, layer: (
+        directive_generator.DirectiveGenerator(io.StringIO(), args)
+    ),
+    'custom_scalars': lambda roots, args, layer: (
+        custom_scalars_generator.CustomScalarsGenerator(io.StringIO(), args)
+    ),
+    'query': lambda roots, args, layer: (
+        query_generator.QueryGenerator(io.StringIO(), roots, args)
+    ),
+    'subscription': lambda roots, args, layer: (
+        subscriptions_generator.SubscriptionGenerator(
+            io.StringIO(), roots, args
+        )
+    ),
+    'mutation': lambda roots, args, layer: (
+        mutation_generator.MutationGenerator(io.StringIO(), roots, args)
+    ),
+    'input': lambda roots, args, layer: (
+        input_generator.InputGenerator(io.StringIO(), roots, args)
+    ),
+    'type': lambda roots, args, layer: (
+        type_generator.TypeGenerator(io.StringIO(), roots, args)
+    ),
+    'enum': lambda roots, args, layer: (
+        enum_generator.EnumGenerator(io.StringIO(), roots, args)
+    ),
+    'mutation_layer': lambda roots, args, layer: (
+        mutation_layer_generator.MutationLayerGenerator(
+            io.StringIO(), roots, args, layer
+        )
+    ),
+    'input_layer': lambda roots, args, layer: (
+        input_layer_generator.InputLayerGenerator(
+            io.StringIO(), roots, args, layer
+        )
+    ),
+    'type_layer': lambda roots, args, layer: (
+        type_layer_generator.TypeLayerGenerator(
+            io.StringIO(), roots, args, layer
+        )
+    ),
+}
+# Options generating every section and directive
+ALL_OPTIONS = [
+    '--custom-scalars', '--enums', '--range-directive',
+    '--permission-directive', '--subscription-delivery-interval',
+    '--no-cache',
+]
+
+
+class Generators:
+    '''
+    generate() of each generator on its own, without the fragment cache
+    '''
+    params = (list(SIZES), list(GENERATORS))
+    param_names = ['size', 'generator']
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str, generator: str) -> None:
+        vspec_file, layer_file = files[size]
+        self.args = get_arg_parse().parse_args([vspec_file, *ALL_OPTIONS])
+        configure_templates(self.args)
+        root = load_tree_cached(
+            vspec_file, [os.path.dirname(vspec_file)], True, None
+        )
+        index_qualified_names([root])
+        self.layer = Layer(layer_file)
+        self.roots = filter_vss_tree(root, create_filters(
+            self.args, self.layer if generator.endswith('_layer') else None
+        ))
+        self.extra_vars: Dict[str, Any] = {}
+        if generator == 'subscription':
+            self.extra_vars['include_delivery_interval'] = True
+
+    def time_generate(self, files: Files, size: str, generator: str) -> None:
+        instance = GENERATORS[generator](self.roots, self.args, self.layer)
+        if isinstance(instance, vss_generator.VSSGenerator):
+            instance.generate(self.extra_vars)
+        else:
+            instance.generate()
+
+
+class Main:
+    '''
+    Whole runs of the command line, without caches
+    '''
+    params = (list(SIZES), ['vss', 'layer'])
+    param_names = ['size', 'input']
+    timeout = 1200
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def time_main(self, files: Files, size: str, schema: str) -> None:
+        vspec_file, layer_file = files[size]
+        raw_args = [vspec_file, *ALL_OPTIONS, '--output', f'{size}.graphql']
+        if schema == 'layer':
+            raw_args += ['--layer', layer_file]
+        main(raw_args)
@@ -0,0 +1,62 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Peak and retained memory of the stages of whole runs, as reported by
+ --memory-report
+'''
+
+import json
+from typing import Any, Dict
+
+from vss2graphql_schema.vss2graphql_schema import main
+
+from .bench_generators import ALL_OPTIONS
+from .synthetic_vss import SIZES, write_sizes
+
+# Memory of each top level stage by stage name, by size
+Reports = Dict[str, Dict[str, Dict[str, Any]]]
+STAGES = ['load tree', 'load layer', 'filter and sort', 'generate']
+
+
+class MemoryStages:
+    '''
+    Memory of the stages of runs with a layer, without caches. Each size
+     runs once, tracing the memory is slow.
+    '''
+    params = (list(SIZES), STAGES)
+    param_names = ['size', 'stage']
+    unit = 'bytes'
+    timeout = 1800
+
+    def setup_cache(self) -> Reports:
+        reports: Reports = {}
+        for size, (vspec_file, layer_file) in write_sizes('data').items():
+            report_file = f'{size}.memory.json'
+            main([
+                vspec_file, *ALL_OPTIONS, '--layer', layer_file,
+                '--output', f'{size}.graphql', '--memory-report', report_file,
+            ])
+            with open(report_file) as file:
+                reports[size] = {
+                    s['name']: s['memory'] for s in json.load(file)['spans']
+                    if s['depth'] == 0 and 'memory' in s
+                }
+        return reports
+
+    def track_peak(self, reports: Reports, size: str, stage: str) -> int:
+        return reports[size][stage]['peak']
+
+    def track_retained(
+            self, reports: Reports, size: str, stage: str
+    ) -> int:
+        return reports[size][stage]['retained']
@@ -0,0 +1,141 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Benchmarks of the model objects of the schema: building the fields of
+ every node, and rendering them as the field emitter does
+'''
+
+import os
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from vspec.model.vsstree import VSSNode, VSSType
+
+from vss2graphql_schema.graphql_generators.emitters.field_emitter import (
+    render_field
+)
+from vss2graphql_schema.graphql_generators.model.field import Field
+from vss2graphql_schema.graphql_generators.tree_cache import load_tree_cached
+from vss2graphql_schema.graphql_generators.util import index_qualified_names
+from vss2graphql_schema.graphql_generators.vss_generators.input_generator \
+    import InputGenerator
+from vss2graphql_schema.graphql_generators.vss_generators.type_generator \
+    import TypeGenerator
+
+from .synthetic_vss import SIZES, write_sizes
+
+Files = Dict[str, Tuple[str, str]]
+
+
+def build_fields(nodes: List[VSSNode]) -> List[Field]:
+    '''
+    :param nodes: Nodes of the tree, but the root
+    :return: Type field of every node, and input field of every actuator,
+     with every directive
+    '''
+    options = {
+        'custom_scalars': True, 'enums': True, 'has_range_directive': True,
+        'has_has_permission_directive': True,
+    }
+    fields = [TypeGenerator.field_from_vss_node(n, **options) for n in nodes]
+    fields += [
+        InputGenerator.field_from_vss_node(n, **options)
+        for n in nodes if n.type == VSSType.ACTUATOR
+    ]
+    return fields
+
+
+def load_nodes(files: Files, size: str) -> Tuple[VSSNode, List[VSSNode]]:
+    '''
+    :param files: Files of each size
+    :param size: Size of the tree
+    :return: Indexed root and the other nodes of the tree
+    '''
+    vspec_file = files[size][0]
+    root = load_tree_cached(
+        vspec_file, [os.path.dirname(vspec_file)], True, None
+    )
+    index_qualified_names([root])
+    return root, list(root.descendants)
+
+
+class BuildFields:
+    '''
+    Building the fields from a fresh index, so without the values memoized
+     by a previous build
+    '''
+    params = list(SIZES)
+    param_names = ['size']
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str) -> None:
+        self.root, self.nodes = load_nodes(files, size)
+
+    def time_build_fields(self, files: Files, size: str) -> None:
+        index_qualified_names([self.root])
+        build_fields(self.nodes)
+
+
+class RenderFields:
+    '''
+    Rendering new fields, and fields rendered before, as the later variants
+     of a matrix do with the descriptions and directives they share
+    '''
+    params = (list(SIZES), ['new', 'rendered'])
+    param_names = ['size', 'fields']
+    # Each timing renders the fields built by its own setup
+    number = 1
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str, fields: str) -> None:
+        self.fields = build_fields(load_nodes(files, size)[1])
+        if fields == 'rendered':
+            for field in self.fields:
+                render_field(field)
+
+    def time_render(self, files: Files, size: str, fields: str) -> None:
+        for field in self.fields:
+            render_field(field)
+
+
+class FieldsMemory:
+    '''
+    Memory taken by the fields of every node once rendered
+    '''
+    params = list(SIZES)
+    param_names = ['size']
+    unit = 'bytes'
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str) -> None:
+        self.root, self.nodes = load_nodes(files, size)
+
+    def track_fields(self, files: Files, size: str) -> int:
+        index_qualified_names([self.root])
+        tracemalloc.start()
+        try:
+            fields = build_fields(self.nodes)
+            for field in fields:
+                render_field(field)
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,135 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Benchmarks of loading and filtering the VSS tree
+'''
+
+import os
+from typing import Dict, Tuple
+
+from vss2graphql_schema.graphql_generators.layer import Layer
+from vss2graphql_schema.graphql_generators.node_facts import NodeFacts
+from vss2graphql_schema.graphql_generators.node_filters.layer_filter import (
+    create_layer_filter
+)
+from vss2graphql_schema.graphql_generators.node_filters.regex_filter import (
+    create_filter_pattern
+)
+from vss2graphql_schema.graphql_generators.node_filters import (
+    vss_tree_filter
+)
+from vss2graphql_schema.graphql_generators.tree_cache import (
+    TreeCache, load_tree_cached
+)
+from vss2graphql_schema.graphql_generators.tree_view import tree_view
+from vss2graphql_schema.graphql_generators.util import index_qualified_names
+
+from .synthetic_vss import SIZES, write_sizes
+
+Files = Dict[str, Tuple[str, str]]
+
+
+class LoadTree:
+    '''
+    vspec.load_tree, and the tree cache hits replacing it
+    '''
+    params = list(SIZES)
+    param_names = ['size']
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str) -> None:
+        self.vspec_file = files[size][0]
+        self.include_dirs = [os.path.dirname(self.vspec_file)]
+        self.cache = TreeCache(os.path.join('cache', size))
+        load_tree_cached(
+            self.vspec_file, self.include_dirs, True, cache=self.cache
+        )
+
+    def time_load_tree(self, files: Files, size: str) -> None:
+        load_tree_cached(self.vspec_file, self.include_dirs, True, None)
+
+    def time_load_tree_cached(self, files: Files, size: str) -> None:
+        load_tree_cached(
+            self.vspec_file, self.include_dirs, True, cache=self.cache
+        )
+
+    def time_load_layer(self, files: Files, size: str) -> None:
+        Layer(files[size][1])
+
+
+class FilterTree:
+    '''
+    VSSTreeFilter views of a loaded tree, sorted while filtering unless the
+     vspec order is kept
+    '''
+    params = list(SIZES)
+    param_names = ['size']
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str) -> None:
+        vspec_file, layer_file = files[size]
+        self.root = load_tree_cached(
+            vspec_file, [os.path.dirname(vspec_file)], True, None
+        )
+        index_qualified_names([self.root])
+        self.layer_filter = create_layer_filter(Layer(layer_file))
+        self.regex_filter = create_filter_pattern(['Branch0_Branch1'])
+
+    def time_sort(self, files: Files, size: str) -> None:
+        vss_tree_filter.VSSTreeFilter([self.root], sort=True).view()
+
+    def time_spec_order(self, files: Files, size: str) -> None:
+        vss_tree_filter.VSSTreeFilter([self.root]).view()
+
+    def time_layer_filter(self, files: Files, size: str) -> None:
+        vss_tree_filter.VSSTreeFilter(
+            [self.root], [self.layer_filter], sort=True
+        ).view()
+
+    def time_regex_filter(self, files: Files, size: str) -> None:
+        vss_tree_filter.VSSTreeFilter(
+            [self.root], [self.regex_filter], sort=True
+        ).view()
+
+
+class NodeFactsTable:
+    '''
+    NodeFacts of a view of a loaded tree, and the masks of a layer
+    '''
+    params = list(SIZES)
+    param_names = ['size']
+    timeout = 600
+
+    def setup_cache(self) -> Files:
+        return write_sizes('data')
+
+    def setup(self, files: Files, size: str) -> None:
+        vspec_file, layer_file = files[size]
+        root = load_tree_cached(
+            vspec_file, [os.path.dirname(vspec_file)], True, None
+        )
+        index_qualified_names([root])
+        self.tree = tree_view([root])
+        self.layer = Layer(layer_file)
+
+    def time_node_facts(self, files: Files, size: str) -> None:
+        NodeFacts(self.tree)
+
+    def time_node_facts_layer(self, files: Files, size: str) -> None:
+        NodeFacts(self.tree).layer_facts(self.layer)
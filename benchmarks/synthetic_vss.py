@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Writes synthetic vspec trees, with a layer of the same tree, for the
+ benchmarks. The tree is split like the VSS specification: the root file
+ has the Vehicle branch and includes one file for each branch under it.
+ The layer includes one .depl file for each of those branches too.
+
+Usage: python -m benchmarks.synthetic_vss OUTPUT_DIR [--nodes N] ...
+'''
+
+import argparse
+import os
+import random
+import sys
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import yaml
+
+# Entries of the vspec files of roughly one VSS release, before instances are
+#  expanded by vss-tools
+VSS_NODES = 1500
+SIZES = {
+    'vss': VSS_NODES,
+    'vss_x10': VSS_NODES * 10,
+    'vss_x100': VSS_NODES * 100,
+}
+ROOT = 'Vehicle'
+DATA_TYPES = (
+    'int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64',
+    'float', 'double', 'boolean', 'string', 'uint8[]', 'string[]',
+)
+NUMERIC_TYPES = DATA_TYPES[:10]
+INSTANCES = (['Row1', 'Row2'], ['Left', 'Right'])
+UNITS = ('km/h', 'celsius', 'percent', 'm', 'kW')
+
+
+class _Include(str):
+    '''
+    File name written as an !include of the layer
+    '''
+
+
+class _Dumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):  # type: ignore
+    '''
+    Safe dumper writing _Include values as !include tags
+    '''
+
+
+_Dumper.add_representer(
+    _Include, lambda dumper, value: dumper.represent_scalar(
+        '!include', str(value)
+    )
+)
+
+
+class TreeShape(NamedTuple):
+    '''
+    Shape of a synthetic tree. Ratios are the probability of each node to
+     get the feature.
+    '''
+    # Entries in the vspec files, branches included
+    nodes: int = VSS_NODES
+    # Levels of branches under the root
+    depth: int = 4
+    # Branches under each branch that is not at the last level
+    fanout: int = 4
+    actuator_ratio: float = 0.3
+    # Leaves of string type with allowed values
+    enum_ratio: float = 0.1
+    # Branches with instances, e.g. one per row and side
+    instance_ratio: float = 0.05
+    # Branches that are lists on the layer
+    list_ratio: float = 0.1
+    # Nodes on the layer
+    layer_ratio: float = 0.6
+    seed: int = 0
+
+
+def _branches(shape: TreeShape) -> List[Tuple[str, int]]:
+    '''
+    :param shape: Shape of the tree
+    :return: Path and level of each branch, in level order. There are at
+     least 3 leaves for each branch.
+    '''
+    budget = max(1, shape.nodes // 4)
+    branches: List[Tuple[str, int]] = []
+    pending = deque([(ROOT, 0)])
+    while pending and len(branches) < budget:
+        path, level = pending.popleft()
+        branches.append((path, level))
+        if level < shape.depth:
+            pending.extend(
+                (f'{path}.Branch{i}', level + 1) for i in range(shape.fanout)
+            )
+    return branches
+
+
+def _leaf(rng: random.Random, shape: TreeShape) -> Dict[str, Any]:
+    '''
+    :param rng: Random numbers of the tree
+    :param shape: Shape of the tree
+    :return: Attributes of a leaf
+    '''
+    if rng.random() < shape.actuator_ratio:
+        node_type = 'actuator'
+    else:
+        node_type = rng.choice(('sensor', 'sensor', 'sensor', 'attribute'))
+    leaf: Dict[str, Any] = {'type': node_type}
+    if rng.random() < shape.enum_ratio:
+        leaf['datatype'] = 'string'
+        leaf['enum'] = [f'VALUE_{i}' for i in range(rng.randint(2, 8))]
+    else:
+        leaf['datatype'] = rng.choice(DATA_TYPES)
+    if leaf['datatype'] in NUMERIC_TYPES:
+        if rng.random() < 0.5:
+            leaf['unit'] = rng.choice(UNITS)
+        if rng.random() < 0.3:
+            leaf['min'] = 0
+            leaf['max'] = rng.choice((100, 255, 1000))
+    leaf['description'] = f'Synthetic {node_type}.'
+    return leaf
+
+
+def create_tree(shape: TreeShape) -> Dict[str, Dict[str, Any]]:
+    '''
+    :param shape: Shape of the tree
+    :return: Attributes of each node by its dotted path, parents first
+    '''
+    rng = random.Random(shape.seed)
+    branches = _branches(shape)
+    leaves = shape.nodes - len(branches)
+    tree: Dict[str, Dict[str, Any]] = {}
+    for i, (path, level) in enumerate(branches):
+        branch: Dict[str, Any] = {
+            'type': 'branch', 'description': f'Synthetic branch {path}.',
+        }
+        if level > 0 and rng.random() < shape.instance_ratio:
+            branch['instances'] = list(rng.choice(INSTANCES))
+        tree[path] = branch
+        # Leaves are spread evenly over the branches
+        count = leaves * (i + 1) // len(branches) - leaves * i // len(branches)
+        for j in range(count):
+            tree[f'{path}.Signal{j}'] = _leaf(rng, shape)
+    return tree
+
+
+def create_layer(
+        tree: Dict[str, Dict[str, Any]], shape: TreeShape
+) -> Dict[str, Any]:
+    '''
+    :param tree: Attributes of each node by its dotted path, parents first
+    :param shape: Shape of the tree
+    :return: Nested layer of a part of the tree
+    '''
+    rng = random.Random(shape.seed + 1)
+    layer: Dict[str, Any] = {}
+    entries: Dict[str, Dict[str, Any]] = {'': layer}
+    for path, attributes in tree.items():
+        parent_path, _, name = path.rpartition('.')
+        parent = entries.get(parent_path)
+        if parent is None or rng.random() >= shape.layer_ratio:
+            continue
+        entry: Dict[str, Any] = {}
+        if attributes['type'] == 'branch':
+            if rng.random() < 0.3:
+                entry['_francaIDL'] = {'methods': {'write': 'set'}}
+            entries[path] = entry
+            if rng.random() < shape.list_ratio and parent is not layer:
+                parent[name] = [entry]
+                continue
+        elif attributes['type'] == 'actuator':
+            entry['_francaIDL'] = {'methods': {'write': 'set', 'read': 'get'}}
+        elif rng.random() < 0.1:
+            entry['_parentAttribute'] = None
+        else:
+            entry['_francaIDL'] = {'methods': {'read': 'get'}}
+        parent[name] = entry
+    return layer
+
+
+def _dump(data: Any, file_name: str) -> None:
+    with open(file_name, 'w') as file:
+        yaml.dump(data, file, Dumper=_Dumper, sort_keys=False)
+
+
+def write_tree(directory: str, shape: TreeShape) -> Tuple[str, str]:
+    '''
+    Writes the vspec files and the layer of a synthetic tree
+    :param directory: Directory to receive the files
+    :param shape: Shape of the tree
+    :return: Paths of the root vspec file and of the root layer file
+    '''
+    os.makedirs(directory, exist_ok=True)
+    tree = create_tree(shape)
+
+    # The root file keeps the root and its leaves, each branch under the
+    #  root goes to its own file, with paths relative to the root
+    root_nodes: Dict[str, Dict[str, Any]] = {}
+    parts: Dict[str, Dict[str, Any]] = {}
+    for path, attributes in tree.items():
+        relative = path[len(ROOT) + 1:]
+        part = relative.split('.', 1)[0]
+        if part and tree.get(f'{ROOT}.{part}', {}).get('type') == 'branch':
+            parts.setdefault(part, {})[relative] = attributes
+        else:
+            root_nodes[path] = attributes
+
+    vspec_file = os.path.join(directory, 'spec.vspec')
+    _dump(root_nodes, vspec_file)
+    with open(vspec_file, 'a') as file:
+        for part in parts:
+            file.write(f'#include {part}.vspec {ROOT}\n')
+    for part, nodes in parts.items():
+        _dump(nodes, os.path.join(directory, f'{part}.vspec'))
+
+    layer = create_layer(tree, shape)
+    root_entry = layer.get(ROOT, {})
+    for part, entry in root_entry.items():
+        if part in parts and isinstance(entry, dict):
+            _dump(entry, os.path.join(directory, f'{part}.depl'))
+            root_entry[part] = _Include(f'{part}.depl')
+    layer_file = os.path.join(directory, 'layer.depl')
+    _dump(layer, layer_file)
+    return vspec_file, layer_file
+
+
+def write_sizes(directory: str) -> Dict[str, Tuple[str, str]]:
+    '''
+    Writes a tree of the default shape for each of SIZES
+    :param directory: Directory to receive a directory for each size
+    :return: Root vspec file and root layer file by size
+    '''
+    return {
+        size: write_tree(
+            os.path.join(directory, size), TreeShape(nodes=nodes)
+        ) for size, nodes in SIZES.items()
+    }
+
+
+def get_arg_parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='Writes a synthetic vspec tree and its layer.'
+    )
+    parser.add_argument('output_dir', help='Directory to receive the files.')
+    parser.add_argument(
+        '--size', choices=SIZES,
+        help='Number of nodes relative to the VSS specification. Overrides '
+             '--nodes.',
+    )
+    for field, default in TreeShape._field_defaults.items():
+        parser.add_argument(
+            f'--{field.replace("_", "-")}', type=type(default),
+            default=default, help=f'Default: {default}.',
+        )
+    return parser
+
+
+def main(raw_args=None) -> None:
+    args = get_arg_parse().parse_args(raw_args)
+    if args.size:
+        args.nodes = SIZES[args.size]
+    shape = TreeShape(**{f: getattr(args, f) for f in TreeShape._fields})
+    for path in write_tree(args.output_dir, shape):
+        sys.stdout.write(f'{path}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,36 @@
 
 # -*- coding: utf-8 -*-
 
+import os
+
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
 
 name = 'vss2graphql_schema'
 version = 1
 release = 0
 
+
+class BuildPyCompilingTemplates(build_py):
+    '''
+    Also compiles the jinja templates into python modules, loaded at runtime
+     instead of compiling the templates in every process, and saves the
+     digest of the package sources keying the fragment cache
+    '''
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+
+        from vss2graphql_schema.graphql_generators.templates import (
+            compile_templates
+        )
+        compile_templates(os.path.join(
+            self.build_lib, 'vss2graphql_schema', 'graphql_generators',
+            'compiled_templates',
+        ))
+
+
 setup(
     name=name,
     version=f'{version}.{release}',
@@ -49,4 +73,5 @@ setup(
     package_data={'vss2graphql_schema.graphql_generators': [
         'templates/*.jinja'
     ]},
+    cmdclass={'build_py': BuildPyCompilingTemplates},
 )
@@ -0,0 +1,72 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import io
+import os
+import tempfile
+import unittest
+
+from vss2graphql_schema.graphql_generators.emitters.field_emitter import (
+    FieldEmitter
+)
+from vss2graphql_schema.graphql_generators.model.description import (
+    Description
+)
+from vss2graphql_schema.graphql_generators.model.field import Field
+from vss2graphql_schema.graphql_generators.templates import Templates
+
+CUSTOM_DESCRIPTION = '''\
+{% macro print_description(description) -%}
+# custom: {{ description }}
+{%- endmacro %}
+'''
+
+
+class FieldEmitterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.templates_dir = tempfile.TemporaryDirectory()
+        self.entries = [
+            Field('speed', 'Int', Description('Vehicle speed')),
+            Field('id', 'ID'),
+        ]
+
+    def tearDown(self) -> None:
+        Templates.configure()
+        self.templates_dir.cleanup()
+
+    def render(self) -> str:
+        emitter = FieldEmitter(io.StringIO(), 'type', self.entries)
+        return emitter.render_all({'name': 'Vehicle'})
+
+    def test_python_entries_match_jinja(self) -> None:
+        emitter = FieldEmitter(io.StringIO(), 'type', self.entries)
+        self.assertTrue(emitter.python_entries)
+        text = self.render()
+        emitter.python_entries = False
+        self.assertEqual(text, emitter.render_all({'name': 'Vehicle'}))
+
+    def test_custom_description_template(self) -> None:
+        with open(
+                os.path.join(self.templates_dir.name, 'description.jinja'), 'w'
+        ) as file:
+            file.write(CUSTOM_DESCRIPTION)
+        Templates.configure(self.templates_dir.name)
+
+        emitter = FieldEmitter(io.StringIO(), 'type', self.entries)
+        self.assertFalse(emitter.python_entries)
+        text = self.render()
+        self.assertIn('# custom: Vehicle speed', text)
+        self.assertNotIn('"""', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
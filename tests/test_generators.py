@@ -0,0 +1,55 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import argparse
+import io
+import unittest
+
+from vss2graphql_schema.graphql_generators.graphql_schema_vss import (
+    GraphQLSchemaVSS
+)
+from vss2graphql_schema.graphql_generators.vss_generators \
+    .directive_generator import DirectiveGenerator
+
+
+class DirectiveGeneratorTest(unittest.TestCase):
+    def generate(self, args: argparse.Namespace) -> str:
+        output = io.StringIO()
+        DirectiveGenerator(output, args).generate()
+        return output.getvalue()
+
+    def test_namespace_without_new_options(self) -> None:
+        # Callers building their own namespace may not set output_format
+        args = argparse.Namespace(
+            range_directive=True, permission_directive=False
+        )
+        text = self.generate(args)
+        self.assertIn('directive @range', text)
+        args.output_format = 'sdl'
+        self.assertEqual(text, self.generate(args))
+
+
+class GraphQLSchemaVSSTest(unittest.TestCase):
+    def test_namespace_without_new_options(self) -> None:
+        # No jobs nor output_format: one process and the SDL
+        args = argparse.Namespace(
+            custom_scalars=False, enums=False, range_directive=True,
+            permission_directive=False, subscription_delivery_interval=False
+        )
+        output = io.StringIO()
+        GraphQLSchemaVSS(output, [], args).create_schema()
+        self.assertIn('directive @range', output.getvalue())
+        self.assertNotIn('__schema', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
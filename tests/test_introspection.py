@@ -0,0 +1,172 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, Optional
+
+import vspec
+
+from vss2graphql_schema.graphql_generators.graphql_schema_vss import (
+    GraphQLSchemaVSS
+)
+from vss2graphql_schema.graphql_generators.graphql_schema_vss_layer import (
+    GraphQLSchemaVSSLayer
+)
+from vss2graphql_schema.graphql_generators.introspection import (
+    INTROSPECTION, SDL
+)
+from vss2graphql_schema.graphql_generators.layer import Layer
+from vss2graphql_schema.graphql_generators.node_filters.layer_filter import (
+    create_layer_filter
+)
+from vss2graphql_schema.graphql_generators.node_filters.vss_tree_filter \
+    import VSSTreeFilter
+from vss2graphql_schema.graphql_generators.util import index_qualified_names
+
+try:
+    import graphql
+except ImportError:
+    graphql = None
+
+SPEC = '''\
+Vehicle:
+  type: branch
+  description: Vehicle
+Vehicle.Speed:
+  type: sensor
+  datatype: float
+  unit: km/h
+  min: 0
+  max: 250
+  description: Vehicle "speed"
+  deprecation: Use Velocity
+Vehicle.Odometer:
+  type: sensor
+  datatype: uint32
+  description: Odometer
+Vehicle.Gear:
+  type: actuator
+  datatype: string
+  enum: ['PARK', 'DRIVE']
+  description: Gear
+Vehicle.Cabin:
+  type: branch
+  description: Cabin
+Vehicle.Cabin.Door:
+  type: branch
+  description: Door
+Vehicle.Cabin.Door.IsOpen:
+  type: actuator
+  datatype: boolean
+  description: Is open
+Vehicle.Cabin.Door.Window:
+  type: actuator
+  datatype: uint8
+  min: 0
+  max: 100
+  description: Window position
+'''
+LAYER = '''\
+Vehicle:
+  Gear:
+    _francaIDL:
+      methods:
+        write: w
+  Cabin:
+    Door:
+    - IsOpen:
+        _francaIDL:
+          methods:
+            write: w
+      Window:
+        _parentAttribute: null
+'''
+
+
+class IntrospectionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        spec_file = self.write('spec.vspec', SPEC)
+        self.root = vspec.load_tree(
+            spec_file, [self.directory.name], merge_private=True
+        )
+        index_qualified_names([self.root])
+        self.layer = Layer(self.write('layer.depl', LAYER))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def generate(
+            self, output_format: str, layer: Optional[Layer] = None
+    ) -> str:
+        args = argparse.Namespace(
+            custom_scalars=True, enums=True, range_directive=True,
+            permission_directive=True, subscription_delivery_interval=True,
+            output_format=output_format, jobs=1,
+        )
+        filters = [create_layer_filter(layer)] if layer else []
+        vss_roots = VSSTreeFilter([self.root], filters, sort=True).view()
+        output = io.StringIO()
+        if layer:
+            GraphQLSchemaVSSLayer(
+                output, vss_roots, args, layer
+            ).create_schema()
+        else:
+            GraphQLSchemaVSS(output, vss_roots, args).create_schema()
+        return output.getvalue()
+
+    def introspection(self, layer: Optional[Layer] = None) -> Dict[str, Any]:
+        return json.loads(self.generate(INTROSPECTION, layer))
+
+    def test_document(self) -> None:
+        schema = self.introspection()['__schema']
+        types = {t['name']: t for t in schema['types']}
+        self.assertEqual(schema['queryType'], {'name': 'Query'})
+        self.assertEqual(schema['mutationType'], {'name': 'Mutation'})
+        self.assertEqual(types['UInt32']['kind'], 'SCALAR')
+        self.assertEqual(types['Vehicle_Gear_Enum']['kind'], 'ENUM')
+        speed = next(
+            f for f in types['Vehicle']['fields'] if f['name'] == 'speed'
+        )
+        self.assertTrue(speed['isDeprecated'])
+        self.assertEqual(speed['deprecationReason'], 'Use Velocity')
+
+    @unittest.skipUnless(graphql, 'graphql-core is not installed')
+    def test_same_schema_as_sdl(self) -> None:
+        for layer in (None, self.layer):
+            sdl_schema = graphql.build_schema(self.generate(SDL, layer))
+            client_schema = graphql.build_client_schema(
+                self.introspection(layer)
+            )
+            self.assertEqual(
+                graphql.print_schema(
+                    graphql.lexicographic_sort_schema(client_schema)
+                ),
+                graphql.print_schema(
+                    graphql.lexicographic_sort_schema(sdl_schema)
+                ),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+
+from vss2graphql_schema.graphql_generators.layer import Layer
+from vss2graphql_schema.graphql_generators.layer_cache import (
+    LayerCache, dump_snapshot, layer_key, load_layer_cached, load_snapshot
+)
+
+LAYER = '''\
+Vehicle:
+  Speed: !include speed.depl
+  Cabin:
+    _francaIDL:
+      methods:
+        write: w
+    Door:
+    - Row1:
+        _parentAttribute: null
+      Lock:
+        _francaIDL:
+          methods:
+            read: r
+'''
+SPEED = '''\
+_francaIDL:
+  methods:
+    write: w
+'''
+
+
+def index_of(layer: Layer) -> tuple:
+    return (
+        layer.entries, layer.qualified_names, layer.list_node_names,
+        layer.write_node_names, layer.parent_attribute_node_names,
+    )
+
+
+class LayerCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = self.write('layer.depl', LAYER)
+        self.write('speed.depl', SPEED)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def test_snapshot_round_trip(self) -> None:
+        layer = Layer(self.file)
+        self.assertIn('Vehicle', layer.write_node_names)
+        self.assertIn('Vehicle_Cabin_Door', layer.list_node_names)
+        loaded = load_snapshot(dump_snapshot(layer))
+        self.assertEqual(index_of(layer), index_of(loaded))
+
+    def test_empty_layer_round_trip(self) -> None:
+        layer = Layer.from_index({}, ())
+        loaded = load_snapshot(dump_snapshot(layer))
+        self.assertEqual(index_of(layer), index_of(loaded))
+
+    def test_truncated_snapshot(self) -> None:
+        snapshot = dump_snapshot(Layer(self.file))
+        with self.assertRaises(ValueError):
+            load_snapshot(snapshot[:-20])
+
+    def test_cache_hit_and_include_change(self) -> None:
+        cache = LayerCache(os.path.join(self.directory.name, 'cache'))
+        layer = load_layer_cached(self.file, cache=cache)
+        cached = load_layer_cached(self.file, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(index_of(layer), index_of(cached))
+
+        key = layer_key(self.file)
+        self.write('speed.depl', '_parentAttribute: null\n')
+        self.assertNotEqual(key, layer_key(self.file))
+        changed = load_layer_cached(self.file, cache=cache)
+        self.assertEqual(cache.misses, 2)
+        self.assertNotIn('Vehicle', layer.parent_attribute_node_names)
+        self.assertIn('Vehicle', changed.parent_attribute_node_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
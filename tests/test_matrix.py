@@ -0,0 +1,113 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+
+from vss2graphql_schema.matrix import (
+    MatrixError, load_matrix, parse_variant_args, variant_argv
+)
+from vss2graphql_schema.vss2graphql_schema import get_arg_parse
+
+MATRIX = '''\
+defaults:
+  custom-scalars: true
+variants:
+  - output: public.graphql
+  - output: internal.graphql
+    custom-scalars: false
+    permission-directive: true
+    regex-filter: [Vehicle_Cabin, Vehicle_Body]
+  - output: layer.graphql
+    layer: layer.depl
+    range-directive: null
+'''
+
+
+class VariantArgvTest(unittest.TestCase):
+    def test_options(self) -> None:
+        self.assertEqual(variant_argv({
+            'output': 'a.graphql', 'enums': True, 'custom-scalars': False,
+            'layer': None, 'regex_filter': ['A', 'B'], 'jobs': 2,
+        }), [
+            '--output', 'a.graphql', '--enums', '--regex-filter', 'A',
+            '--regex-filter', 'B', '--jobs', '2',
+        ])
+
+
+class ParseVariantArgsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.parser = get_arg_parse()
+        self.args = self.parser.parse_args([
+            'spec.vspec', '-I', 'include', '--range-directive',
+            '--regex-filter', 'Vehicle_Speed', '-o', 'schema.graphql',
+        ])
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, text: str) -> str:
+        file_name = os.path.join(self.directory.name, 'matrix.yaml')
+        with open(file_name, 'w') as file:
+            file.write(text)
+        return file_name
+
+    def test_variants(self) -> None:
+        public, internal, layer = (
+            parse_variant_args(self.parser, self.args, options)
+            for options in load_matrix(self.write(MATRIX))
+        )
+        self.assertEqual(public.output, 'public.graphql')
+        self.assertTrue(public.custom_scalars)
+        self.assertTrue(public.range_directive)
+        self.assertEqual(public.dirs, ['include'])
+
+        # 'false' turns off a flag of the defaults and of the command line
+        self.assertFalse(internal.custom_scalars)
+        self.assertTrue(internal.permission_directive)
+        self.assertEqual(
+            internal.regex_filter,
+            ['Vehicle_Speed', 'Vehicle_Cabin', 'Vehicle_Body'],
+        )
+
+        # 'null' keeps the command line value
+        self.assertTrue(layer.range_directive)
+        self.assertEqual(layer.layer, 'layer.depl')
+        self.assertIsNone(public.layer)
+
+        # The arguments of the run are not changed by the variants
+        self.assertEqual(self.args.output, 'schema.graphql')
+        self.assertEqual(self.args.regex_filter, ['Vehicle_Speed'])
+        self.assertFalse(self.args.custom_scalars)
+
+    def test_run_options(self) -> None:
+        for option in ('I', 'cache-dir', 'watch'):
+            file_name = self.write(
+                f'variants:\n  - output: a.graphql\n    {option}: x\n'
+            )
+            with self.assertRaises(MatrixError):
+                load_matrix(file_name)
+
+    def test_output_required(self) -> None:
+        for text in (
+                'variants:\n  - enums: true\n',
+                'variants:\n  - output: "-"\n',
+                'variants: {output: a.graphql}\n',
+        ):
+            with self.assertRaises(MatrixError):
+                load_matrix(self.write(text))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import unittest
+
+from vss2graphql_schema.graphql_generators.model.directive_call import (
+    DeprecatedDirective, HasPermissionsDirective, RangeDirective
+)
+from vss2graphql_schema.graphql_generators.model.field import Field
+
+
+class DirectiveCallTest(unittest.TestCase):
+    def test_range_directive(self) -> None:
+        directive = RangeDirective(0, 250.5)
+        self.assertEqual(
+            (directive.min_value, directive.max_value), (0, 250.5)
+        )
+        self.assertEqual(str(directive), '@range(min: 0, max: 250.5)')
+        self.assertEqual(str(RangeDirective(None, 3)), '@range(max: 3)')
+
+    def test_has_permissions_directive(self) -> None:
+        directive = HasPermissionsDirective(['READ', 'WRITE'], str.lower)
+        self.assertEqual(directive.permissions, ['READ', 'WRITE'])
+        self.assertEqual(
+            str(directive), '@hasPermissions(permissions: ["read", "write"])'
+        )
+
+    def test_deprecated_directive(self) -> None:
+        directive = DeprecatedDirective('use "Speed"')
+        self.assertEqual(directive.reason, 'use "Speed"')
+        self.assertEqual(
+            str(directive), '@deprecated(reason: "use \'Speed\'")'
+        )
+
+
+class FieldTest(unittest.TestCase):
+    def test_defaults_are_lists(self) -> None:
+        field = Field('speed', 'Int')
+        self.assertEqual((field.parameters, field.directives), ([], []))
+        field.directives.append(DeprecatedDirective(None))
+        self.assertEqual(str(field), 'speed: Int @deprecated()')
+        self.assertEqual(Field('id', 'ID').directives, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+from typing import Callable, List
+
+import vspec
+from vspec.model.vsstree import VSSNode, VSSType
+
+from vss2graphql_schema.graphql_generators.layer import Layer, LayerEntry
+from vss2graphql_schema.graphql_generators.node_facts import (
+    NODE_TYPES, NodeFacts, mask_and, mask_or
+)
+from vss2graphql_schema.graphql_generators.node_filters.regex_filter import (
+    create_filter_pattern
+)
+from vss2graphql_schema.graphql_generators.node_filters.vss_tree_filter \
+    import VSSTreeFilter
+from vss2graphql_schema.graphql_generators.util import (
+    index_qualified_names, node_has_enum, qualified_name
+)
+
+SPEC = '''\
+Vehicle:
+  type: branch
+  description: Vehicle
+Vehicle.Speed:
+  type: sensor
+  datatype: float
+  description: Speed
+  deprecation: Use Velocity
+Vehicle.Gear:
+  type: actuator
+  datatype: string
+  enum: ['PARK', 'DRIVE']
+  description: Gear
+Vehicle.Cabin:
+  type: branch
+  description: Cabin
+Vehicle.Cabin.Door:
+  type: branch
+  description: Door
+Vehicle.Cabin.Door.IsOpen:
+  type: actuator
+  datatype: boolean
+  description: Is open
+Vehicle.Cabin.Door.Position:
+  type: sensor
+  datatype: uint8
+  description: Position
+Vehicle.Cabin.Hidden:
+  type: actuator
+  datatype: boolean
+  description: Filtered out
+Vehicle.Body:
+  type: branch
+  description: Body
+Vehicle.Body.Color:
+  type: attribute
+  datatype: string
+  description: Color
+'''
+
+
+class NodeFactsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'spec.vspec')
+            with open(file_name, 'w') as file:
+                file.write(SPEC)
+            root = vspec.load_tree(file_name, [directory], merge_private=True)
+        index_qualified_names([root])
+        self.view = VSSTreeFilter(
+            [root], [create_filter_pattern('Vehicle_Cabin_Hidden')], sort=True
+        ).view()
+        self.facts = NodeFacts(self.view)
+
+    def assert_mask(
+            self, mask: bytes, predicate: Callable[[VSSNode], bool]
+    ) -> None:
+        self.assertEqual(len(mask), len(self.facts))
+        for i, node in enumerate(self.facts.nodes):
+            self.assertEqual(
+                bool(mask[i]), bool(predicate(node)), qualified_name(node)
+            )
+
+    def children(self, node: VSSNode) -> List[VSSNode]:
+        return list(self.view.children(node))
+
+    def test_nodes_in_level_order(self) -> None:
+        self.assertEqual(self.facts.nodes, list(self.view.level_order()))
+        self.assertNotIn(
+            'Vehicle_Cabin_Hidden', map(qualified_name, self.facts.nodes)
+        )
+
+    def test_masks(self) -> None:
+        self.assert_mask(self.facts.has_children, self.children)
+        self.assert_mask(self.facts.has_enum, node_has_enum)
+        self.assert_mask(self.facts.deprecated, lambda x: x.deprecation)
+        # Cabin has an actuator child in the tree, but not in the view
+        self.assert_mask(self.facts.has_actuator_child, lambda x: any(
+            c.type == VSSType.ACTUATOR for c in self.children(x)
+        ))
+
+    def test_columns(self) -> None:
+        ids = {node: i for i, node in enumerate(self.facts.nodes)}
+        for i, node in enumerate(self.facts.nodes):
+            self.assertEqual(self.facts.parent[i], ids.get(node.parent, -1))
+            self.assertEqual(self.facts.depth[i], node.depth)
+            self.assertIs(NODE_TYPES[self.facts.node_type[i]], node.type)
+            self.assertEqual(
+                self.facts.data_types[self.facts.data_type[i]],
+                node.data_type,
+            )
+
+    def test_select(self) -> None:
+        mask = mask_or(self.facts.has_enum, self.facts.deprecated)
+        self.assertEqual(
+            [qualified_name(x) for x in self.facts.select(mask)],
+            ['Vehicle_Gear', 'Vehicle_Speed'],
+        )
+        mask = mask_and(self.facts.has_children, self.facts.has_actuator_child)
+        self.assertEqual(
+            [qualified_name(x) for x in self.facts.select(mask)],
+            ['Vehicle', 'Vehicle_Cabin_Door'],
+        )
+
+        pre_order: List[VSSNode] = []
+        pending = list(reversed(self.view.roots))
+        while pending:
+            node = pending.pop()
+            pre_order.append(node)
+            pending.extend(reversed(self.children(node)))
+        self.assertEqual(list(self.facts.select(pre_order=True)), pre_order)
+        self.assertEqual(
+            list(self.facts.select(self.facts.has_children, pre_order=True)),
+            [x for x in pre_order if self.children(x)],
+        )
+
+    def test_layer_facts(self) -> None:
+        layer = Layer.from_index({
+            'Vehicle': LayerEntry(False, False, True, False),
+            'Vehicle_Cabin_Door': LayerEntry(True, False, False, True),
+            'Vehicle_Cabin_Hidden': LayerEntry(True, False, True, True),
+        }, ('Vehicle', 'Vehicle_Cabin', 'Vehicle_Cabin_Door'))
+        facts = self.facts.layer_facts(layer)
+        self.assertIs(facts, self.facts.layer_facts(layer))
+        for mask, names in zip(facts, (
+                layer.list_node_names, layer.write_node_names,
+                layer.parent_attribute_node_names,
+        )):
+            self.assert_mask(mask, lambda x: qualified_name(x) in names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+
+from vss2graphql_schema.graphql_generators.node_filters.regex_filter import (
+    compile_patterns, create_filter_pattern, create_match_pattern,
+    read_patterns
+)
+
+
+class CompilePatternsTest(unittest.TestCase):
+    def test_single_expression(self) -> None:
+        matches = compile_patterns('Vehicle_Cabin')
+        self.assertTrue(matches('Vehicle_Cabin_Door'))
+        self.assertFalse(matches('Vehicle_Body'))
+
+    def test_alternation(self) -> None:
+        matches = compile_patterns(['Vehicle_Cabin', '.*_Speed$'])
+        self.assertTrue(matches('Vehicle_Cabin_Door'))
+        self.assertTrue(matches('Vehicle_Speed'))
+        self.assertFalse(matches('Vehicle_SpeedLimit'))
+        self.assertFalse(matches('Vehicle_Body'))
+
+    def test_backreferences(self) -> None:
+        # In one alternation the second \1 would refer to the first group
+        matches = compile_patterns([r'(A)\1', r'(B)\1', r'(?P<x>C)(?P=x)'])
+        for name in ('AA', 'BB', 'CC'):
+            self.assertTrue(matches(name), name)
+        for name in ('AB', 'BA', 'B', 'CA'):
+            self.assertFalse(matches(name), name)
+
+    def test_repeated_group_names(self) -> None:
+        matches = compile_patterns(['(?P<x>A)B', '(?P<x>C)D'])
+        self.assertTrue(matches('AB'))
+        self.assertTrue(matches('CD'))
+        self.assertFalse(matches('AD'))
+
+    def test_match_and_filter(self) -> None:
+        expressions = ['Vehicle_Cabin', 'Vehicle_Body']
+        self.assertTrue(create_match_pattern(expressions)('Vehicle_Body'))
+        self.assertFalse(create_filter_pattern(expressions)('Vehicle_Body'))
+        self.assertTrue(create_filter_pattern(expressions)('Vehicle_Speed'))
+
+
+class ReadPatternsTest(unittest.TestCase):
+    def test_comments_and_empty_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'patterns.txt')
+            with open(file_name, 'w') as file:
+                file.write('# cabin\nVehicle_Cabin\n\n  \n.*_Speed$\n')
+            self.assertEqual(
+                read_patterns(file_name), ['Vehicle_Cabin', '.*_Speed$']
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import contextlib
+import io
+import os
+import stat
+import tempfile
+import unittest
+
+from vss2graphql_schema.graphql_generators.schema_output import (
+    STDOUT, ChunkedWriter, open_schema_output
+)
+
+
+class OpenSchemaOutputTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'schema.graphql')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def read(self) -> str:
+        with open(self.path) as file:
+            return file.read()
+
+    def test_atomic_replace(self) -> None:
+        with open(self.path, 'w') as file:
+            file.write('old schema')
+        os.chmod(self.path, 0o640)
+
+        with open_schema_output(self.path, flush_size=4) as writer:
+            writer.write('type Query {\n')
+            writer.write('}\n')
+            # Flushed chunks go to a temporary file, not to the schema
+            self.assertEqual(self.read(), 'old schema')
+        self.assertEqual(self.read(), 'type Query {\n}\n')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+        self.assertEqual(os.listdir(self.directory.name), ['schema.graphql'])
+
+    def test_failed_generation(self) -> None:
+        with open(self.path, 'w') as file:
+            file.write('old schema')
+
+        with self.assertRaises(KeyboardInterrupt):
+            with open_schema_output(self.path, flush_size=1) as writer:
+                writer.write('partial')
+                raise KeyboardInterrupt
+        self.assertEqual(self.read(), 'old schema')
+        self.assertEqual(os.listdir(self.directory.name), ['schema.graphql'])
+
+    def test_stdout(self) -> None:
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with open_schema_output(STDOUT) as writer:
+                writer.write('type Query {\n')
+                writer.write('}\n')
+                self.assertEqual(stdout.getvalue(), '')
+        self.assertEqual(stdout.getvalue(), 'type Query {\n}\n')
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+class ChunkedWriterTest(unittest.TestCase):
+    def test_chunks(self) -> None:
+        target = io.StringIO()
+        writer = ChunkedWriter(target, flush_size=5)
+        writer.write('abc')
+        self.assertEqual(target.getvalue(), '')
+        writer.write('def')
+        self.assertEqual(target.getvalue(), 'abcdef')
+        writer.write('g')
+        writer.close()
+        self.assertEqual(target.getvalue(), 'abcdefg')
+
+
+if __name__ == '__main__':
+    unittest.main()
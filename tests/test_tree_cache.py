@@ -0,0 +1,117 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+from typing import BinaryIO
+
+from vss2graphql_schema.graphql_generators.tree_cache import (
+    FileCache, TreeCache, tree_key
+)
+
+
+class BytesCache(FileCache[bytes]):
+    SUFFIX = '.bytes'
+
+    def read(self, file: BinaryIO) -> bytes:
+        return file.read()
+
+    def write(self, file: BinaryIO, value: bytes) -> None:
+        if not value:
+            raise KeyboardInterrupt
+        file.write(value)
+
+
+class FileCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = BytesCache(self.directory.name, max_size=10)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_write_and_read(self) -> None:
+        self.assertIsNone(self.cache.load('a'))
+        self.cache.store('a', b'1234')
+        self.assertEqual(self.cache.load('a'), b'1234')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(os.listdir(self.directory.name), ['a.bytes'])
+
+    def test_eviction(self) -> None:
+        for i, key in enumerate('abc'):
+            self.cache.store(key, b'1234')
+            os.utime(self.cache._path(key), ns=(i, i))
+        # The oldest entry goes when the cache grows over max_size
+        self.assertIsNone(self.cache.load('a'))
+        # Reading an entry marks it as the most recently used
+        self.assertEqual(self.cache.load('b'), b'1234')
+        self.cache.store('d', b'1234')
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)), ['b.bytes', 'd.bytes']
+        )
+
+    def test_interrupted_write(self) -> None:
+        self.cache.store('a', b'1234')
+        with self.assertRaises(KeyboardInterrupt):
+            self.cache.store('a', b'')
+        self.assertEqual(os.listdir(self.directory.name), ['a.bytes'])
+        self.assertEqual(self.cache.load('a'), b'1234')
+
+
+class TreeCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.spec_dir = os.path.join(self.directory.name, 'spec')
+        self.include_dir = os.path.join(self.directory.name, 'include')
+        os.makedirs(self.spec_dir)
+        os.makedirs(self.include_dir)
+        self.root = self.write(
+            self.spec_dir, 'root.vspec', '#include branch.vspec Vehicle\n'
+        )
+        self.branch = self.write(self.include_dir, 'branch.vspec', 'Speed:\n')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @staticmethod
+    def write(directory: str, name: str, text: str) -> str:
+        path = os.path.join(directory, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def key(self) -> str:
+        return tree_key(self.root, [self.include_dir], False)
+
+    def test_included_file_change(self) -> None:
+        cache = TreeCache(os.path.join(self.directory.name, 'cache'))
+        key = self.key()
+        cache.store(key, {'tree': 1})
+        self.assertEqual(cache.load(self.key()), {'tree': 1})
+
+        self.write(self.include_dir, 'branch.vspec', 'Speed:\nRpm:\n')
+        self.assertNotEqual(key, self.key())
+        self.assertIsNone(cache.load(self.key()))
+
+    def test_include_candidates(self) -> None:
+        key = self.key()
+        # A file of the same name closer to the includer may shadow it
+        self.write(self.spec_dir, 'branch.vspec', 'Speed:\n')
+        self.assertNotEqual(key, self.key())
+        self.assertNotEqual(
+            self.key(), tree_key(self.root, [self.include_dir], True)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
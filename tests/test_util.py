@@ -0,0 +1,77 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+
+from vss2graphql_schema.graphql_generators.tree_cache import load_tree_cached
+from vss2graphql_schema.graphql_generators.util import (
+    get_has_permission_directive, get_node_description, index_qualified_names
+)
+
+VSPEC = '''\
+Vehicle:
+  type: branch
+  description: Vehicle
+Vehicle.Gear:
+  type: actuator
+  datatype: string
+  description: Selected gear
+  enum:
+  - park
+  - drive
+'''
+
+
+class MemoizedHelpersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            vspec_file = os.path.join(directory, 'spec.vspec')
+            with open(vspec_file, 'w') as file:
+                file.write(VSPEC)
+            root = load_tree_cached(
+                vspec_file, [directory], merge_private=True, cache=None
+            )
+        index_qualified_names([root])
+        self.node = root.children[0]
+
+    def test_keyword_arguments(self) -> None:
+        description = get_node_description(self.node, True)
+        self.assertIs(
+            get_node_description(self.node, print_enum=True), description
+        )
+        self.assertIs(
+            get_node_description(node=self.node, print_enum=True),
+            description,
+        )
+        self.assertIn('park', str(description))
+
+        directive = get_has_permission_directive(
+            self.node, permissions=('READ', 'WRITE')
+        )
+        self.assertIs(
+            get_has_permission_directive(self.node, ('READ', 'WRITE')),
+            directive,
+        )
+
+    def test_default_arguments(self) -> None:
+        description = get_node_description(self.node)
+        self.assertIs(get_node_description(self.node, False), description)
+        self.assertIs(
+            get_node_description(self.node, print_enum=False), description
+        )
+        self.assertNotIn('park', str(description))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+import tempfile
+import unittest
+from typing import List, Tuple
+
+import vspec
+from vspec.model.vsstree import VSSNode
+
+from vss2graphql_schema.graphql_generators.node_filters.regex_filter import (
+    create_filter_pattern, create_match_pattern
+)
+from vss2graphql_schema.graphql_generators.node_filters.vss_tree_filter \
+    import VSSTreeFilter
+from vss2graphql_schema.graphql_generators.tree_view import VSSTreeView
+from vss2graphql_schema.graphql_generators.util import (
+    index_qualified_names, qualified_name
+)
+
+SPEC = '''\
+Vehicle:
+  type: branch
+  description: Vehicle
+Vehicle.Speed:
+  type: sensor
+  datatype: float
+  description: Speed
+Vehicle.Cabin:
+  type: branch
+  description: Cabin
+Vehicle.Cabin.Door:
+  type: branch
+  description: Door
+Vehicle.Cabin.Door.IsOpen:
+  type: actuator
+  datatype: boolean
+  description: Is open
+Vehicle.Cabin.Light:
+  type: branch
+  description: Light
+Vehicle.Cabin.Light.IsOn:
+  type: actuator
+  datatype: boolean
+  description: Is on
+Vehicle.Body:
+  type: branch
+  description: Body
+Vehicle.Body.Color:
+  type: attribute
+  datatype: string
+  description: Color
+'''
+
+
+def tree_shape(node: VSSNode) -> List[Tuple[str, List[str]]]:
+    shape = []
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        shape.append((node.name, [x.name for x in node.children]))
+        pending.extend(reversed(node.children))
+    return shape
+
+
+def view_names(view: VSSTreeView) -> List[str]:
+    return [qualified_name(x) for x in view.level_order()]
+
+
+class VSSTreeFilterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'spec.vspec')
+            with open(file_name, 'w') as file:
+                file.write(SPEC)
+            self.root = vspec.load_tree(
+                file_name, [directory], merge_private=True
+            )
+        index_qualified_names([self.root])
+        self.shape = tree_shape(self.root)
+
+    def test_view_leaves_tree_unchanged(self) -> None:
+        view = VSSTreeFilter(
+            [self.root], [create_filter_pattern('Vehicle_Cabin_Door')],
+            sort=True,
+        ).view()
+        self.assertEqual(view_names(view), [
+            'Vehicle', 'Vehicle_Body', 'Vehicle_Cabin', 'Vehicle_Speed',
+            'Vehicle_Body_Color', 'Vehicle_Cabin_Light',
+            'Vehicle_Cabin_Light_IsOn',
+        ])
+        self.assertEqual(tree_shape(self.root), self.shape)
+
+        # Another view of the same tree is not affected by the first one
+        view = VSSTreeFilter(
+            [self.root], [create_match_pattern(['Vehicle$', 'Vehicle_Cabin'])],
+        ).view()
+        self.assertEqual(view_names(view), [
+            'Vehicle', 'Vehicle_Cabin', 'Vehicle_Cabin_Door',
+            'Vehicle_Cabin_Light', 'Vehicle_Cabin_Door_IsOpen',
+            'Vehicle_Cabin_Light_IsOn',
+        ])
+        self.assertEqual(tree_shape(self.root), self.shape)
+
+    def test_empty_branches_are_dropped(self) -> None:
+        view = VSSTreeFilter(
+            [self.root], [create_filter_pattern('.*_Is(Open|On)$')]
+        ).view()
+        self.assertEqual(view_names(view), [
+            'Vehicle', 'Vehicle_Speed', 'Vehicle_Body', 'Vehicle_Body_Color',
+        ])
+        self.assertEqual(tree_shape(self.root), self.shape)
+
+    def test_filter_trees_applies_the_view(self) -> None:
+        tree_filter = VSSTreeFilter(
+            [self.root], [create_filter_pattern('Vehicle_Cabin')], sort=True
+        )
+        names = view_names(tree_filter.view())
+        roots = list(tree_filter.filter_trees())
+        self.assertEqual(view_names(VSSTreeView(roots)), names)
+        self.assertEqual(
+            [x.name for x in self.root.children], ['Body', 'Speed']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
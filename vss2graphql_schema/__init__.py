@@ -9,3 +9,10 @@
 # Mozilla Public License, v. 2.0. If a copy of the MPL was
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
+
+import time
+
+# Taken before the modules of the package are imported, --timings reports
+# the import time from here
+import_started = time.perf_counter()
+import_started_cpu = time.process_time()
@@ -19,6 +19,8 @@ from typing import (
 import jinja2
 
 from .emitters.common_emitter import CommonEmitter
+from .emitters.introspection_emitter import IntrospectionEmitter
+from .introspection import INTROSPECTION, SDL
 from .templates import Templates
 
 
@@ -28,12 +30,14 @@ class CommonGenerator:
      method.
     It has a 'separator_template' to write a kind of header to organize the
      file it will output.
+    With --output-format introspection, the IntrospectionEmitter replaces
+     'emitter' and no separator is written.
     '''
     output: TextIO
     name: str
     emitter: Type[CommonEmitter]
     args: argparse.Namespace
-    separator_template: jinja2.Template
+    output_format: str
 
     def __init__(
             self, output: TextIO, name: str, emitter: Type[CommonEmitter],
@@ -41,9 +45,20 @@ class CommonGenerator:
     ) -> None:
         self.output = output
         self.name = name
-        self.emitter = emitter
         self.args = args
-        self.separator_template = getattr(Templates, 'separator')
+        # Namespaces built by callers, not by the CLI, may not have it
+        self.output_format = getattr(args, 'output_format', SDL)
+        if self.output_format == INTROSPECTION:
+            emitter = IntrospectionEmitter
+        self.emitter = emitter
+
+    @property
+    def separator_template(self) -> jinja2.Template:
+        '''
+        Compiled templates can not be pickled, so the separator is looked up
+         when used and generators can be sent to worker processes.
+        '''
+        return getattr(Templates, 'separator')
 
     def emit_separator(self, name: Optional[str] = None) -> None:
         '''
@@ -51,6 +66,8 @@ class CommonGenerator:
         :param name: Custom name to print on separator
         :return: None
         '''
+        if self.output_format == INTROSPECTION:
+            return
         if name is None:
             name = self.name.upper()
 
@@ -0,0 +1,376 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import contextlib
+import glob
+import os
+import re
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING, Any, Iterator, List, NamedTuple, Optional, Set, Tuple
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+DEPL_FILE = re.compile(r'^.+\.depl$', re.IGNORECASE)
+INCLUDE_TAG = '!include'
+GLOB_CHARACTERS = '*?[]!'
+YAML_READERS = ('', 'yaml', 'yml')
+# Fewer stale files are parsed faster than a process pool starts
+MIN_PARALLEL_FILES = 32
+INCLUDE_PATTERN = re.compile(r'!include\b')
+# '!include file.depl' and '!include dir/*.depl', found without parsing YAML
+SCALAR_INCLUDE_PATTERN = re.compile(r'!include\s+[\'"]?([^\s{}\[\],\'"]+)')
+# Parsed files kept in memory, the least recently used are dropped first
+MAX_PARSED_FILES = 4096
+
+
+class Include(NamedTuple):
+    '''
+    An '!include' of a layer file, with the arguments of pyyaml-include. It is
+     replaced by the included data once the included files are parsed.
+    '''
+    pathname: str
+    recursive: bool = False
+    encoding: str = ''
+    default: Any = None
+    reader: str = ''
+    has_default: bool = False
+
+
+class ParsedFile(NamedTuple):
+    '''
+    Data of a layer file, with Include for its includes
+    '''
+    stamp: Tuple[int, int]
+    data: Any
+    has_includes: bool
+
+
+# Parsed files by path and encoding, least recently used first. Entries are
+#  valid while the modification time and size of the file are the same, and
+#  replaced when the file is parsed again.
+_parsed_files: 'OrderedDict[Tuple[str, str], ParsedFile]' = OrderedDict()
+_loader_class: Optional[type] = None
+
+
+def _construct_include(loader: Any, node: Any) -> Include:
+    import yaml
+
+    if isinstance(node, yaml.ScalarNode):
+        return Include(loader.construct_scalar(node))
+    if isinstance(node, yaml.SequenceNode):
+        args = loader.construct_sequence(node)
+        return Include(*args)._replace(has_default=len(args) > 3)
+    if isinstance(node, yaml.MappingNode):
+        kwargs = loader.construct_mapping(node)
+        return Include(has_default='default' in kwargs, **kwargs)
+    raise TypeError(f'Un-supported YAML node {node!r}')
+
+
+def depl_loader_class() -> type:
+    '''
+    :return: YAML loader class of layer files. It has its own '!include'
+     constructor, so loading layers does not change the yaml module loaders,
+     and it is based on libyaml when PyYAML was built with it.
+    '''
+    global _loader_class
+    if _loader_class is None:
+        import yaml
+
+        base = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+        loader_class: Any = type('DeplLoader', (base,), {})
+        loader_class.add_constructor(INCLUDE_TAG, _construct_include)
+        _loader_class = loader_class
+    return _loader_class
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_file(path: str, encoding: str) -> Any:
+    '''
+    :param path: Layer file
+    :param encoding: File encoding, UTF-8 if empty
+    :return: Data of the file, with Include for its includes
+    '''
+    import yaml
+
+    with open(path, encoding=encoding or 'utf-8') as file:
+        return yaml.load(file, Loader=depl_loader_class())
+
+
+def _store(
+        path: str, encoding: str, stamp: Tuple[int, int], data: Any
+) -> ParsedFile:
+    parsed = ParsedFile(
+        stamp, data, next(_find_includes(data), None) is not None
+    )
+    _parsed_files[path, encoding] = parsed
+    _parsed_files.move_to_end((path, encoding))
+    return parsed
+
+
+def _evict() -> None:
+    '''
+    Drops the least recently used parsed files over MAX_PARSED_FILES, e.g.
+     of layers no longer loaded by --watch or --matrix runs
+    :return: None
+    '''
+    while len(_parsed_files) > MAX_PARSED_FILES:
+        _parsed_files.popitem(last=False)
+
+
+def parse_file(path: str, encoding: str = '') -> ParsedFile:
+    '''
+    _load_file, memoized while the file does not change
+    :param path: Layer file
+    :param encoding: File encoding, UTF-8 if empty
+    :return: The parsed file
+    '''
+    stamp = _stamp(path)
+    parsed = _parsed_files.get((path, encoding))
+    if parsed is not None and parsed.stamp == stamp:
+        _parsed_files.move_to_end((path, encoding))
+        return parsed
+    return _store(path, encoding, stamp, _load_file(path, encoding))
+
+
+def _include_paths(include: Include, base_dir: str) -> Tuple[List[str], bool]:
+    '''
+    :param include: Include of a layer file
+    :param base_dir: Directory of the root layer file
+    :return: Included paths, and whether the pathname is a pattern
+    '''
+    pathname = os.path.join(base_dir, include.pathname)
+    if any(c in pathname for c in GLOB_CHARACTERS):
+        return [
+            path for path in glob.iglob(pathname, recursive=include.recursive)
+            if os.path.isfile(path)
+        ], True
+    return [pathname], False
+
+
+def include_closure(file: str) -> Tuple[List[Tuple[str, bytes]], bool]:
+    '''
+    Finds the files included by a layer file without parsing YAML. Only the
+     scalar form of '!include' is understood.
+    :param file: Root layer file
+    :return: Path and content of the file and of every file it includes, and
+     whether every include was understood
+    '''
+    base_dir = os.path.dirname(file)
+    files = []
+    complete = True
+    visited: Set[str] = set()
+    pending = [file]
+    while pending:
+        path = pending.pop()
+        if path in visited or not os.path.isfile(path):
+            continue
+        visited.add(path)
+        with open(path, 'rb') as f:
+            content = f.read()
+        files.append((path, content))
+
+        text = content.decode('utf-8', 'replace')
+        names = SCALAR_INCLUDE_PATTERN.findall(text)
+        complete = complete and len(names) == len(
+            INCLUDE_PATTERN.findall(text)
+        )
+        for name in reversed(names):
+            paths, _ = _include_paths(Include(name), base_dir)
+            pending.extend(sorted(paths, reverse=True))
+    return files, complete
+
+
+def _find_includes(data: Any) -> Iterator[Include]:
+    '''
+    :param data: Data of a layer file
+    :return: The includes in the data
+    '''
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, Include):
+            yield value
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+
+
+def _is_stale(path: str, encoding: str) -> bool:
+    parsed = _parsed_files.get((path, encoding))
+    try:
+        return parsed is None or parsed.stamp != _stamp(path)
+    except OSError:
+        # Missing files are reported, or defaulted, when they are resolved
+        return False
+
+
+def _parse_level(
+        files: List[Tuple[str, str]], pool: Optional['Executor']
+) -> None:
+    '''
+    Parses the files that changed since they were parsed
+    :param files: Paths and encodings of the files
+    :param pool: Executor parsing the files in parallel, if any
+    :return: None
+    '''
+    stale = [(path, enc) for path, enc in files if _is_stale(path, enc)]
+    if pool is None or not stale:
+        for path, encoding in stale:
+            parse_file(path, encoding)
+        return
+
+    stamps = [_stamp(path) for path, _ in stale]
+    parsed = pool.map(
+        _load_file, *zip(*stale), chunksize=max(1, len(stale) // 64)
+    )
+    for (path, encoding), stamp, data in zip(stale, stamps, parsed):
+        _store(path, encoding, stamp, data)
+
+
+def _next_level(
+        files: List[Tuple[str, str]], base_dir: str, seen: Set[Tuple[str, str]]
+) -> List[Tuple[str, str]]:
+    '''
+    :param files: Parsed layer files
+    :param base_dir: Directory of the root layer file
+    :param seen: Files already found, updated with the new ones
+    :return: YAML files included by the files that were not found before
+    '''
+    level = []
+    for path, encoding in files:
+        parsed = _parsed_files.get((path, encoding))
+        # Missing files were not parsed, they fail when they are resolved
+        if parsed is None or not parsed.has_includes:
+            continue
+        for include in _find_includes(parsed.data):
+            if include.reader.strip().lower() not in YAML_READERS:
+                continue
+            for included in _include_paths(include, base_dir)[0]:
+                file = (included, include.encoding)
+                if file not in seen and os.path.isfile(included):
+                    seen.add(file)
+                    level.append(file)
+    return level
+
+
+def parse_tree(file: str, base_dir: str, jobs: int = 1) -> None:
+    '''
+    Parses a layer file and every file it includes, level by level. With
+     more than one job, levels with many stale files are parsed by a process
+     pool.
+    :param file: Root layer file
+    :param base_dir: Directory of the root layer file
+    :param jobs: Maximum number of processes
+    :return: None
+    '''
+    level = [(file, '')]
+    seen = set(level)
+    with contextlib.ExitStack() as stack:
+        pool = None
+        while level:
+            if pool is None and jobs > 1 and sum(
+                    _is_stale(*f) for f in level
+            ) >= MIN_PARALLEL_FILES:
+                from concurrent.futures import ProcessPoolExecutor
+
+                pool = stack.enter_context(ProcessPoolExecutor(jobs))
+            _parse_level(level, pool)
+            level = _next_level(level, base_dir, seen)
+
+
+def _read_include(include: Include, path: str, base_dir: str) -> Any:
+    '''
+    :param include: Include of a layer file
+    :param path: One of the included paths
+    :param base_dir: Directory of the root layer file
+    :return: Data of the included file, with its includes resolved
+    '''
+    reader = include.reader.strip().lower()
+    if reader not in YAML_READERS:
+        # Not a YAML file, read by pyyaml-include
+        from yamlinclude.readers import get_reader_class_by_name
+
+        return get_reader_class_by_name(reader)(
+            path, encoding=include.encoding or 'utf-8'
+        )()
+    if not reader and not DEPL_FILE.match(path):
+        raise RuntimeError(f'Un-supported file name "{path}"')
+    return _resolve_file(parse_file(path, include.encoding), base_dir)
+
+
+def _resolve_file(parsed: ParsedFile, base_dir: str) -> Any:
+    if not parsed.has_includes:
+        return parsed.data
+    return resolve_includes(parsed.data, base_dir)
+
+
+def _resolve_include(include: Include, base_dir: str) -> Any:
+    paths, is_pattern = _include_paths(include, base_dir)
+    if is_pattern:
+        return [_read_include(include, path, base_dir) for path in paths]
+    try:
+        return _read_include(include, paths[0], base_dir)
+    except FileNotFoundError:
+        if include.has_default:
+            return include.default
+        raise
+
+
+def resolve_includes(data: Any, base_dir: str) -> Any:
+    '''
+    Replaces every Include with the included data. Containers without
+     includes are shared with the parsed data, so they must not be modified.
+    :param data: Data of a layer file
+    :param base_dir: Directory of the root layer file, includes are relative
+     to it
+    :return: The data with the includes resolved
+    '''
+    if isinstance(data, Include):
+        return _resolve_include(data, base_dir)
+    if isinstance(data, dict):
+        resolved_dict = None
+        for k, v in data.items():
+            r = resolve_includes(v, base_dir)
+            if r is not v:
+                if resolved_dict is None:
+                    resolved_dict = dict(data)
+                resolved_dict[k] = r
+        return data if resolved_dict is None else resolved_dict
+    if isinstance(data, list):
+        resolved_list = [resolve_includes(v, base_dir) for v in data]
+        if any(r is not v for r, v in zip(resolved_list, data)):
+            return resolved_list
+    return data
+
+
+def load_depl(file: str, jobs: int = 1) -> dict:
+    '''
+    Loads a layer file. Includes are relative to the directory of the file.
+    :param file: Root layer file
+    :param jobs: Maximum number of processes parsing included files
+    :return: Nested dictionary with the data of the parsed layer files
+    '''
+    base_dir = os.path.dirname(file)
+    parse_tree(file, base_dir, jobs)
+    data = _resolve_file(parse_file(file), base_dir)
+    # Files of this layer were used last, they are dropped only when the
+    #  layer alone has more files than kept
+    _evict()
+    return data
@@ -10,7 +10,7 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from typing import TypeVar, Generic, TextIO, Iterable
+from typing import TypeVar, Generic, TextIO, Iterable, Mapping, Any
 
 import jinja2
 
@@ -23,6 +23,8 @@ class CommonEmitter(Generic[TEntry]):
     '''
     Emitter responsible for writing in a file 'output' based on the jinja
      templates for open, entry and close.
+    A whole block (open, entries and close) is rendered in a single template
+     call and written at once by 'emit_all'.
     '''
     output: TextIO
     name: str
@@ -82,10 +84,28 @@ class CommonEmitter(Generic[TEntry]):
         for entry in self.entries:
             self.emit_entry(entry, extra_vars)
 
-    def emit_all(self, extra_vars=None) -> None:
+    def render_block(
+            self, entries: Iterable[TEntry], extra_vars: Mapping[str, Any]
+    ) -> str:
+        '''
+        Renders open, entries and close templates at once
+        :param entries: Entries of the block
+        :param extra_vars: Variables sent to the templates
+        :return: Block text
+        '''
+        return Templates.block.render(
+            extra_vars,
+            open_template=self.open_template,
+            entry_template=self.entry_template,
+            close_template=self.close_template,
+            entries=entries,
+        )
+
+    def render_all(self, extra_vars=None) -> str:
         if extra_vars is None:
             extra_vars = {}
 
-        self.emit_open(extra_vars)
-        self.emit_all_entries(extra_vars)
-        self.emit_close(extra_vars)
+        return self.render_block(self.entries, extra_vars)
+
+    def emit_all(self, extra_vars=None) -> None:
+        self.output.write(self.render_all(extra_vars))
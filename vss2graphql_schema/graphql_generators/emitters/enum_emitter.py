@@ -12,11 +12,11 @@
 
 from typing import TextIO, Iterable
 
-from .common_emitter import CommonEmitter
+from .field_emitter import FieldEmitter
 from ..model.enum_field import EnumField
 
 
-class EnumFieldEmitter(CommonEmitter):
+class EnumFieldEmitter(FieldEmitter):
     def __init__(
             self, output: TextIO, name: str, entries: Iterable[EnumField],
     ) -> None:
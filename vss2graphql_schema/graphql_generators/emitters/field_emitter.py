@@ -0,0 +1,64 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+from typing import TextIO, Iterable, Mapping, Any
+
+from .common_emitter import CommonEmitter, TEntry
+from ..template_filters import indent_spaces
+from ..templates import Templates
+
+
+def render_field(entry: Any) -> str:
+    '''
+    Renders an entry the same way as 'field.jinja', without jinja
+    :param entry: Field or EnumField
+    :return: Entry text
+    '''
+    description = entry.description
+    if description and not description.empty():
+        return (
+            indent_spaces(f'"""\n{description}\n"""', width=1, blank=True)
+            + f'\n    {entry}\n'
+        )
+    return f'    {entry}\n'
+
+
+class FieldEmitter(CommonEmitter):
+    '''
+    Emitter whose entry template is 'field.jinja'. Entries are rendered in
+     python with 'render_field', jinja is only used for open and close.
+     Entries are rendered by jinja when a custom template replaces the entry
+     template or one of the templates it uses.
+    '''
+    # Templates used by the entry templates, which render_field replaces
+    ENTRY_TEMPLATES = ('field.jinja', 'description.jinja')
+    python_entries: bool
+
+    def __init__(
+            self, output: TextIO, name: str, entries: Iterable[TEntry],
+    ) -> None:
+        super().__init__(output, name, entries)
+        self.python_entries = not any(
+            Templates.is_custom(file_name)
+            for file_name in (f'{name}_entry.jinja', *self.ENTRY_TEMPLATES)
+        )
+
+    def render_block(
+            self, entries: Iterable[TEntry], extra_vars: Mapping[str, Any]
+    ) -> str:
+        if not self.python_entries:
+            return super().render_block(entries, extra_vars)
+        return ''.join((
+            self.open_template.render(extra_vars),
+            *map(render_field, entries),
+            self.close_template.render(extra_vars),
+        ))
@@ -12,11 +12,11 @@
 
 from typing import TextIO, Iterable
 
-from .common_emitter import CommonEmitter
+from .field_emitter import FieldEmitter
 from ..model.field import Field
 
 
-class InputEmitter(CommonEmitter):
+class InputEmitter(FieldEmitter):
     def __init__(
             self,
             output: TextIO,
@@ -0,0 +1,78 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+from typing import Any, Iterable, List, Mapping, TextIO
+
+from .common_emitter import CommonEmitter
+from .. import introspection
+
+# Root types written by the sections of the same name
+ROOT_TYPES = {
+    'query': 'Query', 'mutation': 'Mutation', 'subscription': 'Subscription',
+}
+
+
+class IntrospectionEmitter(CommonEmitter):
+    '''
+    Emitter of the --output-format introspection, replacing the emitter of
+     every section. A block is written as the introspection of its type,
+     built from the entries of the block instead of the jinja templates.
+     Directive declarations are written at the end of the document, by
+     introspection.write_schema_end, so directive blocks are empty.
+    '''
+    def __init__(
+            self, output: TextIO, name: str, entries: Iterable[Any],
+    ) -> None:
+        # Templates are not used, so they are not looked up
+        self.output = output
+        self.name = name
+        self.entries = entries
+
+    def emit_open(self, extra_vars=None) -> None:
+        pass
+
+    def emit_close(self, extra_vars=None) -> None:
+        pass
+
+    def emit_entry(self, entry: Any, extra_vars=None) -> None:
+        self.output.write(self.render_block([entry], extra_vars or {}))
+
+    def render_block(
+            self, entries: Iterable[Any], extra_vars: Mapping[str, Any]
+    ) -> str:
+        '''
+        :param entries: Entries of the block
+        :param extra_vars: Variables of the block, as sent to the templates
+        :return: Text of the types of the block
+        '''
+        name = extra_vars.get('name', '')
+        description = extra_vars.get('description')
+        types: List[introspection.JSON] = []
+        if self.name in ROOT_TYPES:
+            if extra_vars.get('include_delivery_interval'):
+                types.append(introspection.DELIVERY_INTERVAL_TYPE)
+            types.append(introspection.object_type(
+                ROOT_TYPES[self.name], description, list(entries)
+            ))
+        elif self.name == 'type':
+            types.append(introspection.object_type(
+                name, description, list(entries)
+            ))
+        elif self.name == 'input':
+            types.append(introspection.input_object_type(
+                name, description, list(entries)
+            ))
+        elif self.name == 'enum':
+            types.append(introspection.enum_type(name, description, entries))
+        elif self.name == 'custom_scalar':
+            types.extend(map(introspection.scalar_type, entries))
+        return ''.join(map(introspection.type_text, types))
@@ -0,0 +1,197 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import hashlib
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, NamedTuple, Optional
+
+from .tree_cache import FileCache
+
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
+# Bump when the cached data changes
+CACHE_FORMAT = 2
+DEFAULT_FRAGMENT_CACHE_SIZE = 64 << 20
+# Node attributes read by the generators
+NODE_ATTRIBUTES = (
+    'name', 'type', 'data_type', 'description', 'unit', 'min', 'max', 'enum',
+    'deprecation',
+)
+
+
+def code_digest(custom_templates_dir: Optional[str] = None) -> bytes:
+    '''
+    Fragments are rendered by the code and templates of this package, so
+     their digest is part of every key
+    :param custom_templates_dir: Directory of custom templates in use
+    :return: Digest of the package sources and of the custom templates
+    '''
+    # templates imports jinja2, which only the generation needs
+    from .templates import package_digest, sources_digest
+
+    digest = hashlib.sha256(f'{CACHE_FORMAT}\0'.encode())
+    digest.update(package_digest())
+    if custom_templates_dir:
+        digest.update(sources_digest(custom_templates_dir))
+    return digest.digest()
+
+
+class FragmentChanges(NamedTuple):
+    '''
+    What a copy of the cache did, to be applied to the original one
+    '''
+    new: Dict[str, str]
+    hits: int
+    misses: int
+
+
+class FragmentCache(FileCache[str]):
+    '''
+    On-disk LRU cache of rendered blocks, such as the type, input and enum
+     blocks of a branch. Keys are built by the generators from the digests of
+     the nodes a block is rendered from, so only the blocks of changed nodes
+     are rendered again. Each fragment is a file of its own, read when it is
+     first used; save() writes only the fragments rendered since the last
+     save.
+    '''
+    SUFFIX = '.fragment'
+    READ_ERRORS = (OSError, UnicodeDecodeError)
+    entries: Dict[str, str]
+
+    def __init__(
+            self, directory: str, max_size: int = DEFAULT_FRAGMENT_CACHE_SIZE
+    ) -> None:
+        '''
+        :param directory: Directory of the fragment files
+        :param max_size: Maximum size of the fragment files in bytes
+        '''
+        super().__init__(directory, max_size)
+        # Fragments used since the last save, e.g. by several variants
+        self.entries = {}
+        self._new: Dict[str, str] = {}
+        self._node_digests: Dict['VSSNode', bytes] = {}
+        self._code_digest = b''
+
+    def read(self, file: BinaryIO) -> str:
+        return file.read().decode()
+
+    def write(self, file: BinaryIO, value: str) -> None:
+        file.write(value.encode())
+
+    def save(self) -> None:
+        '''
+        Writes the fragments rendered since the last save and evicts the
+         least recently used ones. Fragments not used since then are
+         forgotten, they are read again from their files if needed.
+        :return: None
+        '''
+        stored = False
+        for key, text in self._new.items():
+            stored = self.store_entry(key, text) or stored
+        if stored:
+            self.evict()
+        self._new = {}
+        self.entries = {}
+
+    def key(self, *parts: Any) -> bytes:
+        '''
+        :param parts: Values a group of fragments depends on
+        :return: Digest to start the keys of the group with
+        '''
+        if not self._code_digest:
+            from .templates import Templates
+
+            self._code_digest = code_digest(Templates.templates_dir)
+        digest = hashlib.sha256(self._code_digest)
+        digest.update(repr(parts).encode())
+        return digest.digest()
+
+    def node_digest(self, node: 'VSSNode') -> bytes:
+        '''
+        :param node: VSSNode
+        :return: Digest of the node attributes read by the generators
+        '''
+        digest = self._node_digests.get(node)
+        if digest is None:
+            digest = hashlib.sha256(repr(tuple(
+                getattr(node, a, None) for a in NODE_ATTRIBUTES
+            )).encode()).digest()
+            self._node_digests[node] = digest
+        return digest
+
+    def clear_node_digests(self) -> None:
+        '''
+        Forgets the node digests, e.g. when another tree is loaded
+        :return: None
+        '''
+        self._node_digests.clear()
+
+    def get(self, key: str) -> Optional[str]:
+        '''
+        :param key: Fragment key
+        :return: Cached fragment, None if there is none
+        '''
+        text = self.entries.get(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        text = self.load(key)
+        if text is not None:
+            self.entries[key] = text
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        '''
+        :param key: Fragment key
+        :param text: Rendered fragment
+        :return: None
+        '''
+        self.entries[key] = text
+        self._new[key] = text
+
+    def changes(self) -> FragmentChanges:
+        '''
+        :return: Fragments added since the cache was created or unpickled,
+         e.g. in a worker process. Fragments read by the copy were already
+         marked as used in their files.
+        '''
+        return FragmentChanges(self._new, self.hits, self.misses)
+
+    def pop_changes(self) -> FragmentChanges:
+        '''
+        :return: changes(), which are then forgotten, e.g. by a worker
+         process rendering several sections with the same copy
+        '''
+        changes = self.changes()
+        self._new = {}
+        self.hits = 0
+        self.misses = 0
+        return changes
+
+    def apply(self, changes: FragmentChanges) -> None:
+        '''
+        :param changes: Changes made by a copy of this cache
+        :return: None
+        '''
+        for key, text in changes.new.items():
+            self.put(key, text)
+        self.hits += changes.hits
+        self.misses += changes.misses
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies start with no changes of their own, and read the fragments
+        #  from their files
+        state = self.__dict__.copy()
+        state.update(
+            hits=0, misses=0, entries={}, _new={}, _node_digests={}
+        )
+        return state
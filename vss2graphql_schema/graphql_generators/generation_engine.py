@@ -0,0 +1,248 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import contextlib
+import io
+from typing import (
+    TYPE_CHECKING, Any, ContextManager, Dict, Iterable, List,
+    Mapping, Optional, TextIO, Tuple, cast
+)
+
+from .common_generator import CommonGenerator
+from .fragment_cache import FragmentCache, FragmentChanges
+from .templates import Templates
+from .timings import Span, Stopwatch, Timings, replay, span, spans_enabled
+from .util import index_qualified_names
+from .vss_generators.vss_generator import VSSGenerator
+
+if TYPE_CHECKING:
+    # concurrent.futures is imported only when --jobs is used
+    from concurrent.futures import Executor, Future
+    from vspec.model.vsstree import VSSNode
+
+
+# Sections of the engine that started the worker process, by index
+_worker_sections: Dict[
+    int, Tuple[VSSGenerator, Optional[Mapping[str, Any]]]
+] = {}
+
+
+def init_worker(
+        sections: Dict[int, Tuple[VSSGenerator, Optional[Mapping[str, Any]]]],
+        vss_roots: Iterable['VSSNode'],
+        templates: Tuple[Optional[str], Optional[str]]
+) -> None:
+    '''
+    Starts a worker process of the engine. The sections are sent once to
+     each worker, so the VSS roots and the fragment cache they share are
+     sent and indexed once too, instead of once per section.
+    :param sections: Generators rendered by the workers, with their extra
+     variables, by section index
+    :param vss_roots: Roots from VSS tree structure, shared by the sections
+    :param templates: Arguments of Templates.configure in the parent process
+    :return: None
+    '''
+    Templates.configure(*templates)
+    index_qualified_names(vss_roots)
+    _worker_sections.clear()
+    _worker_sections.update(sections)
+
+
+def render_section(
+        i: int, timed: bool = False
+) -> Tuple[str, Optional[FragmentChanges], List[Span]]:
+    '''
+    Renders a whole section in a worker process started by init_worker
+    :param i: Section index
+    :param timed: Take the span of the section, for the parent process
+    :return: Section text, the changes to the fragment cache and the span of
+     the section, if timed
+    '''
+    generator, extra_vars = _worker_sections[i]
+    timings = Timings()
+    with timings.collect(isolated=True) if timed else contextlib.nullcontext():
+        with span(generator.name) as counts:
+            generator.generate(extra_vars)
+            counts.update(generator.counts())
+    changes = None
+    if generator.fragment_cache is not None:
+        # The worker copy of the cache is shared by the sections it renders
+        changes = generator.fragment_cache.pop_changes()
+    return (
+        cast(io.StringIO, generator.output).getvalue(), changes,
+        timings.spans,
+    )
+
+
+class GenerationEngine:
+    '''
+    Generates the schema sections, describing the VSS tree only once.
+    Generators are registered in the order their sections are written to the
+     output, each one writing into its own io.StringIO section buffer.
+     VSSGenerators are started, visit the nodes they select from the
+     NodeFacts of the tree, in level order, and are finished, the other
+     generators just generate.
+    With more than one job the generators that visit nodes render their
+     sections in a process pool instead, while the remaining ones are
+     generated here. Sections are still written in the registration order,
+     so the output is the same as in a serial run.
+    VSSGenerators share the fragment_cache, if there is one.
+    '''
+    output: TextIO
+    vss_roots: Iterable['VSSNode']
+    jobs: int
+    fragment_cache: Optional[FragmentCache]
+    sections: List[
+        Tuple[CommonGenerator, Optional[Mapping[str, Any]], io.StringIO]
+    ]
+    # Time of each section generated here, when spans are taken
+    stopwatches: Dict[int, Stopwatch]
+
+    def __init__(
+            self, output: TextIO, vss_roots: Iterable['VSSNode'],
+            jobs: int = 1,
+            fragment_cache: Optional[FragmentCache] = None
+    ) -> None:
+        '''
+        :param output: File to receive the sections
+        :param vss_roots: Roots from VSS tree structure
+        :param jobs: Number of processes rendering the sections
+        :param fragment_cache: Cache of rendered blocks
+        '''
+        self.output = output
+        self.vss_roots = vss_roots
+        self.jobs = jobs
+        self.fragment_cache = fragment_cache
+        self.sections = []
+        self.stopwatches = {}
+
+    def register(
+            self, generator: CommonGenerator,
+            extra_vars: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        '''
+        :param generator: Generator of the next section
+        :param extra_vars: Extra variables to be sent to the generator
+        :return: None
+        '''
+        section = generator.output
+        if not isinstance(section, io.StringIO):
+            raise ValueError(
+                f'{type(generator).__name__} must write into an io.StringIO '
+                'section buffer'
+            )
+        if isinstance(generator, VSSGenerator):
+            generator.fragment_cache = self.fragment_cache
+        self.sections.append((generator, extra_vars, section))
+
+    def run(self) -> None:
+        '''
+        Generates every section and writes them in the registration order
+        :return: None
+        '''
+        self.stopwatches = {
+            i: Stopwatch() for i in range(len(self.sections))
+        } if spans_enabled() else {}
+        with self._pool() as pool:
+            rendered = self._submit(pool) if pool is not None else {}
+            self._walk(rendered)
+
+            for i, (generator, _, section) in enumerate(self.sections):
+                if i in rendered:
+                    text, changes, spans = rendered[i].result()
+                    if self.fragment_cache is not None and changes:
+                        self.fragment_cache.apply(changes)
+                    self.output.write(text)
+                    replay(spans)
+                    continue
+                if isinstance(generator, VSSGenerator):
+                    with self._stopwatch(i):
+                        generator.finish()
+                self.output.write(section.getvalue())
+                if self.stopwatches:
+                    self.stopwatches[i].emit(generator.name, (
+                        generator.counts()
+                        if isinstance(generator, VSSGenerator) else {}
+                    ))
+
+    def _stopwatch(self, i: int) -> ContextManager[Any]:
+        '''
+        :param i: Section index
+        :return: Stopwatch of the section, a null context when spans are not
+         taken
+        '''
+        if self.stopwatches:
+            return self.stopwatches[i]
+        return contextlib.nullcontext()
+
+    def _submit(self, pool: 'Executor') -> Dict[int, 'Future']:
+        '''
+        Sends the sections that visit nodes to the process pool, which
+         received their generators when its workers started
+        :param pool: Process pool rendering the sections
+        :return: Futures of the section texts by section index
+        '''
+        timed = spans_enabled()
+        return {
+            i: pool.submit(render_section, i, timed)
+            for i in self._parallel_sections()
+        }
+
+    def _walk(self, rendered: Mapping[int, 'Future']) -> None:
+        '''
+        Generates the sections that are not rendered in the process pool.
+         Generators of the same view share the NodeFacts of the view.
+        :param rendered: Sections rendered in the process pool
+        :return: None
+        '''
+        for i, (generator, extra_vars, _) in enumerate(self.sections):
+            if i in rendered:
+                continue
+            with self._stopwatch(i):
+                if not isinstance(generator, VSSGenerator):
+                    generator.generate()
+                    continue
+                generator.start(extra_vars)
+                if generator.visits_nodes:
+                    generator.visit_selected()
+
+    def _parallel_sections(self) -> Dict[
+        int, Tuple[VSSGenerator, Optional[Mapping[str, Any]]]
+    ]:
+        '''
+        :return: Generators that visit nodes, with their extra variables, by
+         section index
+        '''
+        return {
+            i: (generator, extra_vars)
+            for i, (generator, extra_vars, _) in enumerate(self.sections)
+            if isinstance(generator, VSSGenerator) and generator.visits_nodes
+        }
+
+    def _pool(self) -> Any:
+        '''
+        :return: Context with a process pool for the node visiting sections,
+         or with None when they are generated serially
+        '''
+        parallel = self._parallel_sections()
+        if self.jobs < 2 or len(parallel) < 2:
+            return contextlib.nullcontext()
+        # Imported only when needed, it is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(parallel)),
+            initializer=init_worker,
+            initargs=(
+                parallel, self.vss_roots,
+                (Templates.templates_dir, Templates.bytecode_cache_dir),
+            ),
+        )
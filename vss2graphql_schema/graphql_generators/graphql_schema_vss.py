@@ -11,10 +11,14 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-from typing import TextIO, Iterable
-
-from vspec.model.vsstree import VSSNode
+import io
+from typing import TYPE_CHECKING, TextIO, Iterable, Optional
 
+from .fragment_cache import FragmentCache
+from .generation_engine import GenerationEngine
+from .introspection import (
+    INTROSPECTION, SDL, write_schema_end, write_schema_start
+)
 from .vss_generators.custom_scalars_generator import CustomScalarsGenerator
 from .vss_generators.directive_generator import DirectiveGenerator
 from .vss_generators.enum_generator import EnumGenerator
@@ -24,66 +28,90 @@ from .vss_generators.query_generator import QueryGenerator
 from .vss_generators.subscriptions_generator import SubscriptionGenerator
 from .vss_generators.type_generator import TypeGenerator
 
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
 
 class GraphQLSchemaVSS:
     '''
     Generates GraphQL Schema based on VSS. (See README.md to more details)
     '''
     schema_file: TextIO
-    vss_roots: Iterable[VSSNode]
+    vss_roots: Iterable['VSSNode']
     args: argparse.Namespace
+    fragment_cache: Optional[FragmentCache]
 
     def __init__(
-            self, schema_file: TextIO, vss_roots: Iterable[VSSNode],
-            args: argparse.Namespace
+            self, schema_file: TextIO, vss_roots: Iterable['VSSNode'],
+            args: argparse.Namespace,
+            fragment_cache: Optional[FragmentCache] = None
     ) -> None:
         '''
         :param schema_file: File to receive GraphQL Schema
         :param vss_roots: Roots from VSS tree structure
         :param args: Arguments from argparse in standard call
+        :param fragment_cache: Cache of rendered blocks, if any
         '''
         self._schema_file = schema_file
         self.vss_roots = vss_roots
         self.args = args
+        self.fragment_cache = fragment_cache
 
     def create_schema(self) -> None:
         '''
         Orchestrate GraphQL schema generation
         :return: None
         '''
-        DirectiveGenerator(
-            self._schema_file, self.args,
-        ).generate()
+        engine = GenerationEngine(
+            self._schema_file, self.vss_roots,
+            jobs=getattr(self.args, 'jobs', 1),
+            fragment_cache=self.fragment_cache,
+        )
+
+        engine.register(DirectiveGenerator(
+            io.StringIO(), self.args,
+        ))
 
         if self.args.custom_scalars:
-            CustomScalarsGenerator(
-                self._schema_file, self.args,
-            ).generate()
+            engine.register(CustomScalarsGenerator(
+                io.StringIO(), self.args,
+            ))
 
-        QueryGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate()
+        engine.register(QueryGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        ))
 
-        SubscriptionGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate(extra_vars={
+        engine.register(SubscriptionGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        ), extra_vars={
             'include_delivery_interval':
                 self.args.subscription_delivery_interval
         })
 
-        MutationGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate()
+        mutation_generator = MutationGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        )
+        engine.register(mutation_generator)
 
-        InputGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate()
+        engine.register(InputGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        ))
 
-        TypeGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate()
+        engine.register(TypeGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        ))
 
         if self.args.enums:
-            EnumGenerator(
-                self._schema_file, self.vss_roots, self.args,
-            ).generate()
+            engine.register(EnumGenerator(
+                io.StringIO(), self.vss_roots, self.args,
+            ))
+
+        if getattr(self.args, 'output_format', SDL) == INTROSPECTION:
+            write_schema_start(self._schema_file)
+            engine.run()
+            write_schema_end(
+                self._schema_file, DirectiveGenerator.declarations(self.args),
+                has_mutation=mutation_generator.selects_nodes(),
+            )
+        else:
+            engine.run()
@@ -11,10 +11,14 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-from typing import TextIO, Iterable
-
-from vspec.model.vsstree import VSSNode
+import io
+from typing import TYPE_CHECKING, TextIO, Iterable, Optional
 
+from .fragment_cache import FragmentCache
+from .generation_engine import GenerationEngine
+from .introspection import (
+    INTROSPECTION, SDL, write_schema_end, write_schema_start
+)
 from .layer import Layer
 from .layer_generators.input_layer_generator import InputLayerGenerator
 from .layer_generators.mutation_layer_generator import (
@@ -27,29 +31,36 @@ from .vss_generators.enum_generator import EnumGenerator
 from .vss_generators.query_generator import QueryGenerator
 from .vss_generators.subscriptions_generator import SubscriptionGenerator
 
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
 
 class GraphQLSchemaVSSLayer:
     '''
     Generates GraphQL Schema based on VSS. (See README.md to more details)
     '''
     _schema_file: TextIO
-    vss_roots: Iterable[VSSNode]
+    vss_roots: Iterable['VSSNode']
     args: argparse.Namespace
+    fragment_cache: Optional[FragmentCache]
     layer: Layer
 
     def __init__(
-            self, schema_file: TextIO, vss_roots: Iterable[VSSNode],
-            args: argparse.Namespace, layer: Layer
+            self, schema_file: TextIO, vss_roots: Iterable['VSSNode'],
+            args: argparse.Namespace, layer: Layer,
+            fragment_cache: Optional[FragmentCache] = None
     ) -> None:
         '''
         :param schema_file: File to receive GraphQL Schema
         :param vss_roots: Roots from VSS tree structure
         :param args: Arguments from argparse in standard call
         :param layer: Layer class with its structure
+        :param fragment_cache: Cache of rendered blocks, if any
         '''
         self._schema_file = schema_file
         self.vss_roots = vss_roots
         self.args = args
+        self.fragment_cache = fragment_cache
         self.layer = layer
 
     def create_schema(self) -> None:
@@ -57,39 +68,56 @@ class GraphQLSchemaVSSLayer:
         Orchestrate GraphQL schema generation
         :return: None
         '''
-        DirectiveGenerator(
-            self._schema_file, self.args,
-        ).generate()
+        engine = GenerationEngine(
+            self._schema_file, self.vss_roots,
+            jobs=getattr(self.args, 'jobs', 1),
+            fragment_cache=self.fragment_cache,
+        )
+
+        engine.register(DirectiveGenerator(
+            io.StringIO(), self.args,
+        ))
 
         if self.args.custom_scalars:
-            CustomScalarsGenerator(
-                self._schema_file, self.args,
-            ).generate()
+            engine.register(CustomScalarsGenerator(
+                io.StringIO(), self.args,
+            ))
 
-        QueryGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate()
+        engine.register(QueryGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        ))
 
-        SubscriptionGenerator(
-            self._schema_file, self.vss_roots, self.args,
-        ).generate(extra_vars={
+        engine.register(SubscriptionGenerator(
+            io.StringIO(), self.vss_roots, self.args,
+        ), extra_vars={
             'include_delivery_interval':
                 self.args.subscription_delivery_interval
         })
 
-        MutationLayerGenerator(
-            self._schema_file, self.vss_roots, self.args, self.layer
-        ).generate()
+        mutation_generator = MutationLayerGenerator(
+            io.StringIO(), self.vss_roots, self.args, self.layer
+        )
+        engine.register(mutation_generator)
 
-        InputLayerGenerator(
-            self._schema_file, self.vss_roots, self.args, self.layer
-        ).generate()
+        engine.register(InputLayerGenerator(
+            io.StringIO(), self.vss_roots, self.args, self.layer
+        ))
 
-        TypeLayerGenerator(
-            self._schema_file, self.vss_roots, self.args, self.layer
-        ).generate()
+        engine.register(TypeLayerGenerator(
+            io.StringIO(), self.vss_roots, self.args, self.layer
+        ))
 
         if self.args.enums:
-            EnumGenerator(
-                self._schema_file, self.vss_roots, self.args,
-            ).generate()
+            engine.register(EnumGenerator(
+                io.StringIO(), self.vss_roots, self.args,
+            ))
+
+        if getattr(self.args, 'output_format', SDL) == INTROSPECTION:
+            write_schema_start(self._schema_file)
+            engine.run()
+            write_schema_end(
+                self._schema_file, DirectiveGenerator.declarations(self.args),
+                has_mutation=mutation_generator.selects_nodes(),
+            )
+        else:
+            engine.run()
@@ -0,0 +1,323 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Introspection of the schema: the JSON result of the introspection query,
+ {"__schema": ...}, built from the same model objects as the schema.
+ Types are written one a line, as they are generated, each one after a
+ comma, so the document starts with the standard scalars. Directive calls
+ are not part of the introspection, but @deprecated, which deprecates the
+ field instead.
+'''
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from .model.custom_scalar_declaration import CustomScalarDeclaration
+from .model.description import Description
+from .model.directive_call import DirectiveCall, DeprecatedDirective
+from .model.directive_declaration import DirectiveDeclaration
+from .model.enum_field import EnumField
+from .model.field import Field
+from .model.parameter import Parameter
+
+SDL = 'sdl'
+INTROSPECTION = 'introspection'
+OUTPUT_FORMATS = (SDL, INTROSPECTION)
+
+JSON = Dict[str, Any]
+
+STANDARD_SCALARS = ('String', 'Int', 'Float', 'Boolean', 'ID')
+# Enums written by the templates, the others are named after their node
+DELIVERY_INTERVAL_ENUM = 'SubscriptionDeliveryInterval'
+PERMISSION_POLICY_ENUM = 'HasPermissionsDirectivePolicy'
+ENUMS = frozenset((DELIVERY_INTERVAL_ENUM, PERMISSION_POLICY_ENUM))
+DEFAULT_DEPRECATION_REASON = 'No longer supported'
+
+# Directives of every GraphQL schema
+STANDARD_DIRECTIVES = (
+    DirectiveDeclaration(
+        'include', [Parameter('if', 'Boolean', is_required=True)],
+        ['FIELD', 'FRAGMENT_SPREAD', 'INLINE_FRAGMENT'],
+    ),
+    DirectiveDeclaration(
+        'skip', [Parameter('if', 'Boolean', is_required=True)],
+        ['FIELD', 'FRAGMENT_SPREAD', 'INLINE_FRAGMENT'],
+    ),
+    DirectiveDeclaration(
+        'deprecated',
+        [Parameter('reason', 'String', f'"{DEFAULT_DEPRECATION_REASON}"')],
+        [
+            'FIELD_DEFINITION', 'ARGUMENT_DEFINITION',
+            'INPUT_FIELD_DEFINITION', 'ENUM_VALUE',
+        ],
+    ),
+    DirectiveDeclaration(
+        'specifiedBy', [Parameter('url', 'String', is_required=True)],
+        ['SCALAR'],
+    ),
+)
+
+_type_refs: Dict[str, JSON] = {}
+
+
+def named_type_kind(name: str) -> str:
+    '''
+    Types are told apart by their names, which follow the naming of the
+     generators (see util.get_enum_name and util.get_input_name)
+    :param name: Name of a type of the schema
+    :return: Kind of the type
+    '''
+    # constants imports vspec, which the CLI loads only to generate
+    from .constants import VSS_CUSTOM_SCALARS_MAPPING
+
+    if name in STANDARD_SCALARS or name in VSS_CUSTOM_SCALARS_MAPPING.values():
+        return 'SCALAR'
+    if name in ENUMS or name.endswith('_Enum'):
+        return 'ENUM'
+    if name.endswith('_Input'):
+        return 'INPUT_OBJECT'
+    return 'OBJECT'
+
+
+def type_ref(type_name: str) -> JSON:
+    '''
+    :param type_name: Type as written in the SDL, e.g. '[String!]!'
+    :return: Reference to the type. References are shared, they must not be
+     changed.
+    '''
+    ref = _type_refs.get(type_name)
+    if ref is None:
+        if type_name.endswith('!'):
+            ref = {
+                'kind': 'NON_NULL', 'name': None,
+                'ofType': type_ref(type_name[:-1]),
+            }
+        elif type_name.startswith('['):
+            ref = {
+                'kind': 'LIST', 'name': None,
+                'ofType': type_ref(type_name[1:-1]),
+            }
+        else:
+            ref = {
+                'kind': named_type_kind(type_name), 'name': type_name,
+                'ofType': None,
+            }
+        _type_refs[type_name] = ref
+    return ref
+
+
+def description_text(description: Optional[Description]) -> Optional[str]:
+    '''
+    :param description: Description, if any
+    :return: Text of the description, None if it is empty
+    '''
+    if description is None or description.empty():
+        return None
+    return str(description)
+
+
+def deprecation_reason(directives: Iterable[DirectiveCall]) -> Optional[str]:
+    '''
+    :param directives: Directive calls of a field
+    :return: Reason of its @deprecated call, None if it is not deprecated
+    '''
+    for directive in directives:
+        if isinstance(directive, DeprecatedDirective):
+            # The reason is written as in the SDL
+            reason = directive.reason
+            return (
+                reason.replace('"', "'") if reason
+                else DEFAULT_DEPRECATION_REASON
+            )
+    return None
+
+
+def input_value(parameter: Parameter) -> JSON:
+    '''
+    :param parameter: Parameter of a field or directive
+    :return: Introspection of the parameter
+    '''
+    type_name = parameter.type_or_value
+    if parameter.is_required:
+        type_name += '!'
+    return {
+        'name': parameter.name, 'description': None,
+        'type': type_ref(type_name), 'defaultValue': parameter.default_value,
+    }
+
+
+def input_field(field: Field) -> JSON:
+    '''
+    :param field: Field of an input
+    :return: Introspection of the field
+    '''
+    return {
+        'name': field.field_name,
+        'description': description_text(field.description),
+        'type': type_ref(field.field_type), 'defaultValue': None,
+    }
+
+
+def output_field(field: Field) -> JSON:
+    '''
+    :param field: Field of a type
+    :return: Introspection of the field
+    '''
+    reason = deprecation_reason(field.directives)
+    return {
+        'name': field.field_name,
+        'description': description_text(field.description),
+        'args': [input_value(p) for p in field.parameters],
+        'type': type_ref(field.field_type),
+        'isDeprecated': reason is not None, 'deprecationReason': reason,
+    }
+
+
+def enum_value(enum_field: EnumField) -> JSON:
+    '''
+    :param enum_field: Value of an enum
+    :return: Introspection of the value
+    '''
+    return {
+        'name': enum_field.value,
+        'description': description_text(enum_field.description),
+        'isDeprecated': False, 'deprecationReason': None,
+    }
+
+
+def full_type(
+        kind: str, name: str, description: Optional[Description] = None,
+        **members: Optional[List[JSON]]
+) -> JSON:
+    '''
+    :param kind: Kind of the type
+    :param name: Name of the type
+    :param description: Description of the type, if any
+    :param members: fields, inputFields or enumValues of the type
+    :return: Introspection of the type
+    '''
+    return {
+        'kind': kind, 'name': name,
+        'description': description_text(description),
+        'fields': members.get('fields'),
+        'inputFields': members.get('inputFields'),
+        'interfaces': [] if kind == 'OBJECT' else None,
+        'enumValues': members.get('enumValues'),
+        'possibleTypes': None,
+    }
+
+
+def object_type(
+        name: str, description: Optional[Description], fields: List[Field]
+) -> JSON:
+    return full_type(
+        'OBJECT', name, description, fields=[output_field(f) for f in fields]
+    )
+
+
+def input_object_type(
+        name: str, description: Optional[Description], fields: List[Field]
+) -> JSON:
+    return full_type(
+        'INPUT_OBJECT', name, description,
+        inputFields=[input_field(f) for f in fields],
+    )
+
+
+def enum_type(
+        name: str, description: Optional[Description],
+        values: Iterable[EnumField]
+) -> JSON:
+    return full_type(
+        'ENUM', name, description, enumValues=[enum_value(v) for v in values]
+    )
+
+
+def scalar_type(scalar: CustomScalarDeclaration) -> JSON:
+    return full_type(
+        'SCALAR', scalar.scalar,
+        Description(scalar.description) if scalar.description else None,
+    )
+
+
+def directive(declaration: DirectiveDeclaration) -> JSON:
+    '''
+    :param declaration: Directive declaration
+    :return: Introspection of the directive
+    '''
+    return {
+        'name': declaration.name, 'description': None,
+        'locations': list(declaration.locations),
+        'args': [input_value(p) for p in declaration.parameters],
+    }
+
+
+def to_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def type_text(value: JSON) -> str:
+    '''
+    :param value: Introspection of a type
+    :return: Text of the type, as written after the previous one
+    '''
+    return ',\n' + to_json(value)
+
+
+# Enums of the templates, with the same values and descriptions
+DELIVERY_INTERVAL_TYPE = enum_type(DELIVERY_INTERVAL_ENUM, None, [
+    EnumField(
+        'DELIVERY_INTERVAL_5_SECONDS',
+        Description('Rate limited: 5s between updates'),
+    ),
+    EnumField(
+        'DELIVERY_INTERVAL_1_SECOND',
+        Description('Rate limited: 1s between updates.'),
+    ),
+    EnumField('REALTIME', Description('Get all the updates, no rate limit.')),
+])
+PERMISSION_POLICY_TYPE = enum_type(PERMISSION_POLICY_ENUM, None, [
+    EnumField('RESOLVER', None), EnumField('THROW', None),
+])
+
+
+def write_schema_start(output: TextIO) -> None:
+    '''
+    Writes the start of the document, up to the standard scalars
+    :param output: File receiving the introspection
+    :return: None
+    '''
+    output.write('{"__schema":{"types":[\n')
+    output.write(',\n'.join(
+        to_json(full_type('SCALAR', s)) for s in STANDARD_SCALARS
+    ))
+
+
+def write_schema_end(
+        output: TextIO, directives: Iterable[DirectiveDeclaration],
+        has_mutation: bool
+) -> None:
+    '''
+    Writes the directives and the root types, ending the document
+    :param output: File receiving the introspection
+    :param directives: Directives declared by the schema
+    :param has_mutation: Whether the schema has a Mutation type
+    :return: None
+    '''
+    output.write('\n],"directives":')
+    output.write(to_json([
+        directive(d) for d in (*STANDARD_DIRECTIVES, *directives)
+    ]))
+    output.write(',"queryType":{"name":"Query"},"mutationType":')
+    output.write('{"name":"Mutation"}' if has_mutation else 'null')
+    output.write(',"subscriptionType":{"name":"Subscription"}}}\n')
@@ -10,116 +10,164 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-import os
-from typing import Iterator, Tuple, Optional, Set
+from typing import (
+    Any, Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple
+)
 
-from .util import load_yaml
+from .depl_loader import load_depl
+
+
+class LayerEntry(NamedTuple):
+    '''
+    What the generators need to know about a layer node. A node repeated in
+     the layer, e.g. under each element of a list, gets the flags of all its
+     occurrences.
+    '''
+    is_list: bool
+    has_constants: bool
+    has_write: bool
+    has_parent_attribute: bool
+
+    def merge(self, other: 'LayerEntry') -> 'LayerEntry':
+        '''
+        :param other: Entry of another occurrence of the node
+        :return: Entry with the flags of both occurrences
+        '''
+        return LayerEntry(
+            self.is_list or other.is_list,
+            self.has_constants or other.has_constants,
+            self.has_write or other.has_write,
+            self.has_parent_attribute or other.has_parent_attribute,
+        )
 
 
 class Layer:
     '''
-    Layer class to handle loading, standard Layer tree iterations and special
-    variables that saves sets of key node names.
+    Layer class to handle loading and to index the layer tree by qualified
+    name, in a single pass, into the sets of key node names.
     '''
     yaml_tree: dict
+    entries: Dict[str, LayerEntry]
+    qualified_names: FrozenSet[str]
     list_node_names: Set[str]
     write_node_names: Set[str]
+    parent_attribute_node_names: Set[str]
 
-    def __init__(self, file: str) -> None:
-        with open(file) as layer_file:
-            self.yaml_tree = load_yaml(layer_file, os.path.dirname(file))
-        self.list_node_names = set(self.get_list_node_names())
-        self.write_node_names = set(self.get_write_node_names())
-
-    def iterate_qualified_names(
-            self, entry: Optional[dict] = None, path: str = '', sep: str = '_'
-    ) -> Iterator[str]:
+    def __init__(self, file: str, jobs: int = 1) -> None:
         '''
-        :param entry: Node to check, if none will get layer root
-        :param path: Current node path
-        :param sep: Separator of qualified name
-        :return: Next layer qualified name
+        :param file: Root layer file
+        :param jobs: Maximum number of processes parsing included files
         '''
-        entry = entry if entry else self.yaml_tree
-
-        for k, v in entry.items():
-            cur_name = path + sep + k if path else k
-            if k == '_constants':
-                v_elem = next(iter(v.values()))
-                for p in v_elem.keys():
-                    yield path + sep + p
-            if k[0] != '_':
-                if isinstance(v, dict):
-                    for p in self.iterate_qualified_names(
-                            entry=v, path=cur_name, sep=sep
-                    ):
-                        yield p
-                elif isinstance(v, list):
-                    for elem in v:
-                        for p in self.iterate_qualified_names(
-                                entry=elem, path=cur_name, sep=sep
-                        ):
-                            yield p
-                else:
-                    yield cur_name + str(v)
-
-                yield cur_name
+        self.yaml_tree = load_depl(file, jobs)
+        self.index()
 
-    def iterate_qualified_name_value(
-            self, entry: Optional[dict] = None, path: str = None,
-            sep: str = '_'
-    ) -> Iterator[Tuple[str, dict]]:
+    @classmethod
+    def from_index(
+            cls, entries: Dict[str, LayerEntry], qualified_names: Iterable[str]
+    ) -> 'Layer':
         '''
-        :param entry: Node to check, if none will get layer root
-        :param path: Current node path
-        :param sep: Separator of qualified name
-        :return: Tuple with next layer qualified name and its value
+        Layer of an index saved by a previous run, without its yaml_tree
+        :param entries: Entry of each layer node
+        :param qualified_names: Names of the nodes on the layer
+        :return: The layer
         '''
-        entry = entry if entry else self.yaml_tree
+        layer = cls.__new__(cls)
+        layer.yaml_tree = {}
+        layer.set_index(entries, qualified_names)
+        return layer
 
-        for k, v in entry.items():
-            cur_name = path + sep + k if path else k
-
-            if k[0] != '_':
+    def index(self, sep: str = '_') -> None:
+        '''
+        Indexes yaml_tree. Keys starting with '_' are layer attributes, the
+         other keys are nodes, named by their path.
+        :param sep: Separator of qualified name
+        :return: None
+        '''
+        entries: Dict[str, LayerEntry] = {}
+        names: Set[str] = set()
+        pending: List[Tuple[dict, str]] = [(self.yaml_tree, '')]
+        while pending:
+            entry, path = pending.pop()
+            names.update(self._constant_names(entry, path, sep))
+            for k, v in entry.items():
+                if k[0] == '_':
+                    continue
+                name = path + sep + k if path else k
+                names.add(name)
                 if isinstance(v, dict):
-                    for nk, p in self.iterate_qualified_name_value(
-                            entry=v, path=cur_name, sep=sep
-                    ):
-                        yield nk, p
+                    pending.append((v, name))
                 elif isinstance(v, list):
-                    for elem in v:
-                        for nk, p in self.iterate_qualified_name_value(
-                                entry=elem, path=cur_name, sep=sep
-                        ):
-                            yield nk, p
+                    pending.extend((e, name) for e in v if isinstance(e, dict))
                 else:
-                    yield cur_name, v
+                    # Scalar values are part of the node name, e.g. enums
+                    names.add(name + str(v))
+
+                layer_entry = self.create_entry(v)
+                if name in entries:
+                    layer_entry = entries[name].merge(layer_entry)
+                entries[name] = layer_entry
+
+        self.set_index(entries, names)
+
+    def set_index(
+            self, entries: Dict[str, LayerEntry],
+            qualified_names: Iterable[str]
+    ) -> None:
+        '''
+        :param entries: Entry of each layer node
+        :param qualified_names: Names of the nodes on the layer
+        :return: None
+        '''
+        self.entries = entries
+        self.qualified_names = frozenset(qualified_names)
+        self.list_node_names = {
+            name for name, e in entries.items()
+            if e.is_list or e.has_constants
+        }
+        self.write_node_names = {
+            name for name, e in entries.items() if e.has_write
+        }
+        self.parent_attribute_node_names = {
+            name for name, e in entries.items() if e.has_parent_attribute
+        }
 
-                yield cur_name, v
-
-    def get_list_node_names(self) -> Iterator[str]:
+    @staticmethod
+    def _constant_names(entry: dict, path: str, sep: str) -> List[str]:
         '''
-        :return: Next node name of lists on Layer
+        :param entry: Layer tree node
+        :param path: Node path
+        :param sep: Separator of qualified name
+        :return: Names of the constants of the node, which are in the layer
+         as well
         '''
-        for name, entry in self.iterate_qualified_name_value():
-            if isinstance(entry, list):
-                yield name
-            elif (isinstance(entry, dict)
-                  and '_constants' in entry):
-                yield name
+        if '_constants' not in entry:
+            return []
+        constants = next(iter(entry['_constants'].values()))
+        return [path + sep + p for p in constants]
 
-    def get_write_node_names(self) -> Iterator[str]:
-        '''
-        :return: Next node name of nodes with write on Layer
-        '''
-        for name, entry in self.iterate_qualified_name_value():
-            if isinstance(entry, list):
-                entry = entry[0]
-            if isinstance(entry, dict):
-                for child_name, d in entry.items():
-                    if isinstance(d, dict) and Layer.has_write(d):
-                        yield name
-                        break
+    @staticmethod
+    def create_entry(value: Any) -> LayerEntry:
+        '''
+        :param value: Value of a layer node. Lists are described by their
+         first element.
+        :return: Entry of the node
+        '''
+        node = value[0] if isinstance(value, list) and value else value
+        if not isinstance(node, dict):
+            return LayerEntry(isinstance(value, list), False, False, False)
+
+        has_write = has_parent_attribute = False
+        for d in node.values():
+            if isinstance(d, dict):
+                has_write = has_write or Layer.has_write(d)
+                has_parent_attribute = has_parent_attribute or any(
+                    '_parentAttribute' in grandson for grandson in d
+                )
+        return LayerEntry(
+            isinstance(value, list),
+            isinstance(value, dict) and '_constants' in value, has_write,
+            has_parent_attribute,
+        )
 
     @staticmethod
     def entry_has_franca_idl_write(entry: dict) -> bool:
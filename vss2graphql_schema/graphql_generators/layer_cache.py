@@ -0,0 +1,141 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import hashlib
+import mmap
+import struct
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from .depl_loader import include_closure
+from .layer import Layer, LayerEntry
+from .tree_cache import FileCache
+
+# Bump when the snapshot layout or the layer index changes
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_MAGIC = b'VSSL'
+# Magic, format and number of names, followed by one byte of flags per
+#  name and the names, UTF-8 encoded and separated by NUL
+SNAPSHOT_HEADER = struct.Struct('<4sII')
+ON_LAYER = 1
+HAS_ENTRY = 2
+IS_LIST = 4
+HAS_CONSTANTS = 8
+HAS_WRITE = 16
+HAS_PARENT_ATTRIBUTE = 32
+
+
+def layer_key(file: str) -> Optional[str]:
+    '''
+    Content hash of the root layer file and of every file it includes
+    :param file: Root layer file
+    :return: Hex digest identifying the layer, None if the included files
+     can not be found without parsing the layer
+    '''
+    files, complete = include_closure(file)
+    if not files or not complete:
+        return None
+    key = hashlib.sha256(f'{SNAPSHOT_FORMAT}\0{len(files)}\0'.encode())
+    for _, content in files:
+        key.update(hashlib.sha256(content).digest())
+    return key.hexdigest()
+
+
+def dump_snapshot(layer: Layer) -> bytes:
+    '''
+    :param layer: Layer to save
+    :return: Snapshot of the layer index
+    '''
+    names = sorted(layer.qualified_names.union(layer.entries))
+    flags = bytearray(len(names))
+    for i, name in enumerate(names):
+        if '\0' in name:
+            raise ValueError(f'layer name {name!r} has a NUL character')
+        entry = layer.entries.get(name)
+        flags[i] = (name in layer.qualified_names) * ON_LAYER | ((
+            HAS_ENTRY | entry.is_list * IS_LIST
+            | entry.has_constants * HAS_CONSTANTS
+            | entry.has_write * HAS_WRITE
+            | entry.has_parent_attribute * HAS_PARENT_ATTRIBUTE
+        ) if entry else 0)
+    return b''.join((
+        SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, len(names)),
+        flags, '\0'.join(names).encode(),
+    ))
+
+
+def load_snapshot(snapshot: Union[bytes, mmap.mmap]) -> Layer:
+    '''
+    Decodes the whole snapshot into a new layer index. Mapping the file
+     saves the read into a buffer of its own, but not the decoding: every
+     name is copied out of the snapshot.
+    :param snapshot: Snapshot from dump_snapshot, or a mapped file with it
+    :return: Layer with the saved index
+    '''
+    magic, version, count = SNAPSHOT_HEADER.unpack_from(snapshot)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT:
+        raise ValueError('not a layer snapshot of this version')
+    start = SNAPSHOT_HEADER.size
+    flags = snapshot[start:start + count]
+    # An empty layer has no names at all, not a single empty one
+    names = snapshot[start + count:].decode().split('\0') if count else []
+    if len(flags) != count or len(names) != count:
+        raise ValueError('truncated layer snapshot')
+
+    qualified_names: List[str] = []
+    entries: Dict[str, LayerEntry] = {}
+    for name, flag in zip(names, flags):
+        if flag & ON_LAYER:
+            qualified_names.append(name)
+        if flag & HAS_ENTRY:
+            entries[name] = LayerEntry(
+                bool(flag & IS_LIST), bool(flag & HAS_CONSTANTS),
+                bool(flag & HAS_WRITE), bool(flag & HAS_PARENT_ATTRIBUTE),
+            )
+    return Layer.from_index(entries, qualified_names)
+
+
+class LayerCache(FileCache[Layer]):
+    '''
+    On-disk cache of layer indexes, stored as snapshots that are memory
+     mapped and decoded when read. Hits skip the YAML parsing.
+    '''
+    SUFFIX = '.layer.snapshot'
+    READ_ERRORS = (OSError, ValueError, UnicodeDecodeError, struct.error)
+    WRITE_ERRORS = (OSError, ValueError)
+
+    def read(self, file: BinaryIO) -> Layer:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+            return load_snapshot(snapshot)
+
+    def write(self, file: BinaryIO, value: Layer) -> None:
+        file.write(dump_snapshot(value))
+
+
+def load_layer_cached(
+        file: str, jobs: int = 1, cache: Optional[LayerCache] = None
+) -> Layer:
+    '''
+    Layer(file, jobs), built from the snapshot in 'cache' when it is there
+    :param file: Root layer file
+    :param jobs: Maximum number of processes parsing included files
+    :param cache: Layer cache, None to always load the layer
+    :return: The layer
+    '''
+    key = layer_key(file) if cache is not None else None
+    if cache is None or key is None:
+        return Layer(file, jobs)
+
+    layer = cache.load(key)
+    if layer is None:
+        layer = Layer(file, jobs)
+        cache.store(key, layer)
+    return layer
@@ -11,14 +11,17 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-from typing import TextIO, Iterable, List, Mapping, Iterator, Any
+from typing import (
+    TextIO, Iterable, List, Mapping, Iterator, Any, Tuple
+)
 
 from vspec.model.vsstree import VSSNode, VSSType
 
 from ..layer import Layer
-from ..util import get_input_name, get_node_description
+from ..util import get_input_name, get_node_description, qualified_name
 from ..vss_generators.vss_generator import VSSLeafGenerator
 from ..model.field import Field
+from ..node_facts import NodeFacts, mask_and, mask_or
 from ..vss_generators.input_generator import InputEmitter, InputGenerator
 
 
@@ -36,28 +39,20 @@ class InputLayerGenerator(VSSLeafGenerator):
             output, 'input', InputEmitter, vss_roots, args
         )
         self.layer = layer
-        self.parent_attrs_input_names = set(
-            self.get_layer_parent_attribute_input_node_names()
-        )
-
-    def get_layer_parent_attribute_input_node_names(self) -> Iterator[str]:
-        for name, entry in self.layer.iterate_qualified_name_value():
-            if isinstance(entry, list):
-                entry = entry[0]
-            if isinstance(entry, dict):
-                for child_name, d in entry.items():
-                    if isinstance(d, dict):
-                        for grandson in d:
-                            if '_parentAttribute' in grandson:
-                                yield name
-                                break
+        self.parent_attrs_input_names = layer.parent_attribute_node_names
 
     @staticmethod
     def _get_parents_names(node: VSSNode) -> Iterator[str]:
-        node_names = node.qualified_name('_').split('_')
+        node_names = qualified_name(node).split('_')
         for i in range(len(node_names)):
             yield '_'.join(node_names[:i + 1])
 
+    def selection(self, facts: NodeFacts) -> bytes:
+        layer_facts = facts.layer_facts(self.layer)
+        return mask_and(facts.has_children, mask_or(
+            layer_facts.is_writable, layer_facts.is_parent_attribute
+        ))
+
     def _get_entries(self, node: VSSNode) -> List[Field]:
         '''
         Generate entry for each node child that has type VSSType.ACTUATOR
@@ -65,10 +60,10 @@ class InputLayerGenerator(VSSLeafGenerator):
         :return: List of fields from children with type VSSType.ACTUATOR
         '''
         input_declarations = []
-        node_name = node.qualified_name('_')
+        node_name = qualified_name(node)
         if (node_name in self.layer.write_node_names
                 or node_name in self.parent_attrs_input_names):
-            for child in node.children:
+            for child in self.tree.children(node):
                 if child.type == VSSType.ACTUATOR:
                     field = InputGenerator.field_from_vss_node(
                         child, custom_scalars=self.args.custom_scalars,
@@ -79,7 +74,8 @@ class InputLayerGenerator(VSSLeafGenerator):
                     input_declarations.append(field)
 
                 # Add if input child has parent attribute
-                if child.qualified_name('_') in self.parent_attrs_input_names:
+                child_name = qualified_name(child)
+                if child_name in self.parent_attrs_input_names:
                     field = InputGenerator.field_from_vss_node(
                         child, custom_scalars=self.args.custom_scalars,
                         enums=self.args.enums, has_range_directive=False,
@@ -87,8 +83,7 @@ class InputLayerGenerator(VSSLeafGenerator):
                     )
                     field.field_type = get_input_name(child)
 
-                    if (child.qualified_name('_')
-                            in self.layer.list_node_names):
+                    if child_name in self.layer.list_node_names:
                         field.field_type = '[' + field.field_type + ']'
 
                     input_declarations.append(field)
@@ -101,6 +96,20 @@ class InputLayerGenerator(VSSLeafGenerator):
 
         return input_declarations
 
+    def _get_fragment_facts(self, node: VSSNode) -> Tuple[Any, ...]:
+        parent_attrs = self.parent_attrs_input_names
+        list_names = self.layer.list_node_names
+        node_name = qualified_name(node)
+        return (
+            node_name in self.layer.write_node_names,
+            node_name in parent_attrs,
+            [
+                (name in parent_attrs, name in list_names)
+                for name in map(qualified_name, self.tree.children(node))
+            ],
+            [name in list_names for name in self._get_parents_names(node)],
+        )
+
     def _get_extra_vars_from_node(self, node: VSSNode) -> Mapping[str, Any]:
         return {
             'name': get_input_name(node),
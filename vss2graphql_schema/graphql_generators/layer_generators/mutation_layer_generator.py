@@ -13,14 +13,12 @@
 import argparse
 from typing import TextIO, Iterable, List
 
-from anytree import PreOrderIter
-
 from vspec.model.vsstree import VSSNode
 
 from ..layer import Layer
 from ..emitters.mutation_emitter import MutationEmitter
 from ..model.field import Field
-from ..util import node_has_child_actuator
+from ..node_facts import NodeFacts, mask_and
 from ..vss_generators.mutation_generator import MutationGenerator
 from ..vss_generators.vss_generator import VSSRootsGenerator
 
@@ -31,6 +29,8 @@ class MutationLayerGenerator(VSSRootsGenerator):
      as children.
     '''
     layer: Layer
+    visits_nodes = True
+    mutation_nodes: List[VSSNode]
 
     def __init__(
             self, output: TextIO, vss_roots: Iterable[VSSNode],
@@ -44,21 +44,31 @@ class MutationLayerGenerator(VSSRootsGenerator):
             output, 'mutation', MutationEmitter, vss_roots, args
         )
         self.layer = layer
+        self.mutation_nodes = []
+
+    def selection(self, facts: NodeFacts) -> bytes:
+        return mask_and(
+            facts.layer_facts(self.layer).is_writable,
+            facts.has_actuator_child,
+        )
+
+    def visit_selected(self) -> None:
+        '''
+        Keep the nodes written by the layer, with actuators in their
+         children, to create their mutations in pre-order
+        :return: None
+        '''
+        facts = self.tree.facts()
+        self.mutation_nodes = list(
+            facts.select(self.selection(facts), pre_order=True)
+        )
 
     def _get_entries(self, roots: Iterable[VSSNode]) -> List[Field]:
         '''
-        Look for actuators in children and if there is one, create the mutation
-        for that node.
         :param roots: all roots from vss
-        :return: list of fields in mutation
+        :return: list of fields in mutation, in pre-order
         '''
-        mutation_field = []
-        for r in roots:
-            for node in PreOrderIter(r):
-                if (node.qualified_name('_') in self.layer.write_node_names
-                        and node_has_child_actuator(node)):
-                    f = MutationGenerator.field_from_vss_node(
-                        node,
-                    )
-                    mutation_field.append(f)
-        return mutation_field
+        return [
+            MutationGenerator.field_from_vss_node(node)
+            for node in self.mutation_nodes
+        ]
@@ -11,16 +11,19 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-from typing import List, TextIO, Iterable, Mapping, Iterator, Any
+from typing import (
+    List, TextIO, Iterable, Mapping, Any, Tuple
+)
 
 from vspec.model.vsstree import VSSNode
 
 from ..layer import Layer
-from ..util import get_type_name, get_node_description
+from ..util import get_type_name, get_node_description, qualified_name
 from ..vss_generators.type_generator import TypeGenerator
 from ..vss_generators.vss_generator import VSSLeafGenerator
 from ..emitters.type_field_emitter import TypeFieldEmitter
 from ..model.field import Field
+from ..node_facts import NodeFacts
 
 
 class TypeLayerGenerator(VSSLeafGenerator):
@@ -45,10 +48,8 @@ class TypeLayerGenerator(VSSLeafGenerator):
         )
         self.layer = layer
 
-    def get_list_node_names(self) -> Iterator[str]:
-        for name, layer_entry in self.layer.iterate_qualified_name_value():
-            if isinstance(layer_entry, list):
-                yield name
+    def selection(self, facts: NodeFacts) -> bytes:
+        return facts.has_children
 
     def _get_entries(self, node: VSSNode) -> List[Field]:
         '''
@@ -58,7 +59,7 @@ class TypeLayerGenerator(VSSLeafGenerator):
         '''
         children_declarations: List[Field] = []
 
-        for child in node.children:
+        for child in self.tree.children(node):
             field = TypeGenerator.field_from_vss_node(
                 child, custom_scalars=self.args.custom_scalars,
                 enums=self.args.enums,
@@ -66,18 +67,28 @@ class TypeLayerGenerator(VSSLeafGenerator):
                 has_has_permission_directive=self.args.permission_directive,
             )
 
-            if child.qualified_name('_') in self.layer.list_node_names:
+            if qualified_name(child) in self.layer.list_node_names:
                 field.field_type = '[' + field.field_type + ']'
 
             children_declarations.append(field)
 
-        if (node.qualified_name('_') in self.layer.list_node_names
+        if (qualified_name(node) in self.layer.list_node_names
                 and len(children_declarations) > 0):
             id_field = Field('id', 'ID!')
             children_declarations.append(id_field)
 
         return children_declarations
 
+    def _get_fragment_facts(self, node: VSSNode) -> Tuple[Any, ...]:
+        list_names = self.layer.list_node_names
+        return (
+            qualified_name(node) in list_names,
+            [
+                qualified_name(child) in list_names
+                for child in self.tree.children(node)
+            ],
+        )
+
     def _get_extra_vars_from_node(self, node: VSSNode) -> Mapping[str, Any]:
         return {
             'name': get_type_name(node),
@@ -1,10 +1,20 @@
+from typing import Optional
+
+_VALUES = ('description', 'unit', 'min_value', 'max_value', 'enum')
+
+
 class Description:
-    __slots__ = ('description', 'unit', 'min_value', 'max_value', 'enum')
+    '''
+    Description of a node. It is rendered once, the first time it is turned
+     into a string
+    '''
+    __slots__ = (*_VALUES, '_text')
     description: str
     unit: str
     min_value: str
     max_value: str
     enum: str
+    _text: Optional[str]
 
     def __init__(
             self, description: str, unit: str = '', min_value: str = '',
@@ -15,22 +25,27 @@ class Description:
         self.min_value = min_value
         self.max_value = max_value
         self.enum = enum
+        self._text = None
 
     def __str__(self) -> str:
-        values = []
-        if self.unit:
-            values.append('@unit: ' + self.unit)
-        if self.min_value:
-            values.append('@min: ' + self.min_value)
-        if self.max_value:
-            values.append('@max: ' + self.max_value)
-        if self.enum:
-            values.append('@enum: ' + self.enum)
+        if self._text is None:
+            values = []
+            if self.unit:
+                values.append('@unit: ' + self.unit)
+            if self.min_value:
+                values.append('@min: ' + self.min_value)
+            if self.max_value:
+                values.append('@max: ' + self.max_value)
+            if self.enum:
+                values.append('@enum: ' + self.enum)
 
-        return self.description + ('\n' + '\n'.join(values) if values else '')
+            self._text = self.description + (
+                '\n' + '\n'.join(values) if values else ''
+            )
+        return self._text
 
     def empty(self) -> bool:
-        for s in self.__slots__:
+        for s in _VALUES:
             if getattr(self, s, False):
                 return False
         return True
@@ -10,33 +10,41 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from typing import (Iterable, Optional, List, Literal,
-                    Callable, Sequence, Union)
+from typing import (Iterable, Optional, Literal,
+                    Callable, Sequence, Tuple, Union)
 
 from .parameter import Parameter
 
 
 class DirectiveCall:
     '''
-    Class to handle GraphQL directive call
+    Class to handle GraphQL directive call. It is rendered once, the first
+     time it is turned into a string
     '''
+    __slots__ = ('name', 'parameters', '_text')
     name: str
     parameters: Iterable[Parameter]
+    _text: Optional[str]
 
     def __init__(self, name: str, parameters: Iterable[Parameter]) -> None:
         self.name = name
         self.parameters = parameters
+        self._text = None
 
     def __str__(self) -> str:
-        r = '@' + self.name
-        r += '(' + ', '.join([str(p) for p in self.parameters]) + ')'
-        return r
+        if self._text is None:
+            self._text = (
+                '@' + self.name
+                + '(' + ', '.join(map(str, self.parameters)) + ')'
+            )
+        return self._text
 
 
 class RangeDirective(DirectiveCall):
     '''
     Range directive call
     '''
+    __slots__ = ('min_value', 'max_value')
     min_value: Optional[Union[int, float]]
     max_value: Optional[Union[int, float]]
 
@@ -44,11 +52,13 @@ class RangeDirective(DirectiveCall):
         self, min_value: Optional[Union[int, float]],
         max_value: Optional[Union[int, float]]
     ) -> None:
-        parameters: List[Parameter] = []
+        self.min_value = min_value
+        self.max_value = max_value
+        parameters: Tuple[Parameter, ...] = ()
         if min_value is not None:
-            parameters.append(Parameter('min', str(min_value)))
+            parameters += (Parameter('min', str(min_value)),)
         if max_value is not None:
-            parameters.append(Parameter('max', str(max_value)))
+            parameters += (Parameter('max', str(max_value)),)
 
         super().__init__('range', parameters)
 
@@ -57,13 +67,15 @@ class DeprecatedDirective(DirectiveCall):
     '''
     Deprecated directive call
     '''
+    __slots__ = ('reason',)
     reason: Optional[str]
 
     def __init__(self, reason: Optional[str]) -> None:
-        parameters: List[Parameter] = []
+        self.reason = reason
+        parameters: Tuple[Parameter, ...] = ()
         if reason:
             p = Parameter('reason', '"' + reason.replace('"', "'") + '"')
-            parameters.append(p)
+            parameters = (p,)
         super().__init__('deprecated', parameters)
 
 
@@ -77,18 +89,20 @@ class HasPermissionsDirective(DirectiveCall):
     '''
     hasPermission Directive Call
     '''
+    __slots__ = ('permissions',)
     permissions: Iterable[Permission]
 
     def __init__(
             self, permissions: Sequence[Permission],
             permission_name: Callable[[Permission], str]
     ) -> None:
-        parameters: List[Parameter] = []
+        self.permissions = permissions
+        parameters: Tuple[Parameter, ...] = ()
         permission_names = [
             '"' + permission_name(p) + '"' for p in permissions
         ]
         if permissions:
-            parameters.append(Parameter(
+            parameters = (Parameter(
                 'permissions', '[' + ', '.join(permission_names) + ']'
-            ))
+            ),)
         super().__init__('hasPermissions', parameters)
@@ -17,11 +17,13 @@ from .parameter import Parameter
 Location = Literal[
     'SCALAR', 'OBJECT', 'FIELD_DEFINITION', 'ARGUMENT_DEFINITION',
     'INTERFACE', 'UNION', 'ENUM', 'ENUM_VALUE', 'INPUT_OBJECT',
-    'INPUT_FIELD_DEFINITION', 'SCHEMA'
+    'INPUT_FIELD_DEFINITION', 'SCHEMA', 'FIELD', 'FRAGMENT_SPREAD',
+    'INLINE_FRAGMENT'
 ]
 
 
 class DirectiveDeclaration:
+    __slots__ = ('name', 'parameters', 'locations')
     name: str
     parameters: Iterable[Parameter]
     locations: Iterable[Location]
@@ -42,6 +44,8 @@ class DirectiveDeclaration:
 
 
 class RangeDirectiveDeclaration(DirectiveDeclaration):
+    __slots__ = ()
+
     def __init__(self) -> None:
         parameters: List[Parameter] = [
             Parameter('min', 'Float'), Parameter('max', 'Float')
@@ -53,6 +57,8 @@ class RangeDirectiveDeclaration(DirectiveDeclaration):
 
 
 class HasPermissionDirectiveDeclaration(DirectiveDeclaration):
+    __slots__ = ()
+
     def __init__(self) -> None:
         parameters: List[Parameter] = [
             Parameter('permissions', '[String!]', is_required=True),
@@ -16,6 +16,7 @@ from .description import Description
 
 
 class EnumField:
+    __slots__ = ('value', 'description')
     value: str
     description: Optional[Description]
 
@@ -23,5 +24,5 @@ class EnumField:
         self.value = value
         self.description = description
 
-    def __str__(self):
+    def __str__(self) -> str:
         return self.value
@@ -10,21 +10,27 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import sys
 from typing import Optional, Sequence
 
 from .description import Description
 from .directive_call import DirectiveCall
 from .parameter import Parameter
 
+# Description of the fields created without one, it is never changed
+_NO_DESCRIPTION = Description('')
+
 
 class Field:
     '''
     Class that holds multiple info for declarations as
      "field_name: field_type directives"
     '''
+    __slots__ = ('field_name', '_field_type', 'description', 'parameters',
+                 'directives')
     field_name: str
-    field_type: str
-    description: Optional[Description]
+    _field_type: str
+    description: Description
     parameters: Sequence[Parameter]
     directives: Sequence[DirectiveCall]
 
@@ -36,16 +42,25 @@ class Field:
     ) -> None:
         self.field_name = field_name
         self.field_type = field_type
-        self.description = description if description else Description('')
+        self.description = description if description else _NO_DESCRIPTION
         self.parameters = parameters if parameters else []
         self.directives = directives if directives else []
 
+    @property
+    def field_type(self) -> str:
+        return self._field_type
+
+    @field_type.setter
+    def field_type(self, field_type: str) -> None:
+        # Type names repeat across the fields, and the variants of a matrix
+        self._field_type = sys.intern(field_type)
+
     def __str__(self) -> str:
         r = self.field_name
         if len(self.parameters) > 0:
-            r += '(' + ', '.join([str(p) for p in self.parameters]) + ')'
-        r += ': ' + self.field_type
+            r += '(' + ', '.join(map(str, self.parameters)) + ')'
+        r += ': ' + self._field_type
 
         if len(self.directives) > 0:
-            r += ' ' + ' '.join([str(d) for d in self.directives])
+            r += ' ' + ' '.join(map(str, self.directives))
         return r
@@ -14,6 +14,7 @@ from typing import Optional
 
 
 class Parameter:
+    __slots__ = ('name', 'type_or_value', 'default_value', 'is_required')
     name: str
     type_or_value: str
     default_value: Optional[str]
@@ -28,7 +29,7 @@ class Parameter:
         self.default_value = default_value
         self.is_required = is_required
 
-    def __str__(self):
+    def __str__(self) -> str:
         r = self.name + ': ' + self.type_or_value
         r += '!' if self.is_required else ''
         if self.default_value or self.default_value == '':
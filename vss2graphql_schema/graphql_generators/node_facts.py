@@ -0,0 +1,193 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+from array import array
+from itertools import compress
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+)
+
+from vspec.model.vsstree import VSSType
+
+from .layer import Layer
+from .tree_view import VSSTreeView
+from .util import node_has_enum, qualified_name
+
+
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
+# Node types by type code
+NODE_TYPES: Tuple[VSSType, ...] = tuple(VSSType)
+_TYPE_CODES = {t: i for i, t in enumerate(NODE_TYPES)}
+_ACTUATOR = _TYPE_CODES[VSSType.ACTUATOR]
+
+
+class LayerFacts(NamedTuple):
+    '''
+    Masks of the nodes named by a layer, indexed by node id
+    '''
+    is_list: bytes
+    is_writable: bytes
+    is_parent_attribute: bytes
+
+
+def mask_and(*masks: bytes) -> bytes:
+    '''
+    Masks hold 0 or 1 for each node, so they are combined as whole integers
+     instead of node by node
+    :param masks: Masks of the same length
+    :return: Mask of the nodes set in every mask
+    '''
+    value = int.from_bytes(masks[0], 'little')
+    for mask in masks[1:]:
+        value &= int.from_bytes(mask, 'little')
+    return value.to_bytes(len(masks[0]), 'little')
+
+
+def mask_or(*masks: bytes) -> bytes:
+    '''
+    :param masks: Masks of the same length
+    :return: Mask of the nodes set in any mask
+    '''
+    value = 0
+    for mask in masks:
+        value |= int.from_bytes(mask, 'little')
+    return value.to_bytes(len(masks[0]), 'little')
+
+
+class NodeFacts:
+    '''
+    Facts the generators ask about the nodes of a view, taken in a single
+     pass into columns indexed by node id. Ids follow the level order of the
+     view, so selecting the nodes of a mask keeps that order. Columns are
+     stdlib arrays, and boolean columns are masks holding 0 or 1 per node.
+    '''
+    nodes: List['VSSNode']
+    # Parent id, -1 for the roots
+    parent: array
+    depth: array
+    # Index in NODE_TYPES
+    node_type: array
+    # Index in data_types, 0 for the nodes without data type
+    data_type: array
+    data_types: List[Any]
+    has_children: bytes
+    has_enum: bytes
+    has_actuator_child: bytes
+    deprecated: bytes
+    _layer_facts: Dict[int, Tuple[Layer, LayerFacts]]
+    _pre_order: Optional[List[int]]
+
+    def __init__(self, tree: VSSTreeView) -> None:
+        '''
+        :param tree: View whose nodes are described
+        '''
+        self.nodes = list(tree.level_order())
+        count = len(self.nodes)
+        self.parent = array('l', [-1]) * count
+        self.depth = array('l', [0]) * count
+        self.node_type = array('B', bytes(count))
+        self.data_type = array('B', bytes(count))
+        self.data_types = [None]
+        has_children = bytearray(count)
+        has_enum = bytearray(count)
+        has_actuator_child = bytearray(count)
+        deprecated = bytearray(count)
+        self._layer_facts = {}
+        self._pre_order = None
+
+        ids: Dict['VSSNode', int] = {}
+        data_type_codes: Dict[Any, int] = {None: 0}
+        for i, node in enumerate(self.nodes):
+            ids[node] = i
+            parent = ids.get(node.parent, -1)
+            node_type = _TYPE_CODES[node.type]
+            if parent >= 0:
+                self.parent[i] = parent
+                self.depth[i] = self.depth[parent] + 1
+                has_children[parent] = 1
+                if node_type == _ACTUATOR:
+                    has_actuator_child[parent] = 1
+            self.node_type[i] = node_type
+            data_type = getattr(node, 'data_type', None)
+            code = data_type_codes.get(data_type)
+            if code is None:
+                code = data_type_codes[data_type] = len(self.data_types)
+                self.data_types.append(data_type)
+            self.data_type[i] = code
+            has_enum[i] = 1 if node_has_enum(node) else 0
+            deprecated[i] = 1 if node.deprecation else 0
+
+        self.has_children = bytes(has_children)
+        self.has_enum = bytes(has_enum)
+        self.has_actuator_child = bytes(has_actuator_child)
+        self.deprecated = bytes(deprecated)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def select(
+            self, mask: Optional[bytes] = None, pre_order: bool = False
+    ) -> Iterator['VSSNode']:
+        '''
+        :param mask: Mask of the nodes to select, every node if None
+        :param pre_order: Select the nodes in pre-order instead
+        :return: Next selected node, in level order or in pre-order
+        '''
+        if pre_order:
+            ids = self.pre_order()
+            return (
+                self.nodes[i] for i in ids if mask is None or mask[i]
+            )
+        if mask is None:
+            return iter(self.nodes)
+        return compress(self.nodes, mask)
+
+    def pre_order(self) -> List[int]:
+        '''
+        Children of a node have consecutive ids, in the order of the view,
+         so the pre-order is walked from the parent column
+        :return: Node ids in pre-order, taken once
+        '''
+        if self._pre_order is None:
+            children: List[List[int]] = [[] for _ in self.nodes]
+            roots: List[int] = []
+            for i, parent in enumerate(self.parent):
+                (children[parent] if parent >= 0 else roots).append(i)
+            self._pre_order = []
+            stack = roots[::-1]
+            while stack:
+                i = stack.pop()
+                self._pre_order.append(i)
+                stack.extend(reversed(children[i]))
+        return self._pre_order
+
+    def layer_facts(self, layer: Layer) -> LayerFacts:
+        '''
+        :param layer: Layer naming the nodes
+        :return: Masks of the nodes named by the layer, taken once per layer
+        '''
+        cached = self._layer_facts.get(id(layer))
+        if cached is not None:
+            return cached[1]
+        names = [qualified_name(node) for node in self.nodes]
+        facts = LayerFacts(*(
+            bytes(1 if name in layer_names else 0 for name in names)
+            for layer_names in (
+                layer.list_node_names, layer.write_node_names,
+                layer.parent_attribute_node_names,
+            )
+        ))
+        # The layer is kept so its id is not reused
+        self._layer_facts[id(layer)] = (layer, facts)
+        return facts
@@ -10,18 +10,55 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from typing import Callable
+from typing import Dict, FrozenSet, Set
 
 from ..layer import Layer
 
 
+class LayerFilter:
+    '''
+    Filter of the nodes on a layer. Besides testing a qualified name, it
+     gives the names of the children of a node that may be on the layer, so
+     VSSTreeFilter skips the other children and their subtrees without
+     testing them.
+    :param layer: Layer class to get node qualified names
+    '''
+    names: FrozenSet[str]
+    children: Dict[str, FrozenSet[str]]
+
+    def __init__(self, layer: Layer) -> None:
+        self.names = layer.qualified_names
+        # Names are split at every separator, since node names may have
+        #  one, so 'A_B_C' is a child 'B_C' of 'A' and 'C' of 'A_B'
+        children: Dict[str, Set[str]] = {}
+        for name in self.names:
+            i = name.find('_')
+            while i != -1:
+                children.setdefault(name[:i], set()).add(name[i + 1:])
+                i = name.find('_', i + 1)
+        self.children = {k: frozenset(v) for k, v in children.items()}
+
+    def __call__(self, name: str) -> bool:
+        '''
+        :param name: Node qualified name
+        :return: True if the node is on layer and False otherwise
+        '''
+        return name in self.names
+
+    def child_names(self, name: str) -> FrozenSet[str]:
+        '''
+        :param name: Node qualified name
+        :return: Names of the children of the node that are on the layer
+        '''
+        return self.children.get(name, frozenset())
+
+
 def create_layer_filter(
         layer: Layer
-) -> Callable[[str], bool]:
+) -> LayerFilter:
     '''
     :param layer: Layer class to get node qualified names
     :return: A filter that returns True if the node is on layer and returns
      False otherwise
     '''
-    nodes_to_include = set(layer.iterate_qualified_names())
-    return lambda x: x in nodes_to_include
+    return LayerFilter(layer)
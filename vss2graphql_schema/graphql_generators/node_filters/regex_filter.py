@@ -11,26 +11,68 @@
 # http://mozilla.org/MPL/2.0/.
 
 import re
-from typing import Callable
+from typing import Callable, Iterable, List, Union
+
+# Numbered and named backreferences change meaning in an alternation
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+def read_patterns(file_name: str) -> List[str]:
+    '''
+    :param file_name: File with one regex expression per line. Empty lines
+     and lines starting with '#' are skipped.
+    :return: The regex expressions
+    '''
+    with open(file_name) as file:
+        return [
+            line.rstrip('\r\n') for line in file
+            if line.strip() and not line.startswith('#')
+        ]
+
+
+def compile_patterns(
+        regex_expressions: Union[str, Iterable[str]]
+) -> Callable[[str], bool]:
+    '''
+    Combines the expressions into one alternation, so each name is matched
+     once, however many expressions there are
+    :param regex_expressions: Any regex expression, or a list of them
+    :return: A function that returns True if any expression matches
+    '''
+    if isinstance(regex_expressions, str):
+        regex_expressions = [regex_expressions]
+    expressions = list(regex_expressions)
+    if len(expressions) == 1:
+        regexp = re.compile(expressions[0])
+        return lambda x: regexp.match(x) is not None
+
+    regexps = [re.compile(e) for e in expressions]
+    if not any(BACKREFERENCE.search(e) for e in expressions):
+        try:
+            regexp = re.compile('|'.join(f'(?:{e})' for e in expressions))
+            return lambda x: regexp.match(x) is not None
+        except re.error:
+            # e.g. global flags or group names used by several expressions
+            pass
+    return lambda x: any(r.match(x) for r in regexps)
 
 
 def create_match_pattern(
-        regex_expression: str
+        regex_expression: Union[str, Iterable[str]]
 ) -> Callable[[str], bool]:
     '''
-    :param regex_expression: Any regex expression
-    :return: A filter that returns True if regex matches
+    :param regex_expression: Any regex expression, or a list of them
+    :return: A filter that returns True if any regex matches
     '''
-    regexp = re.compile(regex_expression)
-    return lambda x: regexp.match(x) is not None
+    return compile_patterns(regex_expression)
 
 
 def create_filter_pattern(
-        regex_expression: str
+        regex_expression: Union[str, Iterable[str]]
 ) -> Callable[[str], bool]:
     '''
-    :param regex_expression: Any regex expression
-    :return: A filter that returns False if regex matches
+    :param regex_expression: Any regex expression, or a list of them
+    :return: A filter that returns False if any regex matches
     '''
-    regexp = re.compile(regex_expression)
-    return lambda x: regexp.match(x) is None
+    matches = compile_patterns(regex_expression)
+    return lambda x: not matches(x)
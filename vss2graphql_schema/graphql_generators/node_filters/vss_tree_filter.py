@@ -10,50 +10,112 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from typing import Optional, Iterable, Callable, Iterator
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+)
 
 from vspec.model.vsstree import VSSNode
 
 from ..constants import VSS_LEAF_TYPES
+from ..tree_view import VSSTreeView
+from ..util import qualified_name
+from .layer_filter import LayerFilter
 
 
 class VSSTreeFilter:
     '''
     A Class to handle filtering of VSS nodes. It receives a list of filters and
-    has a method filter_trees to remove nodes based on them
+    has a method view to take a filtered view of the tree, and filter_trees to
+    remove nodes based on them
     :param roots: VSS root node
     :param filters: A list of filters (Functions that receive a node name and
     returns if that node is allowed or not)
+    :param sort: Sort the children of the allowed nodes by name while
+    filtering, instead of keeping the order of the vspec files
     '''
     roots: Iterable[VSSNode]
     filters: Iterable[Callable[[str], bool]]
+    layer_filters: List[LayerFilter]
+    sort: bool
 
     def __init__(
             self, roots: Iterable[VSSNode],
             filters: Optional[Iterable[Callable[[str], bool]]] = None,
+            sort: bool = False,
     ) -> None:
         self.roots = roots
         self.filters = filters if filters else ()
+        self.sort = sort
+        # Layer filters also tell which children may be allowed
+        self.layer_filters = [
+            f for f in self.filters if isinstance(f, LayerFilter)
+        ]
 
     def filter_trees(self) -> Iterator[VSSNode]:
         '''
-        Filter the VSS tree and return the roots allowed by the filters
-        :return: Next allowed root and with its children filtered
+        Filter the VSS tree in place and return the roots allowed by the
+         filters
+        :return: Next allowed root and with its children filtered, and sorted
+         if requested
         '''
-        for root in self.roots:
-            filtered_node = self._filter_node(root)
-            if filtered_node:
-                yield filtered_node
+        view = self.view()
+        view.apply()
+        yield from view.roots
 
-    def _filter_node(self, node) -> Optional[VSSNode]:
-        if self._allowed(node):
-            node.children = [x for x in node.children if self._filter_node(x)]
-            if node.type in VSS_LEAF_TYPES or len(node.children) > 0:
-                return node
-        return None
+    def view(self) -> VSSTreeView:
+        '''
+        Filter the VSS tree into a view, leaving the tree unchanged
+        :return: View with the allowed roots and their children filtered, and
+         sorted if requested
+        '''
+        changed_children: Dict[VSSNode, Sequence[VSSNode]] = {}
+        return VSSTreeView(
+            [r for r in self.roots if self._filter_node(r, changed_children)],
+            changed_children,
+        )
+
+    def _filter_node(
+            self, node: VSSNode,
+            changed_children: Dict[VSSNode, Sequence[VSSNode]]
+    ) -> bool:
+        '''
+        :param node: Node to filter
+        :param changed_children: Receives the children of the allowed nodes
+         whose children are filtered or reordered
+        :return: True if the node is allowed
+        '''
+        if not self._allowed(node):
+            return False
+        kept = [
+            x for x in self._candidates(node)
+            if self._filter_node(x, changed_children)
+        ]
+        if self.sort:
+            # Siblings share the parent prefix of their qualified names
+            kept.sort(key=lambda x: x.name)
+        children = node.children
+        if len(kept) != len(children) or any(
+                x is not y for x, y in zip(kept, children)
+        ):
+            changed_children[node] = kept
+        return node.type in VSS_LEAF_TYPES or len(kept) > 0
+
+    def _candidates(self, node: VSSNode) -> Iterable[VSSNode]:
+        '''
+        :param node: Allowed node
+        :return: Children of the node that layer filters may allow
+        '''
+        children = node.children
+        if self.layer_filters and children:
+            name = qualified_name(node)
+            for f in self.layer_filters:
+                names = f.child_names(name)
+                children = [x for x in children if x.name in names]
+        return children
 
     def _allowed(self, node: VSSNode) -> bool:
+        name = qualified_name(node)
         for f in self.filters:
-            if not f(node.qualified_name('_')):
+            if not f(name):
                 return False
         return True
@@ -0,0 +1,112 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import contextlib
+import io
+import os
+import stat
+import sys
+import tempfile
+from typing import Iterator, List, TextIO
+
+# Output name that streams the schema to stdout
+STDOUT = '-'
+DEFAULT_FLUSH_SIZE = 1 << 20
+
+
+class ChunkedWriter(io.TextIOBase):
+    '''
+    Text writer that collects the small writes of the generators and sends
+     them to 'target' in chunks of at least 'flush_size' characters.
+    '''
+    target: TextIO
+    flush_size: int
+    _chunks: List[str]
+    _size: int
+
+    def __init__(
+            self, target: TextIO, flush_size: int = DEFAULT_FLUSH_SIZE
+    ) -> None:
+        '''
+        :param target: File receiving the chunks
+        :param flush_size: Minimum number of characters of a chunk
+        '''
+        super().__init__()
+        self.target = target
+        self.flush_size = flush_size
+        self._chunks = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._chunks.append(s)
+        self._size += len(s)
+        if self._size >= self.flush_size:
+            self._write_chunk()
+        return len(s)
+
+    def flush(self) -> None:
+        self._write_chunk()
+        self.target.flush()
+
+    def _write_chunk(self) -> None:
+        if self._chunks:
+            self.target.write(''.join(self._chunks))
+            self._chunks = []
+            self._size = 0
+
+
+def _new_file_mode(path: str) -> int:
+    '''
+    :param path: Output file path
+    :return: Mode of the existing file, or the mode 'open' would create it
+    '''
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def open_schema_output(
+        path: str, flush_size: int = DEFAULT_FLUSH_SIZE
+) -> Iterator[ChunkedWriter]:
+    '''
+    Opens the schema output. The schema is written to a temporary file next
+     to 'path', which replaces 'path' only when generation succeeds, so
+     readers never see a partial schema. STDOUT ('-') streams it to stdout.
+    :param path: Output file path or STDOUT
+    :param flush_size: Minimum number of characters written at once
+    :return: Writer for the schema
+    '''
+    if path == STDOUT:
+        with contextlib.closing(ChunkedWriter(sys.stdout, flush_size)) as w:
+            yield w
+        return
+
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f'.{name}.', suffix='.tmp', dir=directory
+    )
+    try:
+        with open(fd, 'w') as file, \
+                contextlib.closing(ChunkedWriter(file, flush_size)) as w:
+            yield w
+        os.chmod(temp_path, _new_file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
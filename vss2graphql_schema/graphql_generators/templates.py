@@ -10,76 +10,261 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import hashlib
 import os
+from typing import Any, Dict, List, Optional
 
-from pkg_resources import resource_stream
-
-from jinja2 import Environment, ChoiceLoader, FunctionLoader, FileSystemLoader
+import jinja2
+from jinja2 import (
+    BaseLoader, ChoiceLoader, Environment, FileSystemBytecodeCache,
+    FileSystemLoader, FunctionLoader, ModuleLoader
+)
 
 from vss2graphql_schema.graphql_generators.template_filters import all_filters
 
 templates_dir = os.path.join(os.path.dirname(__file__), 'templates')
+# Templates compiled into python modules when the package is built
+compiled_templates_dir = os.path.join(
+    os.path.dirname(__file__), 'compiled_templates'
+)
+JINJA_VERSION_FILE = 'jinja_version'
+# Digest of the package sources, written by the package build
+CODE_DIGEST_FILE = 'code_digest'
+_package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENVIRONMENT_OPTIONS: Dict[str, Any] = {
+    'trim_blocks': True,
+    'lstrip_blocks': True,
+    'keep_trailing_newline': True,
+}
 
 
 def load_template(
         name: str, module: str = 'vss2graphql_schema.graphql_generators',
         folder='templates'
-) -> str:
+) -> Optional[str]:
     '''
     Load template from 'templates' folder in module specified
     :param name: Name of the template
     :param module: Module to search
     :param folder: Folder inside module with desired template
-    :return: string with the template on it
+    :return: string with the template on it, None if it was not found
     '''
-    with resource_stream(module, os.path.join(folder, name)) as file:
-        return file.read().decode('utf-8')
-
+    try:
+        from importlib.resources import files
+    except ImportError:
+        # Python 3.8, templates are found by the FileSystemLoader
+        return None
 
-loader = ChoiceLoader([
-    FunctionLoader(load_template),
-    FileSystemLoader(templates_dir),
-])
+    try:
+        return files(module).joinpath(folder).joinpath(name).read_text(
+            encoding='utf-8'
+        )
+    except FileNotFoundError:
+        return None
 
 
-class Templates:
+def create_environment(
+        loader: BaseLoader,
+        bytecode_cache: Optional[FileSystemBytecodeCache] = None
+) -> Environment:
     '''
-    Templates class to handle jinja templates, environment, filters and
-     templates
+    :param loader: Loader of the templates
+    :param bytecode_cache: Cache of templates compiled from sources
+    :return: Environment with the options and filters of the templates
     '''
     env = Environment(
-        loader=loader,
-        trim_blocks=True,
-        lstrip_blocks=True,
-        keep_trailing_newline=True,
+        loader=loader, bytecode_cache=bytecode_cache, **ENVIRONMENT_OPTIONS
     )
-    # TODO: tests
     env.filters.update(all_filters)
+    return env
+
+
+def sources_digest(top: str) -> bytes:
+    '''
+    :param top: Directory with python files or templates
+    :return: Digest of the names and contents of the python files and
+     templates under 'top', but the compiled templates
+    '''
+    digest = hashlib.sha256()
+    for directory, dirs, files in os.walk(top):
+        dirs[:] = sorted(d for d in dirs if d != 'compiled_templates')
+        for name in sorted(files):
+            if name.endswith(('.py', '.jinja')):
+                with open(os.path.join(directory, name), 'rb') as file:
+                    digest.update(name.encode())
+                    digest.update(hashlib.sha256(file.read()).digest())
+    return digest.digest()
+
+
+def compile_templates(target: str) -> None:
+    '''
+    Compile the package templates into python modules, done by the package
+     build so processes do not compile them from source. The digest of the
+     package sources is saved along, so it is not computed by every run.
+    :param target: Directory to receive the modules, in the built package
+    :return: None
+    '''
+    env = create_environment(FileSystemLoader(templates_dir))
+    env.compile_templates(target, zip=None)
+    with open(os.path.join(target, JINJA_VERSION_FILE), 'w') as file:
+        file.write(jinja2.__version__)
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(target)))
+    with open(os.path.join(target, CODE_DIGEST_FILE), 'w') as file:
+        file.write(sources_digest(package_dir).hex())
+
+
+def package_digest() -> bytes:
+    '''
+    :return: Digest of the package sources, from the package build, or
+     computed from the sources when the package was not built
+    '''
+    try:
+        with open(
+                os.path.join(compiled_templates_dir, CODE_DIGEST_FILE)
+        ) as file:
+            return bytes.fromhex(file.read())
+    except (OSError, ValueError):
+        return sources_digest(_package_dir)
+
+
+def _compiled_templates_loader() -> Optional[ModuleLoader]:
+    '''
+    :return: Loader of the compiled templates, None if they were not built
+     or were compiled by another jinja2 version
+    '''
+    try:
+        with open(
+                os.path.join(compiled_templates_dir, JINJA_VERSION_FILE)
+        ) as file:
+            version = file.read()
+    except OSError:
+        return None
+    if version != jinja2.__version__:
+        return None
+    return ModuleLoader(compiled_templates_dir)
+
+
+def create_loader(custom_templates_dir: Optional[str] = None) -> ChoiceLoader:
+    '''
+    :param custom_templates_dir: Directory with templates that replace the
+     package ones
+    :return: Loader trying the custom templates, the compiled package
+     templates and then the package template sources
+    '''
+    loaders: List[BaseLoader] = []
+    if custom_templates_dir:
+        loaders.append(FileSystemLoader(custom_templates_dir))
+    compiled_loader = _compiled_templates_loader()
+    if compiled_loader:
+        loaders.append(compiled_loader)
+    loaders.extend([
+        FunctionLoader(load_template),
+        FileSystemLoader(templates_dir),
+    ])
+    return ChoiceLoader(loaders)
+
+
+loader = create_loader()
+
+
+class LazyTemplates(type):
+    '''
+    Metaclass compiling each template of Templates.names on its first use
+    '''
+    names: frozenset
+    env: Environment
+
+    def __getattr__(cls, name: str) -> jinja2.Template:
+        if name not in cls.names:
+            raise AttributeError(
+                f'type object {cls.__name__!r} has no attribute {name!r}'
+            )
+        template = cls.env.get_template(f'{name}.jinja')
+        setattr(cls, name, template)
+        return template
+
+
+class Templates(metaclass=LazyTemplates):
+    '''
+    Templates class to handle jinja templates, environment, filters and
+     templates. Templates are compiled when they are first used, e.g. in
+     Templates.type_open.
+    '''
+    # TODO: tests
+    env = create_environment(loader)
+    templates_dir: Optional[str] = None
+    bytecode_cache_dir: Optional[str] = None
 
     # keep sorted! -- do not break lines, it's easier to sort
-    custom_scalar_close = env.get_template('custom_scalar_close.jinja')
-    custom_scalar_entry = env.get_template('custom_scalar_entry.jinja')
-    custom_scalar_open = env.get_template('custom_scalar_open.jinja')
-    directive_close = env.get_template('directive_close.jinja')
-    directive_entry = env.get_template('directive_entry.jinja')
-    directive_open = env.get_template('directive_open.jinja')
-    enum_close = env.get_template('enum_close.jinja')
-    enum_entry = env.get_template('enum_entry.jinja')
-    enum_open = env.get_template('enum_open.jinja')
-    permission_enum = env.get_template('permission_enum.jinja')
-    input_close = env.get_template('input_close.jinja')
-    input_entry = env.get_template('input_entry.jinja')
-    input_open = env.get_template('input_open.jinja')
-    mutation_entry = env.get_template('mutation_entry.jinja')
-    mutation_open = env.get_template('mutation_open.jinja')
-    mutation_close = env.get_template('mutation_close.jinja')
-    query_close = env.get_template('query_close.jinja')
-    query_entry = env.get_template('query_entry.jinja')
-    query_open = env.get_template('query_open.jinja')
-    separator = env.get_template('separator.jinja')
-    subscription_close = env.get_template('subscription_close.jinja')
-    subscription_entry = env.get_template('subscription_entry.jinja')
-    subscription_open = env.get_template('subscription_open.jinja')
-    type_close = env.get_template('type_close.jinja')
-    type_entry = env.get_template('type_entry.jinja')
-    type_open = env.get_template('type_open.jinja')
+    names = frozenset((
+        'block',
+        'custom_scalar_close',
+        'custom_scalar_entry',
+        'custom_scalar_open',
+        'directive_close',
+        'directive_entry',
+        'directive_open',
+        'enum_close',
+        'enum_entry',
+        'enum_open',
+        'permission_enum',
+        'input_close',
+        'input_entry',
+        'input_open',
+        'mutation_entry',
+        'mutation_open',
+        'mutation_close',
+        'query_close',
+        'query_entry',
+        'query_open',
+        'separator',
+        'subscription_close',
+        'subscription_entry',
+        'subscription_open',
+        'type_close',
+        'type_entry',
+        'type_open',
+    ))
+
+    @classmethod
+    def configure(
+            cls, custom_templates_dir: Optional[str] = None,
+            bytecode_cache_dir: Optional[str] = None
+    ) -> None:
+        '''
+        Replace the environment, e.g. to use templates from another directory
+        :param custom_templates_dir: Directory with templates that replace the
+         package ones
+        :param bytecode_cache_dir: Directory caching the templates compiled
+         from sources, such as the custom ones
+        :return: None
+        '''
+        if (custom_templates_dir, bytecode_cache_dir) == (
+                cls.templates_dir, cls.bytecode_cache_dir
+        ):
+            return
+
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        cls.env = create_environment(
+            create_loader(custom_templates_dir), bytecode_cache
+        )
+        cls.templates_dir = custom_templates_dir
+        cls.bytecode_cache_dir = bytecode_cache_dir
+        for name in cls.names:
+            if name in cls.__dict__:
+                delattr(cls, name)
+
+    @classmethod
+    def is_custom(cls, file_name: str) -> bool:
+        '''
+        :param file_name: Template file name
+        :return: True if the template is replaced by a custom one
+        '''
+        return cls.templates_dir is not None and os.path.isfile(
+            os.path.join(cls.templates_dir, file_name)
+        )
@@ -0,0 +1,479 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import contextlib
+import time
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+    TextIO, Tuple, cast
+)
+
+# Allocation sites reported for each stage by --memory-report
+MEMORY_SITES = 5
+KIB = 1024
+
+
+class Memory(NamedTuple):
+    '''
+    Memory allocated in a stage, traced by tracemalloc, in bytes
+    '''
+    # Allocated at the peak of the stage, above what was allocated when it
+    #  started
+    peak: int
+    # Allocated in the stage and not freed by its end
+    retained: int
+    # Source lines, as "file:line", retaining the most memory
+    top: List[Tuple[str, int]]
+
+
+class MemoryStart(NamedTuple):
+    '''
+    Memory when a stage started, in bytes
+    '''
+    allocated: int
+    # Peak kept by tracemalloc
+    peak: int
+    # Memory allocated by each source line, when sites are reported
+    sites: Optional[Dict[str, int]]
+
+
+class Span(NamedTuple):
+    '''
+    Wall and CPU time of a stage of a run, and its memory while memory is
+     traced. Spans of stages inside another stage have a greater depth.
+    '''
+    name: str
+    # time.perf_counter() when the stage started
+    start: float
+    wall: float
+    cpu: float
+    depth: int
+    counts: Dict[str, int]
+    memory: Optional[Memory] = None
+
+
+SpanHook = Callable[[Span], None]
+
+# Receive every span of the process, in the order the spans end
+_span_hooks: List[SpanHook] = []
+_depth = 0
+# Allocation sites reported per stage, None when memory is not traced
+_memory_sites: Optional[int] = None
+# Peak allocated memory of each stage being measured, innermost last
+_memory_peaks: List[int] = []
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    '''
+    Starts sending the spans of the stages of the generation to hook
+    :param hook: Function receiving each span once its stage ends
+    :return: None
+    '''
+    _span_hooks.append(hook)
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    '''
+    :param hook: Function given to add_span_hook
+    :return: None
+    '''
+    _span_hooks.remove(hook)
+
+
+def spans_enabled() -> bool:
+    '''
+    :return: True if a hook receives spans. Counts that cost a walk of the
+     tree are only taken then.
+    '''
+    return bool(_span_hooks)
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[Dict[str, int]]:
+    '''
+    Measures the code in the 'with' block and sends its span to the hooks.
+     Nothing is measured when there are no hooks.
+    :param name: Stage name
+    :return: Counts of the span, e.g. of the nodes handled in the stage
+    '''
+    global _depth
+
+    counts: Dict[str, int] = {}
+    if not _span_hooks:
+        yield counts
+        return
+
+    # Taken before the times, snapshots of the allocations are slow
+    memory = memory_started(True) if _memory_sites is not None else None
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    _depth += 1
+    try:
+        yield counts
+    finally:
+        _depth -= 1
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - start_cpu
+        emit(Span(
+            name, start, wall, cpu, _depth, counts,
+            memory_ended(memory) if memory is not None else None,
+        ))
+
+
+@contextlib.contextmanager
+def traced_memory(sites: int = MEMORY_SITES) -> Iterator[None]:
+    '''
+    Traces the memory allocated in the 'with' block with tracemalloc. Spans
+     taken meanwhile have the memory of their stages.
+    :param sites: Allocation sites reported by the spans of span()
+    :return: None
+    '''
+    global _memory_sites
+
+    # Imported only when needed
+    import tracemalloc
+
+    tracemalloc.start()
+    _memory_sites = sites
+    try:
+        yield
+    finally:
+        _memory_sites = None
+        _memory_peaks.clear()
+        tracemalloc.stop()
+
+
+def memory_started(sites: bool) -> MemoryStart:
+    '''
+    Starts measuring the memory of a stage. tracemalloc keeps a single peak,
+     so the peak so far is kept for the enclosing stage before it is reset.
+     Python 3.8 can not reset it, the peak of a stage is then only known
+     when it is above the peak before the stage.
+    :param sites: Snapshot the allocations, to report the allocation sites
+    :return: Memory when the stage started
+    '''
+    # Imported only when needed
+    import tracemalloc
+
+    peak = tracemalloc.get_traced_memory()[1]
+    if _memory_peaks:
+        _memory_peaks[-1] = max(_memory_peaks[-1], peak)
+    allocated = allocation_sites() if sites else None
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    current, peak = tracemalloc.get_traced_memory()
+    _memory_peaks.append(current)
+    return MemoryStart(current, peak, allocated)
+
+
+def memory_ended(started: MemoryStart) -> Memory:
+    '''
+    :param started: Memory when the stage started
+    :return: Memory of the stage
+    '''
+    # Imported only when needed
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    peak = max(
+        _memory_peaks.pop(), peak if peak > started.peak else current
+    )
+    if _memory_peaks:
+        _memory_peaks[-1] = max(_memory_peaks[-1], peak)
+    top: List[Tuple[str, int]] = []
+    if started.sites is not None and _memory_sites:
+        grown = (
+            (site, size - started.sites.get(site, 0))
+            for site, size in allocation_sites().items()
+        )
+        top = sorted(
+            (x for x in grown if x[1] > 0), key=lambda x: x[1], reverse=True
+        )[:_memory_sites]
+        # The snapshot is not part of the enclosing stages
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+    return Memory(
+        peak - started.allocated, current - started.allocated, top
+    )
+
+
+def allocation_sites() -> Dict[str, int]:
+    '''
+    :return: Memory allocated by each source line, but for the snapshots
+    '''
+    # Imported only when needed
+    import tracemalloc
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    return {
+        f'{x.traceback[0].filename}:{x.traceback[0].lineno}': x.size
+        for x in snapshot.statistics('lineno')
+    }
+
+
+def emit(new_span: Span) -> None:
+    '''
+    Sends a span to the hooks
+    :param new_span: Span of a stage
+    :return: None
+    '''
+    for hook in list(_span_hooks):
+        hook(new_span)
+
+
+def replay(spans: Iterable[Span]) -> None:
+    '''
+    Sends spans taken by another process, e.g. a worker, to the hooks, as
+     stages inside the current stage
+    :param spans: Spans of the other process
+    :return: None
+    '''
+    for s in spans:
+        emit(s._replace(depth=s.depth + _depth))
+
+
+class Stopwatch:
+    '''
+    Sums the wall and CPU time of the 'with' blocks using it, e.g. of the
+     visits of a generator walking the tree along with other generators,
+     and their memory while memory is traced. Allocation sites are not
+     reported, snapshots on each block would be too slow.
+    '''
+    start: float
+    wall: float
+    cpu: float
+    # Memory of the blocks, while memory is traced
+    memory_peak: int
+    memory_retained: int
+
+    def __init__(self) -> None:
+        self.start = self.wall = self.cpu = 0.0
+        self.memory_peak = self.memory_retained = 0
+        self._started = self._started_cpu = 0.0
+        self._memory_started: Optional[MemoryStart] = None
+        self._memory_traced = False
+
+    def __enter__(self) -> 'Stopwatch':
+        if _memory_sites is not None:
+            self._memory_started = memory_started(False)
+            self._memory_traced = True
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        if not self.start:
+            self.start = self._started
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.wall += time.perf_counter() - self._started
+        self.cpu += time.process_time() - self._started_cpu
+        if self._memory_started is not None:
+            block = memory_ended(self._memory_started)
+            self.memory_peak = max(
+                self.memory_peak, self.memory_retained + block.peak
+            )
+            self.memory_retained += block.retained
+            self._memory_started = None
+
+    def emit(self, name: str, counts: Dict[str, int]) -> None:
+        '''
+        Sends the summed time to the hooks, as a stage inside the current
+         stage
+        :param name: Stage name
+        :param counts: Counts of the stage
+        :return: None
+        '''
+        memory = None
+        if self._memory_traced:
+            memory = Memory(self.memory_peak, self.memory_retained, [])
+        emit(Span(
+            name, self.start, self.wall, self.cpu, _depth, counts, memory
+        ))
+
+
+class Timings:
+    '''
+    Collects the spans of a run, reported with --timings
+    '''
+    spans: List[Span]
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def __call__(self, new_span: Span) -> None:
+        self.spans.append(new_span)
+
+    def add(
+            self, name: str, wall: float, cpu: float = 0.0,
+            start: float = 0.0
+    ) -> None:
+        '''
+        Adds a top level span measured without span(), e.g. the imports
+        :param name: Stage name
+        :param wall: Wall time of the stage
+        :param cpu: CPU time of the stage
+        :param start: time.perf_counter() when the stage started
+        :return: None
+        '''
+        self.spans.append(Span(name, start, wall, cpu, 0, {}))
+
+    @contextlib.contextmanager
+    def collect(self, isolated: bool = False) -> Iterator['Timings']:
+        '''
+        Collects the spans of the stages run in the 'with' block
+        :param isolated: The other hooks do not receive the spans meanwhile,
+         e.g. hooks inherited by a worker process, and the spans start again
+         at depth 0, without their memory
+        :return: These timings
+        '''
+        global _span_hooks, _depth, _memory_sites
+
+        saved = _span_hooks, _depth, _memory_sites
+        _span_hooks = [self] if isolated else [*saved[0], self]
+        if isolated:
+            _depth, _memory_sites = 0, None
+        try:
+            yield self
+        finally:
+            _span_hooks, _depth, _memory_sites = saved
+
+    def ordered(self) -> List[Span]:
+        '''
+        Spans are taken when their stages end, after the stages inside them.
+         Spans replayed from workers overlap, so they are not sorted by start
+         only: each span is followed by the spans inside it.
+        :return: Spans in the order their stages started, depth first
+        '''
+        # Spans taken so far at each depth, with the spans inside them
+        pending: Dict[int, List[Tuple[Span, List]]] = {}
+        for s in self.spans:
+            inside = pending.pop(s.depth + 1, [])
+            pending.setdefault(s.depth, []).append((s, inside))
+
+        ordered: List[Span] = []
+
+        def flatten(spans: List[Tuple[Span, List]]) -> None:
+            for s, inside in sorted(spans, key=lambda x: x[0].start):
+                ordered.append(s)
+                flatten(inside)
+
+        for depth in sorted(pending):
+            flatten(pending[depth])
+        return ordered
+
+    def report(self, output: TextIO) -> None:
+        '''
+        Writes one line per span and the total of the top level spans, in
+         milliseconds, with the counts of each span
+        :param output: File to receive the report
+        :return: None
+        '''
+        top = [s for s in self.spans if s.depth == 0]
+        rows = [
+            (f'{"  " * s.depth}{s.name}', s.wall, s.cpu, s.counts)
+            for s in self.ordered()
+        ]
+        rows.append((
+            'total', sum(s.wall for s in top), sum(s.cpu for s in top), {}
+        ))
+        width = max(len(name) for name, _, _, _ in rows)
+        output.write(f'{"":<{width}} {"wall":>13} {"cpu":>13}\n')
+        for name, wall, cpu, counts in rows:
+            line = (
+                f'{name:<{width}} {wall * 1000:10.1f} ms {cpu * 1000:10.1f} ms'
+            )
+            if counts:
+                line += '  ' + ', '.join(f'{k} {v}' for k, v in counts.items())
+            output.write(line + '\n')
+
+    def memory_report(self, output: TextIO) -> None:
+        '''
+        Writes one line per span with memory, in KiB, followed by the
+         allocation sites retaining the most memory in its stage
+        :param output: File to receive the report
+        :return: None
+        '''
+        spans = [s for s in self.ordered() if s.memory is not None]
+        if not spans:
+            return
+        width = max(len(s.name) + 2 * s.depth for s in spans)
+        output.write(f'{"":<{width}} {"peak":>16} {"retained":>16}\n')
+        for s in spans:
+            memory = cast(Memory, s.memory)
+            output.write(
+                f'{"  " * s.depth + s.name:<{width}} '
+                f'{memory.peak / KIB:12.1f} KiB {memory.retained / KIB:12.1f}'
+                ' KiB\n'
+            )
+            for site, size in memory.top:
+                output.write(
+                    f'{"  " * (s.depth + 1)}{size / KIB:10.1f} KiB  {site}\n'
+                )
+
+    def to_json(self) -> Dict[str, Any]:
+        '''
+        :return: Spans in the order their stages started and the total of the
+         top level spans, in seconds. Memory is in bytes.
+        '''
+        top = [s for s in self.spans if s.depth == 0]
+        return {
+            'spans': [
+                {
+                    'name': s.name, 'depth': s.depth, 'wall': s.wall,
+                    'cpu': s.cpu, 'counts': s.counts,
+                    **({} if s.memory is None else {'memory': {
+                        'peak': s.memory.peak,
+                        'retained': s.memory.retained,
+                        'top': [
+                            {'site': site, 'size': size}
+                            for site, size in s.memory.top
+                        ],
+                    }}),
+                } for s in self.ordered()
+            ],
+            'total': {
+                'wall': sum(s.wall for s in top),
+                'cpu': sum(s.cpu for s in top),
+            },
+        }
+
+    def dump_json(self, output: TextIO) -> None:
+        '''
+        :param output: File to receive the spans as JSON
+        :return: None
+        '''
+        # Imported only when needed
+        import json
+
+        json.dump(self.to_json(), output, indent=2)
+        output.write('\n')
+
+
+@contextlib.contextmanager
+def profiled(file: str) -> Iterator[None]:
+    '''
+    Profiles the block with cProfile
+    :param file: File to receive the stats, to be read with pstats
+    :return: None
+    '''
+    # Imported only when needed
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(file)
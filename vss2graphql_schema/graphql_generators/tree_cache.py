@@ -0,0 +1,301 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import warnings
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING, BinaryIO, Generic, Iterable, Iterator, List, Optional, Set,
+    Tuple, Type, TypeVar
+)
+
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
+# Bump when the cached data changes
+CACHE_FORMAT = 1
+DEFAULT_CACHE_SIZE = 256 << 20
+INCLUDE_PATTERN = re.compile(r'^#include\s+(\S+)', re.MULTILINE)
+
+TValue = TypeVar('TValue')
+
+
+def default_cache_dir() -> str:
+    '''
+    :return: $XDG_CACHE_HOME/vss2graphql_schema, or ~/.cache as base
+    '''
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(base, 'vss2graphql_schema')
+
+
+def _vss_tools_version() -> str:
+    '''
+    :return: Version of vss-tools, the loaded nodes depend on it
+    '''
+    # Imported only when needed, they are slow to import
+    from importlib import metadata
+
+    import vspec
+
+    try:
+        return metadata.version('vss-tools')
+    except metadata.PackageNotFoundError:
+        return str(os.stat(vspec.__file__).st_mtime_ns)
+
+
+def _include_candidates(
+        name: str, including_dir: str, include_dirs: Iterable[str]
+) -> List[str]:
+    '''
+    Every existing file an '#include' may resolve to. All of them are part
+     of the key, so it does not depend on the search order of vss-tools.
+    :param name: File name in the '#include' line
+    :param including_dir: Directory of the file with the '#include'
+    :param include_dirs: Include directories
+    :return: Paths of the candidates
+    '''
+    if os.path.isabs(name):
+        return [name] if os.path.isfile(name) else []
+    return [
+        path for path in (
+            os.path.join(d, name) for d in [including_dir, *include_dirs]
+        ) if os.path.isfile(path)
+    ]
+
+
+def include_closure(
+        vspec_file: str, include_dirs: Iterable[str]
+) -> Iterator[Tuple[str, bytes, List[Tuple[str, List[str]]]]]:
+    '''
+    Walks the root vspec and every file it may include
+    :param vspec_file: Root vspec file
+    :param include_dirs: Include directories
+    :return: Path and content of each file, with the candidates of each of
+     its '#include' lines
+    '''
+    include_dirs = list(include_dirs)
+    visited: Set[str] = set()
+    # vss-tools looks for the root file in the include directories too
+    pending = _include_candidates(vspec_file, '', include_dirs)[::-1]
+    while pending:
+        path = pending.pop()
+        real_path = os.path.realpath(path)
+        if real_path in visited:
+            continue
+        visited.add(real_path)
+
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        including_dir = os.path.dirname(path)
+        includes = [
+            (name, _include_candidates(name, including_dir, include_dirs))
+            for name in INCLUDE_PATTERN.findall(
+                content.decode('utf-8', 'replace')
+            )
+        ]
+        yield path, content, includes
+        for _, candidates in includes:
+            pending.extend(reversed(candidates))
+
+
+def tree_key(
+        vspec_file: str, include_dirs: Iterable[str], merge_private: bool
+) -> str:
+    '''
+    Content hash of the root vspec and of every file it includes
+    :param vspec_file: Root vspec file
+    :param include_dirs: Include directories
+    :param merge_private: Flag sent to vspec.load_tree
+    :return: Hex digest identifying the loaded tree
+    '''
+    key = hashlib.sha256(
+        f'{CACHE_FORMAT}\0{_vss_tools_version()}\0{merge_private}\0'.encode()
+    )
+    for _, content, includes in include_closure(vspec_file, include_dirs):
+        key.update(hashlib.sha256(content).digest())
+        for name, candidates in includes:
+            key.update(f'{name}\0{len(candidates)}\0'.encode())
+    return key.hexdigest()
+
+
+class FileCache(Generic[TValue], ABC):
+    '''
+    On-disk cache with one file per entry, named after its key. The least
+     recently used entries are removed when the files of the cache grow over
+     'max_size' bytes. Subclasses define how entries are read and written.
+    '''
+    SUFFIX = '.cache'
+    # Errors of missing, unreadable or outdated entries
+    READ_ERRORS: Tuple[Type[Exception], ...] = (OSError,)
+    WRITE_ERRORS: Tuple[Type[Exception], ...] = (OSError,)
+    directory: str
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(
+            self, directory: Optional[str] = None,
+            max_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        '''
+        :param directory: Cache directory, default_cache_dir() if None
+        :param max_size: Maximum size of the entries in bytes
+        '''
+        self.directory = directory if directory else default_cache_dir()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}{self.SUFFIX}')
+
+    @abstractmethod
+    def read(self, file: BinaryIO) -> TValue:
+        '''
+        :param file: Entry file
+        :return: Cached value
+        '''
+
+    @abstractmethod
+    def write(self, file: BinaryIO, value: TValue) -> None:
+        '''
+        :param file: Entry file
+        :param value: Value to cache
+        :return: None
+        '''
+
+    def load(self, key: str) -> Optional[TValue]:
+        '''
+        :param key: Entry key
+        :return: Cached value, None if there is none
+        '''
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                value = self.read(file)
+            # Access time is not reliable, mtime tracks the use for eviction
+            os.utime(path)
+        except self.READ_ERRORS:
+            # Missing, unreadable or outdated entry, it will be replaced
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def store(self, key: str, value: TValue) -> None:
+        '''
+        Writes the entry atomically, so concurrent runs may share the cache
+        :param key: Entry key
+        :param value: Value to cache
+        :return: None
+        '''
+        if self.store_entry(key, value):
+            self.evict()
+
+    def store_entry(self, key: str, value: TValue) -> bool:
+        '''
+        Writes the entry atomically, without evicting other entries
+        :param key: Entry key
+        :param value: Value to cache
+        :return: True if the entry was stored
+        '''
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            try:
+                with open(fd, 'wb') as file:
+                    self.write(file, value)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                # No temporary file is left behind, even on interrupts
+                os.unlink(temp_path)
+                raise
+        except self.WRITE_ERRORS as e:
+            warnings.warn(f'{type(self).__name__} entry not stored: {e}')
+            return False
+        return True
+
+    def evict(self) -> None:
+        '''
+        Removes least recently used entries until the cache fits max_size
+        :return: None
+        '''
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.SUFFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class TreeCache(FileCache['VSSNode']):
+    '''
+    On-disk cache of trees loaded by vspec.load_tree, stored as pickles.
+    Hits skip the YAML parsing.
+    '''
+    SUFFIX = '.tree.pickle'
+    READ_ERRORS = (
+        OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError
+    )
+    WRITE_ERRORS = (OSError, pickle.PicklingError, RecursionError)
+
+    def read(self, file: BinaryIO) -> 'VSSNode':
+        return pickle.load(file)
+
+    def write(self, file: BinaryIO, value: 'VSSNode') -> None:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_tree_cached(
+        vspec_file: str, include_dirs: List[str], merge_private: bool,
+        cache: Optional[TreeCache]
+) -> 'VSSNode':
+    '''
+    vspec.load_tree, reading the tree from 'cache' when it is there
+    :param vspec_file: Root vspec file
+    :param include_dirs: Include directories
+    :param merge_private: Flag sent to vspec.load_tree
+    :param cache: Tree cache, None to always load the tree
+    :return: Root node
+    '''
+    import vspec
+
+    if cache is None:
+        return vspec.load_tree(
+            vspec_file, include_dirs, merge_private=merge_private
+        )
+
+    key = tree_key(vspec_file, include_dirs, merge_private)
+    root = cache.load(key)
+    if root is None:
+        root = vspec.load_tree(
+            vspec_file, include_dirs, merge_private=merge_private
+        )
+        cache.store(key, root)
+    return root
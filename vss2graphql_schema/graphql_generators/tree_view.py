@@ -0,0 +1,122 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+from collections import deque
+from typing import (
+    TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence
+)
+
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+    from .node_facts import NodeFacts
+
+
+class VSSTreeView:
+    '''
+    Filtered and sorted view of a VSS tree, which leaves the tree unchanged,
+     so several views may be taken from one loaded tree. Only the child lists
+     that differ from the tree are kept by the view, the other nodes share
+     their children with the tree. A node is in the view when it is reached
+     from the roots through those child lists.
+    '''
+    roots: List['VSSNode']
+    changed_children: Dict['VSSNode', Sequence['VSSNode']]
+    _facts: Optional['NodeFacts']
+
+    def __init__(
+            self, roots: Iterable['VSSNode'],
+            changed_children: Optional[
+                Dict['VSSNode', Sequence['VSSNode']]
+            ] = None
+    ) -> None:
+        '''
+        :param roots: Roots of the view
+        :param changed_children: Children in the view of the nodes whose
+         children differ from the tree
+        '''
+        self.roots = list(roots)
+        self.changed_children = changed_children if changed_children else {}
+        self._facts = None
+
+    def __iter__(self) -> Iterator['VSSNode']:
+        return iter(self.roots)
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    def children(self, node: 'VSSNode') -> Sequence['VSSNode']:
+        '''
+        :param node: Node of the view
+        :return: Children of the node in the view
+        '''
+        return self.changed_children.get(node, node.children)
+
+    def level_order(self) -> Iterator['VSSNode']:
+        '''
+        Walk each root in level order, as anytree.LevelOrderIter does
+        :return: Next node of the view
+        '''
+        changed_children = self.changed_children
+        for root in self.roots:
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                yield node
+                queue.extend(changed_children.get(node, node.children))
+
+    def facts(self) -> 'NodeFacts':
+        '''
+        :return: Facts of the nodes of the view, shared by the generators
+         of the view
+        '''
+        if self._facts is None:
+            # Imported here, node_facts imports this module
+            from .node_facts import NodeFacts
+            self._facts = NodeFacts(self)
+        return self._facts
+
+    def count_nodes(self) -> int:
+        '''
+        :return: Number of nodes in the view
+        '''
+        return sum(1 for _ in self.level_order())
+
+    def apply(self) -> None:
+        '''
+        Changes the tree to match the view. Assigning node.children would
+         detach and attach again every child, and anytree copies the children
+         list on each detach, so it is assigned only when the kept children
+         are reordered. Otherwise only the removed children are detached.
+        :return: None
+        '''
+        for node, kept in self.changed_children.items():
+            kept_nodes = set(kept)
+            children = node.children
+            remaining = [x for x in children if x in kept_nodes]
+            if any(x is not y for x, y in zip(kept, remaining)):
+                node.children = kept
+                continue
+            for x in children:
+                if x not in kept_nodes:
+                    x.parent = None
+        self.changed_children = {}
+        self._facts = None
+
+
+def tree_view(vss_roots: Iterable['VSSNode']) -> VSSTreeView:
+    '''
+    :param vss_roots: A view, or roots of trees
+    :return: The view, or a view of the whole trees
+    '''
+    if isinstance(vss_roots, VSSTreeView):
+        return vss_roots
+    return VSSTreeView(vss_roots)
@@ -10,17 +10,13 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import functools
+import inspect
 import re
-from typing import Optional, TextIO, Sequence, Union
-
-import yaml
-
-import yamlinclude
-
-from anytree import LevelOrderIter
-
-from vspec import VSSNode
-from vspec.model.vsstree import VSSType
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, TextIO,
+    Tuple, TypeVar, Union, cast
+)
 
 from .constants import (
     VSS_GQL_TYPE_MAPPING, VSS_GQL_CUSTOM_TYPE_MAPPING,
@@ -30,14 +26,103 @@ from .model.description import Description
 from .model.directive_call import RangeDirective, DeprecatedDirective, \
     HasPermissionsDirective, Permission
 
-READER_TABLE = [
-    (re.compile(r'^.+\.depl$', re.IGNORECASE), yamlinclude.YamlReader),
-]
-''
+if TYPE_CHECKING:
+    from vspec import VSSNode
+
 NON_UPPERCASE = re.compile(r'[^A-Z]')
 LOWER_CAMEL_CASE = re.compile(r'[\-_.\s]([a-z])')
 NON_ALPHANUMERIC_WORD = re.compile('[^A-Za-z0-9]+')
 
+# Separators in use by the generators, in the order they are stored in the
+# qualified name index
+QUALIFIED_NAME_SEPARATORS: Tuple[str, ...] = ('_', '.', '')
+_SEPARATOR_POSITION = {
+    sep: i for i, sep in enumerate(QUALIFIED_NAME_SEPARATORS)
+}
+_qualified_names: Dict['VSSNode', Tuple[str, ...]] = {}
+# Values of each memoized function by flags and node
+_node_memos: List[Dict[Any, Any]] = []
+_MISSING = object()
+
+TFunction = TypeVar('TFunction', bound=Callable[..., Any])
+
+
+def index_qualified_names(roots: Iterable['VSSNode']) -> None:
+    '''
+    Build the qualified name index for every node under roots in a single
+     pre-order pass, replacing the previous index. Names are built from the
+     parent names instead of walking parent pointers for each node.
+    :param roots: Roots of the loaded VSS tree
+    :return: None
+    '''
+    _qualified_names.clear()
+    # Memoized values belong to the nodes of the previous index
+    for memo in _node_memos:
+        memo.clear()
+    for root in roots:
+        _qualified_names[root] = tuple(
+            root.qualified_name(sep) for sep in QUALIFIED_NAME_SEPARATORS
+        )
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            names = _qualified_names[node]
+            children = node.children
+            for child in children:
+                _qualified_names[child] = tuple(
+                    name + sep + child.name
+                    for name, sep in zip(names, QUALIFIED_NAME_SEPARATORS)
+                )
+            stack.extend(reversed(children))
+
+
+def memoized(function: TFunction) -> TFunction:
+    '''
+    Memoizes a function of a node and of hashable flags until the next
+     index_qualified_names. The generators then share the values built for a
+     node, which must not be changed by them. Arguments may be passed by
+     keyword or left to their defaults, calls with the same values share
+     their value.
+    :param function: Function to memoize
+    :return: Memoized function
+    '''
+    signature = inspect.signature(function)
+    arity = len(signature.parameters)
+    # Values by node, by flags, so that no key is built for each node
+    memos: Dict[Tuple[Any, ...], Dict['VSSNode', Any]] = {}
+    _node_memos.append(memos)
+
+    @functools.wraps(function)
+    def memoized_function(*args: Any, **keywords: Any) -> Any:
+        if keywords or len(args) != arity:
+            # Keywords and defaults are bound to the positions of the flags
+            bound = signature.bind(*args, **keywords)
+            bound.apply_defaults()
+            args = tuple(bound.arguments.values())
+        flags = args[1:]
+        memo = memos.get(flags)
+        if memo is None:
+            memo = memos[flags] = {}
+        node = args[0]
+        value = memo.get(node, _MISSING)
+        if value is _MISSING:
+            value = memo[node] = function(*args)
+        return value
+    return cast(TFunction, memoized_function)
+
+
+def qualified_name(node: 'VSSNode', separator: str = '_') -> str:
+    '''
+    :param node: Node to get qualified name
+    :param separator: Separator between the path elements
+    :return: The qualified name from the index, falling back to
+     node.qualified_name() for nodes that were not indexed
+    '''
+    names = _qualified_names.get(node)
+    if names is None or separator not in _SEPARATOR_POSITION:
+        return node.qualified_name(separator)
+    return names[_SEPARATOR_POSITION[separator]]
+
 
 def to_lower_camel_case(field: str) -> str:
     '''
@@ -77,39 +162,39 @@ def str_as_uppercase_variable(word: str) -> str:
     return str_as_variable(word).upper()
 
 
-def get_enum_name(node: VSSNode):
+def get_enum_name(node: 'VSSNode'):
     '''
     :param node: Node to get enum name
     :return: A string with the standard enum name for the node entered.
     '''
-    return node.qualified_name('_') + '_Enum'
+    return qualified_name(node) + '_Enum'
 
 
-def get_input_name(node: VSSNode):
+def get_input_name(node: 'VSSNode'):
     '''
     :param node: Node to get input name
     :return: A string with the standard input name for the node entered.
     '''
-    return node.qualified_name('_') + '_Input'
+    return qualified_name(node) + '_Input'
 
 
-def get_mutation_name(node: VSSNode):
+def get_mutation_name(node: 'VSSNode'):
     '''
     :param node: Node to get mutation name
     :return: A string with the standard mutation name for the node entered.
     '''
-    return 'set' + node.qualified_name('')
+    return 'set' + qualified_name(node, '')
 
 
-def get_type_name(node: VSSNode):
+def get_type_name(node: 'VSSNode'):
     '''
     :param node: Node to get type name
     :return: A string with the standard type name for the node entered.
     '''
-    return node.qualified_name('_')
+    return qualified_name(node)
 
 
-def node_has_enum(node: VSSNode) -> bool:
+def node_has_enum(node: 'VSSNode') -> bool:
     '''
     :param node: Node to check enum
     :return: True if node has VSS enum.
@@ -118,7 +203,7 @@ def node_has_enum(node: VSSNode) -> bool:
 
 
 def get_field_type(
-        node: VSSNode, custom_scalars: bool = False, enums: bool = False
+        node: 'VSSNode', custom_scalars: bool = False, enums: bool = False
 ) -> str:
     '''
     :param node: Node to check type
@@ -134,13 +219,14 @@ def get_field_type(
     if enums and node_has_enum(node):
         return get_enum_name(node)
     if node.type in VSS_BRANCH_TYPES:
-        return node.qualified_name('_')
+        return qualified_name(node)
     else:
         return type_mapping[node.data_type]
 
 
+@memoized
 def get_node_description(
-    node: VSSNode, print_enum: bool = False
+    node: 'VSSNode', print_enum: bool = False
 ) -> Description:
     '''
     :param node: Node to get description
@@ -173,7 +259,7 @@ def get_node_description(
 
 def str_to_float_or_int(
     value: str,
-    node: VSSNode
+    node: 'VSSNode'
 ) -> Optional[Union[float, int]]:
     if value == '':
         return None
@@ -183,7 +269,8 @@ def str_to_float_or_int(
         return float(value)
 
 
-def get_range_directive(node: VSSNode) -> Optional[RangeDirective]:
+@memoized
+def get_range_directive(node: 'VSSNode') -> Optional[RangeDirective]:
     '''
     Generate a RangeDirective from a node
     :param node: Node to check directive
@@ -198,25 +285,30 @@ def get_range_directive(node: VSSNode) -> Optional[RangeDirective]:
     return None
 
 
+@memoized
 def get_has_permission_directive(
-        node: VSSNode, permissions: Sequence[Permission],
+        node: 'VSSNode', permissions: Tuple[Permission, ...],
 ) -> HasPermissionsDirective:
     def pname(x: Permission) -> str:
-        return node.qualified_name('.') + '_' + x
+        return qualified_name(node, '.') + '_' + x
 
     return HasPermissionsDirective(permissions, pname)
 
 
+@memoized
 def get_subscription_has_permission_directive(
-        node: VSSNode, permissions: Sequence[Permission],
+        node: 'VSSNode', permissions: Tuple[Permission, ...],
 ) -> HasPermissionsDirective:
     def pname(x: Permission) -> str:
-        return 'Subscription.' + node.qualified_name('.') + '.' + x
+        return 'Subscription.' + qualified_name(node, '.') + '.' + x
 
     return HasPermissionsDirective(permissions, pname)
 
 
-def get_deprecation_directive(node: VSSNode) -> Optional[DeprecatedDirective]:
+@memoized
+def get_deprecation_directive(
+        node: 'VSSNode'
+) -> Optional[DeprecatedDirective]:
     '''
     Generate DeprecationDirective from the string node.directive
     :param node: Node to get directive
@@ -227,29 +319,6 @@ def get_deprecation_directive(node: VSSNode) -> Optional[DeprecatedDirective]:
     return None
 
 
-def sort_children(root: VSSNode) -> None:
-    '''
-    Sort children on every node
-    :param root: Tree root to sort children
-    :return: None
-    '''
-    for node in LevelOrderIter(root):
-        node.children = sorted(
-            node.children, key=lambda x: x.qualified_name('_'),
-        )
-
-
-def node_has_child_actuator(node: VSSNode) -> bool:
-    '''
-    :param node: Node to check
-    :return: True if one of node's children has an actuator
-    '''
-    for child in node.children:
-        if child.type == VSSType.ACTUATOR:
-            return True
-    return False
-
-
 def load_yaml(root_file: TextIO, base_dir: str) -> dict:
     '''
      :param root_file: TextIOWrapper
@@ -261,9 +330,10 @@ def load_yaml(root_file: TextIO, base_dir: str) -> dict:
      :return: dict
             Nested dictionary with the data of the parsed layer files.
     '''
-    yamlinclude.YamlIncludeConstructor.add_to_loader_class(
-        loader_class=yaml.FullLoader,
-        base_dir=base_dir,
-        reader_map=READER_TABLE
+    # Only needed with a layer, so they are not imported at startup
+    import yaml
+    from .depl_loader import depl_loader_class, resolve_includes
+
+    return resolve_includes(
+        yaml.load(root_file, Loader=depl_loader_class()), base_dir
     )
-    return yaml.load(root_file, Loader=yaml.FullLoader)
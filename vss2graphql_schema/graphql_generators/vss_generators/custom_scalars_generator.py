@@ -43,4 +43,4 @@ class CustomScalarsGenerator(CommonGenerator):
             CustomScalarDeclaration(ct, None)
             for ct in VSS_CUSTOM_SCALARS_MAPPING.values()
         ]
-        CustomScalarsEmitter(self.output, self.name, custom_types).emit_all()
+        self.emitter(self.output, self.name, custom_types).emit_all()
@@ -15,6 +15,7 @@ from typing import TextIO, List
 
 from ..common_generator import CommonGenerator
 from ..emitters.directive_emitter import DirectiveEmitter
+from ..introspection import INTROSPECTION, PERMISSION_POLICY_TYPE, type_text
 from ..model.directive_declaration import (
     DirectiveDeclaration, RangeDirectiveDeclaration,
     HasPermissionDirectiveDeclaration,
@@ -32,20 +33,33 @@ class DirectiveGenerator(CommonGenerator):
             output, 'directive', DirectiveEmitter, args
         )
 
-    def generate(self) -> None:
+    @staticmethod
+    def declarations(args: argparse.Namespace) -> List[DirectiveDeclaration]:
+        '''
+        :param args: Arguments from argparse in standard call
+        :return: Directives declared by the schema
+        '''
         directives: List[DirectiveDeclaration] = []
 
-        if self.args.range_directive:
+        if args.range_directive:
             directives.append(RangeDirectiveDeclaration())
 
-        if self.args.permission_directive:
+        if args.permission_directive:
             directives.append(HasPermissionDirectiveDeclaration())
 
+        return directives
+
+    def generate(self) -> None:
+        directives = self.declarations(self.args)
+
         if directives:
             self.emit_separator()
 
             if self.args.permission_directive:
-                template = getattr(Templates, 'permission_enum')
-                template.stream().dump(self.output)
+                if self.output_format == INTROSPECTION:
+                    self.output.write(type_text(PERMISSION_POLICY_TYPE))
+                else:
+                    template = getattr(Templates, 'permission_enum')
+                    template.stream().dump(self.output)
 
-            DirectiveEmitter(self.output, self.name, directives).emit_all()
+            self.emitter(self.output, self.name, directives).emit_all()
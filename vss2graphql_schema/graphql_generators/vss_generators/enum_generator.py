@@ -19,6 +19,7 @@ from .vss_generator import VSSLeafGenerator
 from ..emitters.enum_emitter import EnumFieldEmitter
 from ..model.enum_field import EnumField
 from ..model.description import Description
+from ..node_facts import NodeFacts
 from ..util import (str_as_uppercase_variable, node_has_enum,
                     get_enum_name, get_node_description)
 
@@ -35,6 +36,9 @@ class EnumGenerator(VSSLeafGenerator):
     ) -> None:
         super().__init__(output, 'enum', EnumFieldEmitter, node, args)
 
+    def selection(self, facts: NodeFacts) -> bytes:
+        return facts.has_enum
+
     def _get_entries(self, node: VSSNode) -> List[EnumField]:
         '''
         Entry from node.enum split
@@ -16,14 +16,14 @@ from typing import TextIO, Iterable, List, Mapping, Any
 from vspec.model.vsstree import VSSNode, VSSType
 
 from .vss_generator import VSSLeafGenerator
+from ..node_facts import NodeFacts
 from ..emitters.input_emitter import InputEmitter
-from ..model.directive_call import DirectiveCall, Permission, \
-    HasPermissionsDirective
+from ..model.directive_call import DirectiveCall
 from ..model.field import Field
 from ..model.parameter import Parameter
 from ..util import (
     to_lower_camel_case, get_field_type, get_node_description,
-    get_range_directive, get_input_name,
+    get_range_directive, get_input_name, get_has_permission_directive,
 )
 
 
@@ -39,6 +39,9 @@ class InputGenerator(VSSLeafGenerator):
             output, 'input', InputEmitter, vss_roots, args
         )
 
+    def selection(self, facts: NodeFacts) -> bytes:
+        return facts.has_actuator_child
+
     def _get_entries(self, node: VSSNode) -> List[Field]:
         '''
         Generate entry for each node child that has type VSSType.ACTUATOR
@@ -46,7 +49,7 @@ class InputGenerator(VSSLeafGenerator):
         :return: List of fields from children with type VSSType.ACTUATOR
         '''
         input_declarations = []
-        for child in node.children:
+        for child in self.tree.children(node):
             if child.type == VSSType.ACTUATOR:
                 input_declarations.append(self.field_from_vss_node(
                     child, custom_scalars=self.args.custom_scalars,
@@ -82,9 +85,9 @@ class InputGenerator(VSSLeafGenerator):
                 directives.append(range_directive)
 
         if has_has_permission_directive:
-            def pname(x: Permission) -> str:
-                return vss_node.qualified_name('.') + '_' + x
-            directives.append(HasPermissionsDirective(['WRITE'], pname))
+            directives.append(
+                get_has_permission_directive(vss_node, ('WRITE',))
+            )
 
         parameters: List[Parameter] = []
 
@@ -11,17 +11,16 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-from typing import TextIO, Iterable, List, Dict
+from typing import TextIO, Iterable, List
 
-from anytree import LevelOrderIter
-
-from vspec.model.vsstree import VSSNode, VSSType
+from vspec.model.vsstree import VSSNode
 
 from .vss_generator import VSSRootsGenerator
 from ..emitters.mutation_emitter import MutationEmitter
 from ..model.directive_call import DirectiveCall
 from ..model.field import Field
 from ..model.parameter import Parameter
+from ..node_facts import NodeFacts
 from ..util import get_input_name, get_mutation_name, get_type_name, \
     get_node_description
 
@@ -31,6 +30,9 @@ class MutationGenerator(VSSRootsGenerator):
     Generate GraphQL Mutations for each branch that has one or more actuators
      as children.
     '''
+    visits_nodes = True
+    mutations: List[Field]
+
     def __init__(
             self, output: TextIO, vss_roots: Iterable[VSSNode],
             args: argparse.Namespace
@@ -42,23 +44,25 @@ class MutationGenerator(VSSRootsGenerator):
         super(MutationGenerator, self).__init__(
             output, 'mutation', MutationEmitter, vss_roots, args
         )
+        self.mutations = []
+
+    def selection(self, facts: NodeFacts) -> bytes:
+        return facts.has_actuator_child
+
+    def visit(self, node: VSSNode) -> None:
+        '''
+        Create the mutation of a node with actuators in its children
+        :param node: a VSSNode
+        :return: None
+        '''
+        self.mutations.append(self.field_from_vss_node(node, self.args.enums))
 
     def _get_entries(self, roots: Iterable[VSSNode]) -> List[Field]:
         '''
-        Look for actuators in children and if there is one, create the mutation
-        for that node.
         :param roots: all roots from vss
-        :return: list of fields in mutation
+        :return: list of fields in mutation, in level order
         '''
-        mutations: Dict[str, Field] = {}
-        for r in roots:
-            for node in LevelOrderIter(r):
-                if (node.type == VSSType.ACTUATOR and node.parent is not None
-                        and node.parent.qualified_name('_') not in mutations):
-                    mutations[node.parent.qualified_name('_')] = \
-                        self.field_from_vss_node(node.parent, self.args.enums)
-
-        return list(mutations.values())
+        return self.mutations
 
     @staticmethod
     def field_from_vss_node(vss_node: VSSNode, enums: bool = True) -> Field:
@@ -11,7 +11,7 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-from typing import TextIO, Iterable, List, Iterator
+from typing import TextIO, Iterable, List
 
 from vspec.model.vsstree import VSSNode
 
@@ -39,14 +39,6 @@ class QueryGenerator(VSSRootsGenerator):
             output, 'query', QueryEmitter, vss_roots, args
         )
 
-    def __iter__(self) -> Iterator[Iterable[VSSNode]]:
-        '''
-        Default iteration for Query is to get all roots, since there is only
-        one query on schema.
-        :return: the roots
-        '''
-        yield self.vss_roots
-
     def _get_entries(self, roots: Iterable[VSSNode]) -> List[Field]:
         return [
             QueryGenerator.field_from_vss_node(r) for r in roots
@@ -84,7 +84,7 @@ class SubscriptionGenerator(VSSRootsGenerator):
 
                 has_permission_directive = \
                     get_subscription_has_permission_directive(
-                        vss_node, ['DELIVERY_INTERVAL_1_SECOND', 'REALTIME']
+                        vss_node, ('DELIVERY_INTERVAL_1_SECOND', 'REALTIME')
                     )
                 if has_permission_directive:
                     directives.append(has_permission_directive)
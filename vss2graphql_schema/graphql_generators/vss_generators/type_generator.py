@@ -21,6 +21,7 @@ from ..emitters.type_field_emitter import TypeFieldEmitter
 from ..model.directive_call import DirectiveCall
 from ..model.field import Field
 from ..model.parameter import Parameter
+from ..node_facts import NodeFacts
 from ..util import (
     to_lower_camel_case, get_field_type, get_node_description,
     get_range_directive, get_deprecation_directive, get_type_name,
@@ -48,6 +49,9 @@ class TypeGenerator(VSSLeafGenerator):
             output, 'type', TypeFieldEmitter, vss_roots, args
         )
 
+    def selection(self, facts: NodeFacts) -> bytes:
+        return facts.has_children
+
     def _get_entries(self, node: VSSNode) -> List[Field]:
         '''
         Get fields from each node.
@@ -55,7 +59,7 @@ class TypeGenerator(VSSLeafGenerator):
         :return: List of fields that will be included in GraphQL type
         '''
         children_declarations: List[Field] = []
-        for child in node.children:
+        for child in self.tree.children(node):
             field = TypeGenerator.field_from_vss_node(
                 child, custom_scalars=self.args.custom_scalars,
                 enums=self.args.enums,
@@ -95,7 +99,7 @@ class TypeGenerator(VSSLeafGenerator):
         if (has_has_permission_directive
            and vss_node.type not in VSS_BRANCH_TYPES):
             has_permission_directive = get_has_permission_directive(
-                vss_node, ['READ']
+                vss_node, ('READ',)
             )
             if has_permission_directive:
                 directives.append(has_permission_directive)
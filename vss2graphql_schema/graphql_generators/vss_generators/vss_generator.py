@@ -11,28 +11,50 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
+import hashlib
 from abc import ABC, abstractmethod
 from typing import (
-    Generic, Iterable, Optional, Mapping, List, TextIO, Type, Iterator, Any
+    Generic, Iterable, Optional, Mapping, List, TextIO, Type, Any, Tuple,
+    Dict
 )
 
-from anytree import LevelOrderIter
-
 from vspec import VSSNode
 
 from ..emitters.common_emitter import TEntry, CommonEmitter
 from ..common_generator import CommonGenerator
+from ..fragment_cache import FragmentCache
+from ..node_facts import NodeFacts
+from ..tree_view import VSSTreeView, tree_view
+from ..util import qualified_name
+
+# Arguments that change the blocks rendered from the nodes
+FRAGMENT_ARGS = (
+    'custom_scalars', 'enums', 'range_directive', 'permission_directive',
+    'output_format',
+)
 
 
 class VSSGenerator(CommonGenerator, Generic[TEntry], ABC):
     '''
     Generator specialized in VSSNodes.
-    Default iterator that yields every node in DFS order.
-    Its 'generate' method writes the separator and calls 'self.emitter' for
-    each node, using 'self._get_entries' and 'self._get_extra_vars_from_node'
-    to get needed info necessary to generate.
+    It is driven by a GenerationEngine, which calls 'start' to write the
+    separator, 'visit' for every node of 'selection' in level order and
+    'finish' once the tree walk is over. The entries are taken from
+    'self._get_entries' and 'self._get_extra_vars_from_node'.
+    The children of the nodes are read from 'self.tree', the view of the
+    roots, which may differ from the children in the loaded tree.
     '''
     vss_roots: Iterable[VSSNode]
+    tree: VSSTreeView
+    extra_vars: Mapping[str, Any]
+    block_emitter: Optional[CommonEmitter]
+    fragment_cache: Optional[FragmentCache]
+    # Blocks written, rendered fields and blocks taken from the cache
+    blocks: int
+    fields: int
+    cached_blocks: int
+    # Whether the generator needs 'visit' to be called for every node
+    visits_nodes: bool = True
 
     def __init__(
             self, output: TextIO, name: str, emitter: Type[CommonEmitter],
@@ -41,31 +63,109 @@ class VSSGenerator(CommonGenerator, Generic[TEntry], ABC):
 
         super().__init__(output, name, emitter, args)
         self.vss_roots = vss_roots
-
-    @abstractmethod
-    def __iter__(self) -> Iterator[VSSNode]:
-        raise NotImplementedError()
+        self.tree = tree_view(vss_roots)
+        self.extra_vars = {}
+        self.block_emitter = None
+        self.fragment_cache = None
+        self.blocks = self.fields = self.cached_blocks = 0
 
     def generate(self, extra_vars: Optional[Mapping[str, str]] = None) -> None:
         '''
-        Iterates with default iterator, get entries and emits for each node.
+        Generates this section alone, walking the tree on its own.
         :param extra_vars: Extra variables to be sent to emitter
         :return: None
         '''
-        if extra_vars is None:
-            extra_vars = {}
+        self.start(extra_vars)
+        if self.visits_nodes:
+            self.visit_selected()
+        self.finish()
+
+    def visit_selected(self) -> None:
+        '''
+        Visits the nodes of the selection, in level order
+        :return: None
+        '''
+        facts = self.tree.facts()
+        visit = self.visit
+        for node in facts.select(self.selection(facts)):
+            visit(node)
 
+    def selection(self, facts: NodeFacts) -> Optional[bytes]:
+        '''
+        Nodes without entries may be left out of the selection, so they are
+         not visited
+        :param facts: Facts of the nodes of the view
+        :return: Mask of the nodes to visit, every node if None
+        '''
+        return None
+
+    def selects_nodes(self) -> bool:
+        '''
+        :return: Whether any node of the view is in the selection
+        '''
+        mask = self.selection(self.tree.facts())
+        return mask is None or 1 in mask
+
+    def start(self, extra_vars: Optional[Mapping[str, Any]] = None) -> None:
+        '''
+        Called before the tree walk
+        :param extra_vars: Extra variables to be sent to emitter
+        :return: None
+        '''
+        self.extra_vars = extra_vars if extra_vars else {}
         self.emit_separator()
 
-        for node in self:
-            entries: List[TEntry] = self._get_entries(node)
-            if len(entries) > 0:
-                gen = self.emitter(self.output, self.name, entries)
-                node_extra_vars = self._get_extra_vars_from_node(node)
-                gen.emit_all(extra_vars={
-                    **extra_vars,
-                    **node_extra_vars,
-                })
+    def visit(self, node: VSSNode) -> None:
+        '''
+        Called for every node of the selection, in level order
+        :param node: VSSNode
+        :return: None
+        '''
+
+    def finish(self) -> None:
+        '''
+        Called after the tree walk
+        :return: None
+        '''
+
+    def counts(self) -> Dict[str, int]:
+        '''
+        :return: Blocks written and fields rendered so far. Fields of the
+         blocks taken from the fragment cache are not counted.
+        '''
+        counts = {'blocks': self.blocks, 'fields': self.fields}
+        if self.fragment_cache is not None:
+            counts['cached blocks'] = self.cached_blocks
+        return counts
+
+    def emit_entries(
+            self, entries: List[TEntry], node_extra_vars: Mapping[str, Any]
+    ) -> None:
+        '''
+        Emits a block with the entries, if there is any
+        :param entries: Entries of the block
+        :param node_extra_vars: Variables of the block, added to extra_vars
+        :return: None
+        '''
+        if len(entries) > 0:
+            self.blocks += 1
+            self.output.write(self.render_entries(entries, node_extra_vars))
+
+    def render_entries(
+            self, entries: List[TEntry], node_extra_vars: Mapping[str, Any]
+    ) -> str:
+        '''
+        :param entries: Entries of the block
+        :param node_extra_vars: Variables of the block, added to extra_vars
+        :return: Block text
+        '''
+        self.fields += len(entries)
+        # One emitter renders every block of this section
+        if self.block_emitter is None:
+            self.block_emitter = self.emitter(self.output, self.name, [])
+        return self.block_emitter.render_block(
+            entries, {**self.extra_vars, **node_extra_vars}
+        )
 
     def _get_extra_vars_from_node(self, node: VSSNode) -> Mapping[str, Any]:
         '''
@@ -87,35 +187,90 @@ class VSSGenerator(CommonGenerator, Generic[TEntry], ABC):
 
 class VSSLeafGenerator(VSSGenerator, ABC):
     '''
-    VSSGenerator with standard iterator returning all nodes in DFS order
+    VSSGenerator that emits one block for each node visited.
+    A block is rendered from the node and its children only. With a
+     fragment_cache, blocks are taken from the cache unless one of those nodes
+     changed.
     '''
+    _fragment_prefix: bytes
+
     def __init__(
             self, output: TextIO, name: str, emitter: Type[CommonEmitter],
             vss_roots: Iterable[VSSNode], args: argparse.Namespace
     ) -> None:
         super().__init__(output, name, emitter, vss_roots, args)
+        self._fragment_prefix = b''
+
+    def start(self, extra_vars: Optional[Mapping[str, Any]] = None) -> None:
+        super().start(extra_vars)
+        if self.fragment_cache is not None:
+            self._fragment_prefix = self.fragment_cache.key(
+                type(self).__qualname__, self.name,
+                sorted(self.extra_vars.items()),
+                [getattr(self.args, a, None) for a in FRAGMENT_ARGS],
+            )
 
-    def __iter__(self) -> Iterator[VSSNode]:
+    def visit(self, node: VSSNode) -> None:
+        text: Optional[str]
+        if self.fragment_cache is None:
+            text = self.render_node(node)
+        else:
+            key = self.fragment_key(node, self.fragment_cache)
+            text = self.fragment_cache.get(key)
+            if text is None:
+                text = self.render_node(node)
+                self.fragment_cache.put(key, text)
+            elif text:
+                self.cached_blocks += 1
+        if text:
+            self.blocks += 1
+            self.output.write(text)
+
+    def render_node(self, node: VSSNode) -> str:
         '''
-        Default iteration for vss is a DFS in vss tree
+        :param node: VSSNode
+        :return: Block of the node, empty if it has no entries
         '''
-        for root in self.vss_roots:
-            for node in LevelOrderIter(root):
-                yield node
+        entries = self._get_entries(node)
+        if len(entries) == 0:
+            return ''
+        return self.render_entries(
+            entries, self._get_extra_vars_from_node(node)
+        )
+
+    def fragment_key(self, node: VSSNode, cache: FragmentCache) -> str:
+        '''
+        :param node: VSSNode
+        :param cache: Fragment cache with the node digests
+        :return: Key of the node block in the fragment cache
+        '''
+        key = hashlib.sha256(self._fragment_prefix)
+        key.update(qualified_name(node).encode())
+        key.update(cache.node_digest(node))
+        for child in self.tree.children(node):
+            key.update(cache.node_digest(child))
+        key.update(repr(self._get_fragment_facts(node)).encode())
+        return key.hexdigest()
+
+    def _get_fragment_facts(self, node: VSSNode) -> Tuple[Any, ...]:
+        '''
+        :param node: VSSNode
+        :return: Other values the node block depends on, e.g. from a layer
+        '''
+        return ()
 
 
 class VSSRootsGenerator(VSSGenerator, ABC):
     '''
-    VSSGenerator with iterator returning
+    VSSGenerator that emits a single block with the entries of all roots
     '''
+    visits_nodes = False
+
     def __init__(
             self, output: TextIO, name: str, emitter: Type[CommonEmitter],
             vss_roots: Iterable[VSSNode], args: argparse.Namespace
     ) -> None:
         super().__init__(output, name, emitter, vss_roots, args)
 
-    def __iter__(self) -> Iterator[Iterable[VSSNode]]:
-        '''
-        Default iteration for vss is a DFS in vss tree
-        '''
-        yield self.vss_roots
+    def finish(self) -> None:
+        self.emit_entries(self._get_entries(self.vss_roots), {})
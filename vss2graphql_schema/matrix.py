@@ -0,0 +1,121 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import argparse
+import copy
+from typing import Any, Dict, List, Mapping
+
+# Options of the whole run, variants can not change them
+RUN_OPTIONS = frozenset((
+    'vspec_file', 'I', 'dirs', 'matrix', 'cache', 'cache_dir', 'cache_size',
+    'fragment_cache_size', 'no_cache', 'cache_stats', 'timings', 'watch',
+    'watch_interval', 'profile', 'memory_report',
+))
+
+
+class MatrixError(ValueError):
+    '''
+    Invalid matrix configuration
+    '''
+
+
+def load_matrix(file_name: str) -> List[Dict[str, Any]]:
+    '''
+    Load the variants of a matrix configuration file, such as:
+
+        defaults:
+          custom-scalars: true
+        variants:
+          - output: public.graphql
+          - output: internal.graphql
+            permission-directive: true
+            range-directive: true
+          - output: layer.graphql
+            layer: layer.depl
+
+    Options are the long command line options, without '--'. 'defaults' are
+     added to every variant, and both add to the command line: 'false' turns
+     a flag off, 'null' keeps the value of the command line.
+    :param file_name: Matrix configuration file
+    :return: Options of each variant
+    '''
+    import yaml
+
+    with open(file_name) as file:
+        config = yaml.safe_load(file)
+
+    if not isinstance(config, dict) or not isinstance(
+            config.get('variants'), list
+    ):
+        raise MatrixError(f'{file_name}: a list of "variants" is required')
+    defaults = config.get('defaults') or {}
+    if not isinstance(defaults, dict):
+        raise MatrixError(f'{file_name}: "defaults" must be a mapping')
+
+    variants = []
+    for i, variant in enumerate(config['variants']):
+        if not isinstance(variant, dict):
+            raise MatrixError(f'{file_name}: variant {i} must be a mapping')
+        options = {**defaults, **variant}
+        for name in options:
+            if name.replace('-', '_') in RUN_OPTIONS:
+                raise MatrixError(
+                    f'{file_name}: variant {i}: "{name}" is an option of '
+                    'the whole run, it can not be set by a variant'
+                )
+        if not options.get('output') or options['output'] == '-':
+            raise MatrixError(
+                f'{file_name}: variant {i}: an output file is required'
+            )
+        variants.append(options)
+    return variants
+
+
+def variant_argv(options: Mapping[str, Any]) -> List[str]:
+    '''
+    :param options: Options of a variant
+    :return: Command line arguments with the options
+    '''
+    argv = []
+    for name, value in options.items():
+        option = '--' + name.replace('_', '-')
+        if value is True:
+            argv.append(option)
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, list):
+            for v in value:
+                argv.extend((option, str(v)))
+        else:
+            argv.extend((option, str(value)))
+    return argv
+
+
+def parse_variant_args(
+        parser: argparse.ArgumentParser, args: argparse.Namespace,
+        options: Mapping[str, Any]
+) -> argparse.Namespace:
+    '''
+    :param parser: Parser of the command line
+    :param args: Arguments of the whole run
+    :param options: Options of a variant
+    :return: Arguments of the run with the options of the variant
+    '''
+    namespace = copy.deepcopy(args)
+    # 'false' turns off a flag given on the command line
+    for name, value in options.items():
+        dest = name.replace('-', '_')
+        if value is False and hasattr(namespace, dest):
+            setattr(namespace, dest, False)
+    return parser.parse_args(
+        [args.vspec_file, *variant_argv(options)], namespace=namespace
+    )
@@ -13,22 +13,50 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
+import contextlib
+import os
+import sys
+import time
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, TextIO, Tuple,
+    cast
+)
 
-from vspec import load_tree
+from . import import_started, import_started_cpu
 
-from .graphql_generators.util import sort_children
+from .graphql_generators.introspection import OUTPUT_FORMATS, SDL
 from .graphql_generators.layer import Layer
-from .graphql_generators.node_filters.layer_filter import create_layer_filter
-from .graphql_generators.graphql_schema_vss_layer import (
-    GraphQLSchemaVSSLayer
+from .graphql_generators.layer_cache import LayerCache, load_layer_cached
+from .graphql_generators.schema_output import (
+    DEFAULT_FLUSH_SIZE, STDOUT, open_schema_output
 )
-from .graphql_generators.node_filters.vss_tree_filter import VSSTreeFilter
-from .graphql_generators.node_filters.regex_filter import (
-    create_match_pattern, create_filter_pattern
+from .graphql_generators.tree_cache import (
+    DEFAULT_CACHE_SIZE, TreeCache, default_cache_dir, load_tree_cached
 )
-from .graphql_generators.graphql_schema_vss import (
-    GraphQLSchemaVSS
+from .graphql_generators.fragment_cache import (
+    DEFAULT_FRAGMENT_CACHE_SIZE, FragmentCache, FragmentChanges
 )
+from .graphql_generators.timings import (
+    Span, Timings, profiled, replay, span, spans_enabled, traced_memory
+)
+from .graphql_generators.tree_view import VSSTreeView, tree_view
+from .graphql_generators.node_filters.layer_filter import create_layer_filter
+from .graphql_generators.node_filters.regex_filter import (
+    create_match_pattern, create_filter_pattern, read_patterns
+)
+from .matrix import MatrixError, load_matrix, parse_variant_args
+from .watch import DEFAULT_WATCH_INTERVAL, SchemaWatcher
+
+# vss-tools and jinja2 take most of the start up time, so the modules using
+#  them are imported by the stages that need them
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
+imports_finished = time.perf_counter()
+imports_finished_cpu = time.process_time()
+
+# --timings without a file prints them to stderr
+STDERR = '-'
 
 
 def get_arg_parse() -> argparse.ArgumentParser:
@@ -53,12 +81,25 @@ def get_arg_parse() -> argparse.ArgumentParser:
     parser.add_argument(
         '--output',
         '-o',
-        help='The GraphQL schema output file.',
+        help='The GraphQL schema output file. The file is replaced only once '
+             'the whole schema is generated. Use "-" to write the schema to '
+             'stdout.',
         default='resources/schema.graphql',
         type=str,
         nargs='?',
     )
 
+    parser.add_argument(
+        '--output-format',
+        help='Format of the output: the GraphQL schema (sdl), or the JSON '
+             'result of the introspection query of that schema '
+             '(introspection), written as the schema is generated. The '
+             'introspection has no directive calls, but @deprecated, and '
+             'custom templates are not used for it.',
+        choices=OUTPUT_FORMATS,
+        default=SDL,
+    )
+
     parser.add_argument(
         '--layer',
         help='The root deployment file that describes the layer that is taken '
@@ -85,17 +126,39 @@ def get_arg_parse() -> argparse.ArgumentParser:
     parser.add_argument(
         '--regex-match',
         help='Consider only nodes with node.qualified_names("_") (name with '
-             'full path separated by "_") that match this regex pattern.',
+             'full path separated by "_") that match this regex pattern. '
+             'May be repeated, nodes matching any of the patterns are '
+             'considered.',
+        action='append',
         metavar='regex_expression',
     )
 
     parser.add_argument(
         '--regex-filter',
         help='Do not consider nodes (and its children) with '
-             'node.qualified_names("_") that match this regex pattern.',
+             'node.qualified_names("_") that match this regex pattern. '
+             'May be repeated, nodes matching any of the patterns are '
+             'removed.',
+        action='append',
         metavar='regex_expression',
     )
 
+    parser.add_argument(
+        '--regex-match-file',
+        help='File with --regex-match patterns, one per line. Empty lines '
+             'and lines starting with "#" are skipped. May be repeated.',
+        action='append',
+        metavar='patterns_file',
+    )
+
+    parser.add_argument(
+        '--regex-filter-file',
+        help='File with --regex-filter patterns, one per line. Empty lines '
+             'and lines starting with "#" are skipped. May be repeated.',
+        action='append',
+        metavar='patterns_file',
+    )
+
     parser.add_argument(
         '--custom-scalars',
         help='Generate custom scalars in the GraphQL schema out of data types '
@@ -131,56 +194,638 @@ def get_arg_parse() -> argparse.ArgumentParser:
         action='store_true',
     )
 
+    parser.add_argument(
+        '--preserve-spec-order',
+        help='Keep the children of each branch in the order of the vspec '
+             'files, instead of sorting them by name.',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        help='Number of processes used to render the mutation, input, type '
+             'and enum sections of the GraphQL schema. The schema file is the '
+             'same for any number of jobs.',
+        default=1,
+        type=int,
+        metavar='N',
+    )
+
+    parser.add_argument(
+        '--flush-size',
+        help='Number of characters buffered in memory before they are '
+             'written to the output.',
+        default=DEFAULT_FLUSH_SIZE,
+        type=int,
+        metavar='N',
+    )
+
+    parser.add_argument(
+        '--cache',
+        help='Cache loaded VSS trees and layers, rendered blocks and '
+             'compiled custom templates in the cache directory, which '
+             'defaults to $XDG_CACHE_HOME/vss2graphql_schema. Nothing is '
+             'cached without this option or --cache-dir.',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory of the caches, implies --cache. Trees are cached by '
+             'the content of the vspec file and of every file it includes.',
+        metavar='directory',
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        help='Maximum size of the VSS tree cache in MiB. The least recently '
+             'used trees are removed when it grows over this size.',
+        default=DEFAULT_CACHE_SIZE >> 20,
+        type=int,
+        metavar='MiB',
+    )
+
+    parser.add_argument(
+        '--fragment-cache-size',
+        help='Maximum size in MiB of the cache of rendered type, input and '
+             'enum blocks, kept in the cache directory. Blocks are rendered '
+             'again only when their VSS nodes, layer entries or options '
+             'change. The least recently used blocks are removed first.',
+        default=DEFAULT_FRAGMENT_CACHE_SIZE >> 20,
+        type=int,
+        metavar='MiB',
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        help='Always parse the vspec files and render every block, without '
+             'reading or writing the caches, even with --cache or '
+             '--cache-dir.',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--templates-dir',
+        help='Directory with jinja templates that replace the templates of '
+             'the same name in the package. With --cache, compiled templates '
+             'are kept in the cache directory.',
+        metavar='directory',
+    )
+
+    parser.add_argument(
+        '--cache-stats',
+        help='Print cache hits and misses to stderr.',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--matrix',
+        help='YAML file listing schema variants, each one with its own '
+             'output, layer, filters and flags. The VSS tree is loaded once '
+             'and the variants are generated by --jobs processes. See '
+             'README.md for the file format.',
+        metavar='config.yaml',
+    )
+
+    parser.add_argument(
+        '--watch',
+        help='Keep running and generate the schema again whenever the vspec '
+             'or layer files change. The timings of each generation are '
+             'printed to stderr.',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--watch-interval',
+        help='Seconds between checks for changed files in --watch mode.',
+        default=DEFAULT_WATCH_INTERVAL,
+        type=float,
+        metavar='SECONDS',
+    )
+
+    parser.add_argument(
+        '--timings',
+        help='Print the wall and CPU time spent importing modules and in '
+             'each stage of the generation, down to each generator, with '
+             'the nodes and fields handled, to stderr. Given a FILE, they '
+             'are written to it as JSON instead.',
+        nargs='?',
+        const=STDERR,
+        metavar='FILE',
+    )
+
+    parser.add_argument(
+        '--profile',
+        help='Profile the run with cProfile and save the stats to FILE, to '
+             'be read with pstats. Worker processes of --jobs are not '
+             'profiled.',
+        metavar='FILE',
+    )
+
+    parser.add_argument(
+        '--memory-report',
+        help='Trace the memory allocated with tracemalloc and print the '
+             'peak and retained memory of each stage of the generation, '
+             'with the source lines allocating the most, to stderr. Given '
+             'a FILE, they are written to it as JSON instead, along with '
+             'the timings. Worker processes of --jobs are not traced.',
+        nargs='?',
+        const=STDERR,
+        metavar='FILE',
+    )
+
     return parser
 
 
-def main(raw_args=None):
-    parser = get_arg_parse()
-    args = parser.parse_args(raw_args)
+def get_cache_dir(args: argparse.Namespace) -> Optional[str]:
+    '''
+    Caching is opt-in: the run writes nothing but the schema unless --cache
+     or --cache-dir is given, and --no-cache overrides both
+    :param args: Arguments of the run
+    :return: Directory of the caches, None if caching is disabled
+    '''
+    if args.no_cache or not (args.cache or args.cache_dir):
+        return None
+    return args.cache_dir or default_cache_dir()
+
+
+def create_caches(args: argparse.Namespace) -> Tuple[
+    Optional[TreeCache], Optional[LayerCache], Optional[FragmentCache]
+]:
+    '''
+    :param args: Arguments of the run
+    :return: Tree, layer and fragment caches, None if caching is disabled
+    '''
+    cache_dir = get_cache_dir(args)
+    if not cache_dir:
+        return None, None, None
+    return (
+        TreeCache(cache_dir, args.cache_size << 20),
+        LayerCache(cache_dir, args.cache_size << 20),
+        FragmentCache(
+            os.path.join(cache_dir, 'fragments'),
+            args.fragment_cache_size << 20,
+        ),
+    )
+
 
+def configure_templates(args: argparse.Namespace) -> None:
+    '''
+    :param args: Arguments of the run
+    :return: None
+    '''
+    from .graphql_generators.templates import Templates
+
+    cache_dir = get_cache_dir(args)
+    bytecode_cache_dir = None
+    if cache_dir:
+        bytecode_cache_dir = os.path.join(cache_dir, 'jinja')
+    Templates.configure(args.templates_dir, bytecode_cache_dir)
+
+
+def get_include_dirs(args: argparse.Namespace) -> List[str]:
+    '''
+    :param args: Arguments of the run
+    :return: Directories searched for included vspec files
+    '''
     # Always search current directory for include_file
     include_dirs = ['.']
     if args.dirs:
         include_dirs.extend(args.dirs)
+    return include_dirs
+
 
-    # Loading tree using vss-tools
-    vss_root_node = load_tree(
-        args.vspec_file, include_dirs, merge_private=True
+def load_vss_tree(
+        args: argparse.Namespace, tree_cache: Optional[TreeCache]
+) -> 'VSSNode':
+    '''
+    :param args: Arguments of the run
+    :param tree_cache: Tree cache, if any
+    :return: VSS root node, loaded by vss-tools or from the tree cache
+    '''
+    return load_tree_cached(
+        args.vspec_file, get_include_dirs(args), merge_private=True,
+        cache=tree_cache,
     )
 
-    # Creating regex filters
+
+def index_tree(vss_root_node: 'VSSNode') -> None:
+    '''
+    Indexes the qualified names of the tree, read by every later stage
+    :param vss_root_node: VSS root node
+    :return: None
+    '''
+    from .graphql_generators.util import index_qualified_names
+
+    index_qualified_names([vss_root_node])
+
+
+def get_patterns(
+        patterns: Optional[List[str]], files: Optional[List[str]]
+) -> List[str]:
+    '''
+    :param patterns: Regex expressions of the command line, if any
+    :param files: Files with more regex expressions, if any
+    :return: All the regex expressions
+    '''
+    all_patterns = list(patterns or ())
+    for file_name in files or ():
+        all_patterns.extend(read_patterns(file_name))
+    return all_patterns
+
+
+def create_filters(
+        args: argparse.Namespace, layer: Optional[Layer]
+) -> List[Callable[[str], bool]]:
+    '''
+    :param args: Arguments of the run
+    :param layer: Layer of the run, if any
+    :return: Node name filters
+    '''
     filters = []
-    if args.regex_match:
-        filters.append(create_match_pattern(args.regex_match))
-    if args.regex_filter:
-        filters.append(create_filter_pattern(args.regex_filter))
-
-    layer = None
-    if args.layer:
-        layer = Layer(args.layer)
+    match_patterns = get_patterns(args.regex_match, args.regex_match_file)
+    if match_patterns:
+        filters.append(create_match_pattern(match_patterns))
+    filter_patterns = get_patterns(args.regex_filter, args.regex_filter_file)
+    if filter_patterns:
+        filters.append(create_filter_pattern(filter_patterns))
+    if layer:
         filters.append(create_layer_filter(layer))
+    return filters
+
+
+def filter_vss_tree(
+        vss_root_node: 'VSSNode', filters: List[Callable[[str], bool]],
+        sort: bool = True
+) -> VSSTreeView:
+    '''
+    Filters the tree and sorts the children of every node left, in the same
+     pass. The tree is not changed, so it may be filtered again.
+    :param vss_root_node: VSS root node
+    :param filters: Node name filters
+    :param sort: Sort the children by name, instead of keeping the order of
+     the vspec files
+    :return: View of the roots left by the filters
+    '''
+    from .graphql_generators.node_filters.vss_tree_filter import (
+        VSSTreeFilter
+    )
 
-    # Filtering
-    vss_roots = list(VSSTreeFilter(
-        [vss_root_node], filters
-    ).filter_trees())
+    return VSSTreeFilter([vss_root_node], filters, sort=sort).view()
 
-    # Sorting the children list on all nodes
-    for r in vss_roots:
-        sort_children(r)
 
-    # Generating schema file
-    with open(args.output, 'w') as schema_file:
+def write_schema(
+        args: argparse.Namespace, vss_roots: Iterable['VSSNode'],
+        layer: Optional[Layer], fragment_cache: Optional[FragmentCache]
+) -> None:
+    '''
+    Generates the schema into args.output
+    :param args: Arguments of the run
+    :param vss_roots: View of the filtered and sorted VSS roots
+    :param layer: Layer of the run, if any
+    :param fragment_cache: Fragment cache, if any
+    :return: None
+    '''
+    from .graphql_generators.graphql_schema_vss import GraphQLSchemaVSS
+    from .graphql_generators.graphql_schema_vss_layer import (
+        GraphQLSchemaVSSLayer
+    )
+
+    with open_schema_output(args.output, args.flush_size) as writer:
+        # The generators only write to the schema file
+        schema_file = cast(TextIO, writer)
         if layer:
             GraphQLSchemaVSSLayer(
                 schema_file=schema_file, vss_roots=vss_roots, args=args,
-                layer=layer,
+                layer=layer, fragment_cache=fragment_cache,
             ).create_schema()
         else:
             GraphQLSchemaVSS(
                 schema_file=schema_file, vss_roots=vss_roots, args=args,
+                fragment_cache=fragment_cache,
             ).create_schema()
 
 
+def generate_variant(
+        args: argparse.Namespace, vss_root_node: 'VSSNode',
+        layer: Optional[Layer], fragment_cache: Optional[FragmentCache]
+) -> Optional[FragmentChanges]:
+    '''
+    Generates the schema of a matrix variant from a view of the VSS tree,
+     which is shared by the variants
+    :param args: Arguments of the variant
+    :param vss_root_node: VSS root node, with its qualified names indexed
+    :param layer: Layer of the variant, if any
+    :param fragment_cache: Fragment cache, if any
+    :return: Changes to the fragment cache
+    '''
+    configure_templates(args)
+    with span('filter and sort') as counts:
+        vss_roots = filter_vss_tree(
+            vss_root_node, create_filters(args, layer),
+            sort=not args.preserve_spec_order,
+        )
+        if spans_enabled():
+            counts['nodes'] = vss_roots.count_nodes()
+    with span('generate'):
+        write_schema(args, vss_roots, layer, fragment_cache)
+    return fragment_cache.changes() if fragment_cache else None
+
+
+def generate_variant_copy(
+        args: argparse.Namespace, vss_root_node: 'VSSNode',
+        layer: Optional[Layer], fragment_cache: Optional[FragmentCache],
+        timed: bool
+) -> Tuple[Optional[FragmentChanges], List[Span]]:
+    '''
+    generate_variant in a worker process, which unpickled its own copy of
+     the VSS tree and of the fragment cache
+    :param timed: Take the spans of the variant, for the parent process
+    :return: Changes to the fragment cache and the spans of the variant, if
+     timed
+    '''
+    index_tree(vss_root_node)
+    timings = Timings()
+    with timings.collect(isolated=True) if timed else contextlib.nullcontext():
+        with span(f'variant {args.output}'):
+            changes = generate_variant(
+                args, vss_root_node, layer, fragment_cache
+            )
+    return changes, timings.spans
+
+
+def load_variants(
+        parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> List[argparse.Namespace]:
+    '''
+    Exits with a usage error naming the variant with invalid arguments
+    :param parser: Parser of the command line
+    :param args: Arguments of the run
+    :return: Arguments of every variant of args.matrix
+    '''
+    try:
+        variants = [
+            parse_variant_args(parser, args, options)
+            for options in load_matrix(args.matrix)
+        ]
+    except MatrixError as e:
+        parser.error(str(e))
+    for i, variant in enumerate(variants):
+        error = args_error(variant)
+        if error:
+            parser.error(
+                f'{args.matrix}: variant {i} ({variant.output}): {error}'
+            )
+    return variants
+
+
+def load_layers(
+        variants: List[argparse.Namespace], layer_cache: Optional[LayerCache]
+) -> Dict[str, Layer]:
+    '''
+    Layers are loaded once, even if variants share them
+    :param variants: Arguments of every variant
+    :param layer_cache: Layer cache, if any
+    :return: Layer of each layer file of the variants
+    '''
+    layers: Dict[str, Layer] = {}
+    for variant in variants:
+        if variant.layer and variant.layer not in layers:
+            layers[variant.layer] = load_layer_cached(
+                variant.layer, variant.jobs, layer_cache
+            )
+    return layers
+
+
+def generate_matrix(
+        args: argparse.Namespace, variants: List[argparse.Namespace],
+        vss_root_node: 'VSSNode', layers: Dict[str, Layer],
+        fragment_cache: Optional[FragmentCache]
+) -> None:
+    '''
+    Generates every variant from the same VSS tree, which is not changed by
+     the variants. With more than one job each variant is generated by a
+     worker process instead, working on its own copy of the tree.
+    :param args: Arguments of the run
+    :param variants: Arguments of every variant
+    :param vss_root_node: VSS root node
+    :param layers: Layer of each layer file of the variants
+    :param fragment_cache: Fragment cache, if any
+    :return: None
+    '''
+    if args.jobs < 2 or len(variants) < 2:
+        index_tree(vss_root_node)
+        for variant in variants:
+            with span(f'variant {variant.output}'):
+                generate_variant(
+                    variant, vss_root_node, layers.get(variant.layer),
+                    fragment_cache,
+                )
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(min(args.jobs, len(variants))) as pool:
+        futures = []
+        for variant in variants:
+            # The variants are the parallel jobs, not their sections
+            variant.jobs = 1
+            futures.append(pool.submit(
+                generate_variant_copy, variant, vss_root_node,
+                layers.get(variant.layer), fragment_cache, spans_enabled(),
+            ))
+        for future in futures:
+            changes, spans = future.result()
+            replay(spans)
+            if fragment_cache and changes:
+                fragment_cache.apply(changes)
+
+
+def report_cache_stats(
+        tree_cache: Optional[TreeCache], layer_cache: Optional[LayerCache],
+        fragment_cache: Optional[FragmentCache]
+) -> None:
+    '''
+    Writes the hits and misses of the caches to stderr
+    :param tree_cache: Tree cache, if any
+    :param layer_cache: Layer cache, if any
+    :param fragment_cache: Fragment cache, if any
+    :return: None
+    '''
+    if tree_cache and layer_cache and fragment_cache:
+        sys.stderr.write(
+            f'tree cache: {tree_cache.hits} hits, '
+            f'{tree_cache.misses} misses\n'
+            f'layer cache: {layer_cache.hits} hits, '
+            f'{layer_cache.misses} misses\n'
+            f'fragment cache: {fragment_cache.hits} hits, '
+            f'{fragment_cache.misses} misses\n'
+        )
+    else:
+        sys.stderr.write('caches disabled\n')
+
+
+def args_error(args: argparse.Namespace) -> Optional[str]:
+    '''
+    :param args: Arguments of the run, or of a matrix variant
+    :return: Why the combination of arguments is invalid, None if it is valid
+    '''
+    if args.jobs < 1:
+        return '--jobs must be at least 1'
+    if args.flush_size < 1:
+        return '--flush-size must be at least 1'
+    if args.watch_interval <= 0:
+        return '--watch-interval must be positive'
+    if args.watch and not args.matrix and args.output == STDOUT:
+        return '--watch needs an output file'
+    return None
+
+
+def check_args(
+        parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> None:
+    '''
+    Exits with a usage error on invalid combinations of arguments
+    :param parser: Parser of the arguments
+    :param args: Arguments of the run
+    :return: None
+    '''
+    error = args_error(args)
+    if error:
+        parser.error(error)
+
+
+def generate(
+        args: argparse.Namespace, variants: List[argparse.Namespace],
+        tree_cache: Optional[TreeCache], layer_cache: Optional[LayerCache],
+        fragment_cache: Optional[FragmentCache]
+) -> None:
+    '''
+    Generates the schema, or the schemas of the variants, once
+    :param args: Arguments of the run
+    :param variants: Arguments of every variant, if args.matrix is set
+    :param tree_cache: Tree cache, if any
+    :param layer_cache: Layer cache, if any
+    :param fragment_cache: Fragment cache, if any
+    :return: None
+    '''
+    with span('load tree') as counts:
+        vss_root_node = load_vss_tree(args, tree_cache)
+        if spans_enabled():
+            counts['nodes'] = tree_view([vss_root_node]).count_nodes()
+
+    if variants:
+        with span('load layers'):
+            layers = load_layers(variants, layer_cache)
+        with span('generate variants'):
+            generate_matrix(
+                args, variants, vss_root_node, layers, fragment_cache
+            )
+    else:
+        # Every stage reads qualified names from this index
+        index_tree(vss_root_node)
+
+        layer = None
+        if args.layer:
+            with span('load layer') as counts:
+                layer = load_layer_cached(args.layer, args.jobs, layer_cache)
+                counts['nodes'] = len(layer.qualified_names)
+
+        generate_variant(args, vss_root_node, layer, fragment_cache)
+
+    if fragment_cache:
+        with span('save caches'):
+            fragment_cache.save()
+
+
+def watch(
+        args: argparse.Namespace, variants: List[argparse.Namespace]
+) -> None:
+    '''
+    Generates the schemas again whenever their files change, printing the
+     timings of each generation to stderr
+    :param args: Arguments of the run
+    :param variants: Arguments of each schema to generate
+    :return: None
+    '''
+    tree_cache, layer_cache, fragment_cache = create_caches(args)
+
+    def report(timings: Timings) -> None:
+        report_timings(timings, args.timings or STDERR)
+        if args.memory_report:
+            report_timings(timings, args.memory_report, memory=True)
+        if args.cache_stats:
+            report_cache_stats(tree_cache, layer_cache, fragment_cache)
+
+    SchemaWatcher(
+        args, variants, get_include_dirs(args),
+        lambda: load_vss_tree(args, tree_cache),
+        lambda vss_root_node, layers: generate_matrix(
+            args, variants, vss_root_node, layers, fragment_cache
+        ),
+        report, layer_cache, fragment_cache,
+    ).run()
+
+
+def report_timings(
+        timings: Timings, destination: str, memory: bool = False
+) -> None:
+    '''
+    :param timings: Timings of the run
+    :param destination: File to receive the timings as JSON, STDERR to
+     print them
+    :param memory: Print the memory of the stages instead of their times
+    :return: None
+    '''
+    if destination == STDERR:
+        if memory:
+            timings.memory_report(sys.stderr)
+        else:
+            timings.report(sys.stderr)
+        return
+    with open(destination, 'w') as file:
+        timings.dump_json(file)
+
+
+def main(raw_args=None):
+    parser = get_arg_parse()
+    args = parser.parse_args(raw_args)
+    check_args(parser, args)
+
+    variants = load_variants(parser, args) if args.matrix else []
+
+    with contextlib.ExitStack() as stack:
+        if args.profile:
+            stack.enter_context(profiled(args.profile))
+        if args.memory_report:
+            stack.enter_context(traced_memory())
+
+        if args.watch:
+            try:
+                watch(args, variants or [args])
+            except KeyboardInterrupt:
+                pass
+            return
+
+        timings = Timings()
+        timings.add(
+            'imports', imports_finished - import_started,
+            imports_finished_cpu - import_started_cpu, import_started,
+        )
+        caches = create_caches(args)
+        if args.timings or args.memory_report:
+            stack.enter_context(timings.collect())
+        generate(args, variants, *caches)
+
+    if args.timings:
+        report_timings(timings, args.timings)
+    if args.memory_report:
+        report_timings(timings, args.memory_report, memory=True)
+
+    if args.cache_stats:
+        report_cache_stats(*caches)
+
+
 if __name__ == '__main__':
     main()
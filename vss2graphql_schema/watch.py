@@ -0,0 +1,232 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import argparse
+import os
+import sys
+import time
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+)
+
+from .graphql_generators import depl_loader, tree_cache
+from .graphql_generators.fragment_cache import FragmentCache
+from .graphql_generators.layer import Layer
+from .graphql_generators.layer_cache import LayerCache, load_layer_cached
+from .graphql_generators.timings import Timings, span
+from .graphql_generators.tree_view import tree_view
+
+if TYPE_CHECKING:
+    from vspec.model.vsstree import VSSNode
+
+DEFAULT_WATCH_INTERVAL = 0.5
+
+
+def vspec_files(vspec_file: str, include_dirs: Iterable[str]) -> List[str]:
+    '''
+    :param vspec_file: Root vspec file
+    :param include_dirs: Include directories
+    :return: The root vspec file and every file it may include
+    '''
+    return [
+        path for path, _, _ in tree_cache.include_closure(
+            vspec_file, include_dirs
+        )
+    ]
+
+
+def layer_files(layer_file: str) -> List[str]:
+    '''
+    :param layer_file: Root layer file
+    :return: The root layer file and every file it includes
+    '''
+    return [path for path, _ in depl_loader.include_closure(layer_file)[0]]
+
+
+class FileWatcher:
+    '''
+    Polls the modification time and size of a set of files
+    '''
+    stamps: Dict[str, Optional[Tuple[int, int]]]
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        '''
+        :param paths: Files to watch, they may be missing
+        '''
+        self.stamps = {path: self._stamp(path) for path in paths}
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def changed(self) -> List[str]:
+        '''
+        :return: Watched files changed, created or removed since the watcher
+         was created
+        '''
+        return [
+            path for path, stamp in self.stamps.items()
+            if self._stamp(path) != stamp
+        ]
+
+
+class SchemaWatcher:
+    '''
+    Keeps the VSS tree and the layers in memory and generates the schemas
+     again whenever one of their files changes. Only the changed tree or
+     layers are loaded again, and the fragment cache skips the blocks of
+     unchanged branches.
+    '''
+    args: argparse.Namespace
+    variants: List[argparse.Namespace]
+    include_dirs: List[str]
+    load_vss_tree: Callable[[], 'VSSNode']
+    generate_variants: Callable[['VSSNode', Dict[str, Layer]], None]
+    report: Callable[[Timings], None]
+    layer_cache: Optional[LayerCache]
+    fragment_cache: Optional[FragmentCache]
+    vss_root_node: Optional['VSSNode']
+    tree_watcher: FileWatcher
+    layers: Dict[str, Layer]
+    layer_watchers: Dict[str, FileWatcher]
+    pattern_watcher: FileWatcher
+
+    def __init__(
+            self, args: argparse.Namespace,
+            variants: List[argparse.Namespace], include_dirs: List[str],
+            load_tree: Callable[[], 'VSSNode'],
+            generate_variants: Callable[['VSSNode', Dict[str, Layer]], None],
+            report: Callable[[Timings], None],
+            layer_cache: Optional[LayerCache],
+            fragment_cache: Optional[FragmentCache]
+    ) -> None:
+        '''
+        :param args: Arguments of the run
+        :param variants: Arguments of each schema to generate
+        :param include_dirs: Directories searched for included vspec files
+        :param load_tree: Loads the VSS tree
+        :param generate_variants: Generates the variants from the VSS root
+         node and the layer of each layer file
+        :param report: Reports the timings of a generation
+        :param layer_cache: Layer cache, if any
+        :param fragment_cache: Fragment cache, if any
+        '''
+        self.args = args
+        self.variants = variants
+        self.include_dirs = include_dirs
+        self.load_vss_tree = load_tree
+        self.generate_variants = generate_variants
+        self.report = report
+        self.layer_cache = layer_cache
+        self.fragment_cache = fragment_cache
+        self.vss_root_node = None
+        self.tree_watcher = FileWatcher(())
+        self.layers = {}
+        self.layer_watchers = {}
+        self.pattern_watcher = FileWatcher(())
+
+    def load_tree(self) -> 'VSSNode':
+        '''
+        Loads the VSS tree, unless none of its files changed
+        :return: VSS root node
+        '''
+        if self.vss_root_node is not None and not self.tree_watcher.changed():
+            return self.vss_root_node
+        # Files are stamped before loading, changes while loading are seen
+        #  by the next cycle
+        self.vss_root_node = None
+        self.tree_watcher = FileWatcher([self.args.vspec_file, *vspec_files(
+            self.args.vspec_file, self.include_dirs
+        )])
+        with span('load tree') as counts:
+            self.vss_root_node = self.load_vss_tree()
+            counts['nodes'] = tree_view([self.vss_root_node]).count_nodes()
+        if self.fragment_cache:
+            # Digests of the nodes of the previous tree are not used again
+            self.fragment_cache.clear_node_digests()
+        return self.vss_root_node
+
+    def load_layers(self) -> None:
+        '''
+        Loads the layers whose files changed
+        :return: None
+        '''
+        for variant in self.variants:
+            file = variant.layer
+            if not file or (
+                    file in self.layers
+                    and not self.layer_watchers[file].changed()
+            ):
+                continue
+            self.layers.pop(file, None)
+            self.layer_watchers[file] = FileWatcher([file, *layer_files(file)])
+            with span(f'load layer {file}') as counts:
+                self.layers[file] = load_layer_cached(
+                    file, self.args.jobs, self.layer_cache
+                )
+                counts['nodes'] = len(self.layers[file].qualified_names)
+
+    def generate(self) -> None:
+        '''
+        Generates the schemas once and reports the timings of the cycle
+        :return: None
+        '''
+        with Timings().collect() as timings:
+            vss_root_node = self.load_tree()
+            self.load_layers()
+            # Pattern files are read again by every generation
+            self.pattern_watcher = FileWatcher(
+                file for variant in self.variants
+                for file in (variant.regex_match_file or [])
+                + (variant.regex_filter_file or [])
+            )
+            with span('generate variants'):
+                self.generate_variants(vss_root_node, self.layers)
+            if self.fragment_cache:
+                with span('save caches'):
+                    self.fragment_cache.save()
+        self.report(timings)
+
+    def wait(self) -> List[str]:
+        '''
+        :return: Files changed since they were loaded
+        '''
+        while True:
+            changed = [
+                path for watcher in (
+                    self.tree_watcher, self.pattern_watcher,
+                    *self.layer_watchers.values()
+                ) for path in watcher.changed()
+            ]
+            if changed:
+                return changed
+            time.sleep(self.args.watch_interval)
+
+    def run(self) -> None:
+        '''
+        Generates the schemas on every change, until interrupted or exited.
+         Failed cycles are reported and the next change is awaited.
+        :return: None
+        '''
+        while True:
+            try:
+                self.generate()
+            except Exception as e:
+                sys.stderr.write(
+                    f'generation failed: {type(e).__name__}: {e}\n'
+                )
+            changed = self.wait()
+            sys.stderr.write(f'changed: {", ".join(changed)}\n')